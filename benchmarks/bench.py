@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Archive.zip Kontrol/İndirme Benchmark'ı
+
+Gerçek host'lara bağlanmadan ArchiveChecker.check_all_domains veya
+ArchiveDownloader.download_all_archives'ın saniyedeki domain sayısını, istek gecikme
+yüzdeliklerini ve bellek kullanımını ölçer. Sanal host'lar ayrı bir süreçteki yerel
+sunucuda taklit edilir (sim_server.py).
+
+Kullanım:
+    PYTHONPATH=. python3 benchmarks/bench.py --hosts 5000 --workers 200
+    PYTHONPATH=. python3 benchmarks/bench.py --mode download --hosts 500 --save base.json
+    PYTHONPATH=. python3 benchmarks/bench.py --hosts 5000 --baseline base.json
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from sim_server import (
+    DEFAULT_MIX, HIT, LARGE, SLOW, BenchResolver, closed_port, generate_hosts, host_kind, parse_mix, run_server
+)
+from src.downloaders.archive_downloader import ArchiveDownloader
+from src.utils.archive_checker import ArchiveChecker
+from src.utils.http_session import SessionFactory
+from src.utils.metrics import RequestMetrics
+from src.utils.request_scheduler import RequestScheduler
+from src.utils.sharding import run_event_loop
+
+MB = 1024 * 1024
+
+def current_rss() -> int:
+    """Sürecin şu anki bellek kullanımı (byte)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return peak_rss()
+
+def peak_rss() -> int:
+    """Sürecin en yüksek bellek kullanımı (byte; Linux'ta ru_maxrss KB'tır)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def raise_file_limit():
+    """Binlerce eşzamanlı bağlantı için açık dosya sınırını yükseltir"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        except (ValueError, OSError):
+            pass
+
+def start_server(args: argparse.Namespace) -> tuple:
+    """
+    Sanal internet sunucusunu ayrı süreçte başlatır
+    
+    Returns:
+        tuple: (süreç, port)
+    """
+    ready = multiprocessing.Queue()
+    config = {
+        "paths": (args.path,),
+        "small_size": args.small_size * 1024,
+        "large_size": args.large_size * MB,
+        "slow_delay": args.slow_delay,
+        "seed": args.seed
+    }
+    process = multiprocessing.Process(target=run_server, args=(config, ready), daemon=True)
+    process.start()
+    return process, ready.get(timeout=60)
+
+async def run_benchmark(args: argparse.Namespace, hosts: list, port: int) -> dict:
+    """
+    Seçili modu sanal host'lara karşı çalıştırır
+    
+    Args:
+        args: Komut satırı ayarları
+        hosts: Sanal host adları
+        port: Sunucunun portu
+    
+    Returns:
+        dict: Ölçüm sonuçları
+    """
+    metrics = RequestMetrics()
+    session_factory = SessionFactory(
+        limit=args.workers * 2,
+        timeout=args.timeout,
+        resolver=BenchResolver(port, closed_port()),
+        trace_configs=[metrics.trace_config()]
+    )
+    scheduler = RequestScheduler()
+    
+    rss_before = current_rss()
+    started = time.perf_counter()
+    async with session_factory:
+        if args.mode == "check":
+            async with ArchiveChecker(
+                max_workers=args.workers,
+                timeout=args.timeout,
+                output_file="bench.txt",
+                session_factory=session_factory,
+                scheduler=scheduler,
+                validation=args.validation,
+                paths=[args.path],
+                max_retries=args.max_retries
+            ) as checker:
+                await checker.check_all_domains(hosts, show_progress=False)
+            processed, found = checker.checked_count, checker.found_count
+        else:
+            Path("data/domains").mkdir(parents=True, exist_ok=True)
+            Path("data/domains/bench.txt").write_text("\n".join(hosts) + "\n", encoding="utf-8")
+            async with ArchiveDownloader(
+                max_workers=args.workers,
+                timeout=args.timeout,
+                session_factory=session_factory,
+                scheduler=scheduler,
+                paths=[args.path],
+                segments=args.segments,
+                max_retries=args.max_retries
+            ) as downloader:
+                stats = await downloader.download_all_archives("bench.txt", show_progress=False)
+            processed, found = stats.get("total_domains", 0), stats.get("successful_downloads", 0)
+    elapsed = time.perf_counter() - started
+    
+    snapshot = metrics.snapshot()
+    result = {
+        "mode": args.mode,
+        "hosts": len(hosts),
+        "workers": args.workers,
+        "mix": args.mix,
+        "elapsed": round(elapsed, 3),
+        "processed": processed,
+        "found": found,
+        "domains_per_sec": round(processed / elapsed, 1) if elapsed else None,
+        "latency": {
+            phase: snapshot["phases"][phase] for phase in ("request", "ttfb", "connect", "queue")
+        },
+        "statuses": snapshot["statuses"],
+        "errors": snapshot["errors"],
+        "peak_rss_mb": round(peak_rss() / MB, 1),
+        "rss_growth_mb": round(max(0, peak_rss() - rss_before) / MB, 1),
+        "kb_per_domain": round(max(0, peak_rss() - rss_before) / 1024 / max(1, len(hosts)), 2)
+    }
+    if args.mode == "download":
+        downloaded = sum(
+            path.stat().st_size for path in Path("data/downloads").rglob(Path(args.path).name)
+            if path.is_file()
+        )
+        result["downloaded_mb"] = round(downloaded / MB, 1)
+        result["mb_per_sec"] = round(downloaded / MB / elapsed, 1) if elapsed else None
+    return result
+
+def expected_found(hosts: list, args: argparse.Namespace) -> int:
+    """Zaman aşımına uğramadan bulunması gereken host sayısı"""
+    kinds = Counter(host_kind(host) for host in hosts)
+    expected = kinds[HIT] + kinds[LARGE]
+    if args.slow_delay < args.timeout:
+        expected += kinds[SLOW]
+    return expected
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Sonucu önceki ölçümle karşılaştırır
+    
+    Returns:
+        list: Gerileme mesajları (boşsa gerileme yok)
+    """
+    regressions = []
+    if baseline.get("domains_per_sec") and result["domains_per_sec"] < baseline["domains_per_sec"] * (1 - tolerance):
+        regressions.append(
+            f"Hız düştü: {result['domains_per_sec']} < {baseline['domains_per_sec']} domain/s"
+        )
+    if baseline.get("peak_rss_mb") and result["peak_rss_mb"] > baseline["peak_rss_mb"] * (1 + tolerance):
+        regressions.append(
+            f"Bellek arttı: {result['peak_rss_mb']} > {baseline['peak_rss_mb']} MB"
+        )
+    base_p90 = baseline.get("latency", {}).get("request", {}).get("p90")
+    p90 = result["latency"]["request"]["p90"]
+    if base_p90 and p90 and p90 > base_p90 * (1 + tolerance):
+        regressions.append(f"İstek gecikmesi (p90) arttı: {p90:.3f} > {base_p90:.3f} s")
+    return regressions
+
+def print_result(result: dict, expected: int):
+    """Sonucu okunabilir biçimde yazdırır"""
+    print(f"\nMod: {result['mode']} | Host: {result['hosts']} | Worker: {result['workers']}")
+    print(f"Süre: {result['elapsed']:.2f} s | Hız: {result['domains_per_sec']} domain/s")
+    print(f"Bulunan: {result['found']} (beklenen: {expected})")
+    if "mb_per_sec" in result:
+        print(f"İndirilen: {result['downloaded_mb']} MB ({result['mb_per_sec']} MB/s)")
+    for phase, values in result["latency"].items():
+        if values["count"]:
+            print(
+                f"  {phase:<8} n={values['count']:<7} ort={values['avg'] * 1000:.1f} ms "
+                f"p50={values['p50'] * 1000:.1f} p90={values['p90'] * 1000:.1f} p99={values['p99'] * 1000:.1f} ms"
+            )
+    print(f"Durumlar: {result['statuses']} | Hatalar: {result['errors']}")
+    print(
+        f"Bellek: en yüksek {result['peak_rss_mb']} MB, artış {result['rss_growth_mb']} MB "
+        f"({result['kb_per_domain']} KB/domain)"
+    )
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Yerel sanal host\'larla kontrol/indirme benchmark\'ı')
+    parser.add_argument('--mode', choices=['check', 'download'], default='check',
+                        help='check: ArchiveChecker, download: ArchiveDownloader (varsayılan: check)')
+    parser.add_argument('--hosts', type=int, default=2000, help='Sanal host sayısı (varsayılan: 2000)')
+    parser.add_argument('--workers', type=int, default=100, help='Worker sayısı (varsayılan: 100)')
+    parser.add_argument('--timeout', type=int, default=5, help='İstek zaman aşımı, saniye (varsayılan: 5)')
+    parser.add_argument('--mix', default=DEFAULT_MIX,
+                        help=f'Host davranışlarının ağırlıkları (varsayılan: {DEFAULT_MIX})')
+    parser.add_argument('--slow-delay', type=float, default=1.0,
+                        help='slow host\'larının yanıt gecikmesi, saniye (varsayılan: 1)')
+    parser.add_argument('--small-size', type=int, default=4, help='Küçük arşivlerin boyutu, KB (varsayılan: 4)')
+    parser.add_argument('--large-size', type=int, default=32, help='Büyük arşivlerin boyutu, MB (varsayılan: 32)')
+    parser.add_argument('--path', default='Archive.zip', help='Aranacak dosya yolu (varsayılan: Archive.zip)')
+    parser.add_argument('--validation', choices=['headers', 'signature'], default='headers',
+                        help='Kontrol modunda doğrulama yöntemi (varsayılan: headers)')
+    parser.add_argument('--segments', type=int, default=4, help='İndirme modunda parça sayısı (varsayılan: 4)')
+    parser.add_argument('--max-retries', type=int, default=0,
+                        help='Geçici hatalar için yeniden deneme sayısı; 0 ölçümü önceki sürümlerle karşılaştırılabilir tutar (varsayılan: 0)')
+    parser.add_argument('--seed', type=int, default=0, help='Host dağılımı için tohum (varsayılan: 0)')
+    parser.add_argument('--workdir', help='Çıktıların yazılacağı klasör (varsayılan: geçici, sonra silinir)')
+    parser.add_argument('--save', help='Sonucu bu JSON dosyasına kaydet')
+    parser.add_argument('--baseline', help='Önceki sonuçla karşılaştır; gerileme varsa 1 ile çık')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='Gerileme sayılmayacak en büyük oran (varsayılan: 0.15)')
+    parser.add_argument('--no-uvloop', action='store_true', help='Kurulu olsa bile uvloop kullanma')
+    args = parser.parse_args()
+    
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    hosts = generate_hosts(args.hosts, mix, args.seed)
+    save_path = Path(args.save).resolve() if args.save else None
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8")) if args.baseline else None
+    
+    raise_file_limit()
+    process, port = start_server(args)
+    original_dir = os.getcwd()
+    temp_dir = None
+    try:
+        # Uygulama data/ ve logs/ klasörlerine göreli yazar; ölçüm çalışma klasöründe yapılır
+        if args.workdir:
+            Path(args.workdir).mkdir(parents=True, exist_ok=True)
+            os.chdir(args.workdir)
+        else:
+            temp_dir = tempfile.TemporaryDirectory(prefix="archive-bench-")
+            os.chdir(temp_dir.name)
+        Path("logs").mkdir(exist_ok=True)
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            handlers=[logging.FileHandler('logs/bench.log')]
+        )
+        
+        result = run_event_loop(run_benchmark(args, hosts, port), use_uvloop=not args.no_uvloop)
+    finally:
+        process.terminate()
+        process.join()
+        os.chdir(original_dir)
+        if temp_dir is not None:
+            temp_dir.cleanup()
+    
+    print_result(result, expected_found(hosts, args))
+    if save_path is not None:
+        save_path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"Sonuç kaydedildi: {save_path}")
+    if baseline is not None:
+        regressions = compare(result, baseline, args.tolerance)
+        for message in regressions:
+            print(f"GERİLEME: {message}")
+        if regressions:
+            return 1
+        print("Gerileme yok")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
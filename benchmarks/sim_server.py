@@ -0,0 +1,211 @@
+"""
+Benchmark için yerel "sanal internet" sunucusu
+
+Tek bir aiohttp sunucusu binlerce sanal host'u Host başlığına göre taklit eder. Her host'un
+davranışı adında yazılıdır (ör. h00042-slow.bench.test); BenchResolver tüm bu adları sunucuya
+yönlendirir, böylece istemci gerçek host'lara hiç bağlanmaz.
+"""
+
+import asyncio
+import io
+import random
+import re
+import socket
+import zipfile
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+from aiohttp.abc import AbstractResolver
+
+from src.utils.sharding import run_event_loop
+
+# Host davranışları
+HIT = "hit"          # Küçük, geçerli ZIP
+MISS = "miss"        # 404
+SLOW = "slow"        # Yanıt vermeden önce bekler, sonra ZIP döner
+HANG = "hang"        # Hiç yanıt vermez (istemci zaman aşımı)
+RESET = "reset"      # Bağlantıyı yanıt vermeden koparır
+LARGE = "large"      # Büyük ZIP (Range destekli; parçalı indirme)
+NXDOMAIN = "nxdomain"  # DNS'te yok (çözümleyici hata verir)
+
+KINDS = (HIT, MISS, SLOW, HANG, RESET, LARGE, NXDOMAIN)
+DEFAULT_MIX = "hit=30,miss=45,slow=8,hang=2,reset=5,large=2,nxdomain=8"
+
+BENCH_SUFFIX = ".bench.test"
+HOST_PATTERN = re.compile(r"^h\d+-([a-z]+)\.bench\.test$")
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """
+    "hit=30,miss=50" biçimindeki dağılımı ayrıştırır
+    
+    Args:
+        mix: Davranış=ağırlık çiftleri
+    
+    Returns:
+        Dict[str, int]: Davranış -> ağırlık
+    
+    Raises:
+        ValueError: Bilinmeyen davranış veya geçersiz ağırlık
+    """
+    weights = {}
+    for item in mix.split(","):
+        kind, _, weight = item.strip().partition("=")
+        if kind not in KINDS:
+            raise ValueError(f"Bilinmeyen host davranışı: {kind} (seçenekler: {', '.join(KINDS)})")
+        weights[kind] = int(weight)
+    if not any(weights.values()):
+        raise ValueError("Dağılımda en az bir davranışın ağırlığı sıfırdan büyük olmalı")
+    return weights
+
+def generate_hosts(count: int, mix: Dict[str, int], seed: int = 0) -> List[str]:
+    """
+    Dağılıma göre karıştırılmış sanal host adları üretir
+    
+    Args:
+        count: Host sayısı
+        mix: Davranış -> ağırlık
+        seed: Rastgelelik tohumu (aynı tohum aynı listeyi verir)
+    
+    Returns:
+        List[str]: Host adları (ör. h00042-slow.bench.test)
+    """
+    rng = random.Random(seed)
+    kinds = list(mix)
+    chosen = rng.choices(kinds, weights=[mix[kind] for kind in kinds], k=count)
+    width = len(str(count))
+    return [f"h{index:0{width}d}-{kind}{BENCH_SUFFIX}" for index, kind in enumerate(chosen)]
+
+def host_kind(host: str) -> Optional[str]:
+    """Host adındaki davranışı döndürür (sanal host değilse None)"""
+    match = HOST_PATTERN.match(host.split(":")[0].lower())
+    return match.group(1) if match else None
+
+def build_zip(size: int, seed: int = 0) -> bytes:
+    """
+    İçinde size byte'lık tek bir (sıkıştırılmamış) dosya bulunan geçerli ZIP üretir
+    
+    Args:
+        size: İçerik boyutu
+        seed: İçerik için rastgelelik tohumu
+    """
+    data = random.Random(seed).randbytes(size)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        archive.writestr("data.bin", data)
+    return buffer.getvalue()
+
+class BenchResolver(AbstractResolver):
+    """
+    Sanal host'ları yerel sunucuya yönlendiren çözümleyici
+    
+    HTTP (80) istekleri sunucunun portuna, HTTPS (443) istekleri kapalı bir porta gider; HTTPS
+    denemesi gerçek internetteki gibi bağlantı reddiyle hızla biter. nxdomain host'ları için
+    DNS hatası verilir.
+    """
+    
+    def __init__(self, http_port: int, https_port: int, host: str = "127.0.0.1"):
+        """
+        Args:
+            http_port: Sunucunun dinlediği port
+            https_port: HTTPS isteklerinin yönlendirileceği (kapalı) port
+            host: Sunucunun adresi
+        """
+        self.http_port = http_port
+        self.https_port = https_port
+        self.host = host
+    
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET):
+        kind = host_kind(host)
+        if kind is None or kind == NXDOMAIN:
+            raise socket.gaierror(socket.EAI_NONAME, f"DNS çözümlenemedi: {host}")
+        return [{
+            "hostname": host,
+            "host": self.host,
+            "port": self.https_port if port == 443 else self.http_port,
+            "family": socket.AF_INET,
+            "proto": 0,
+            "flags": socket.AI_NUMERICHOST,
+        }]
+    
+    async def close(self):
+        pass
+
+def closed_port(host: str = "127.0.0.1") -> int:
+    """Dinlenmeyen bir port döndürür (bağlanma denemesi reddedilir)"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+class SimulatedInternet:
+    """Host adındaki davranışa göre yanıt veren sunucu"""
+    
+    def __init__(self, paths: Tuple[str, ...] = ("Archive.zip",), small_size: int = 4096,
+                 large_size: int = 32 * 1024 * 1024, slow_delay: float = 2.0, seed: int = 0):
+        """
+        Args:
+            paths: Arşivin bulunduğu yollar (diğer yollar 404)
+            small_size: hit/slow host'larındaki ZIP içeriğinin boyutu
+            large_size: large host'larındaki ZIP içeriğinin boyutu
+            slow_delay: slow host'larının yanıt gecikmesi (saniye)
+            seed: İçerik için rastgelelik tohumu
+        """
+        self.paths = {path.lstrip("/") for path in paths}
+        self.small = build_zip(small_size, seed)
+        self.large = build_zip(large_size, seed + 1) if large_size else self.small
+        self.slow_delay = slow_delay
+    
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", self.handle)
+        return app
+    
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        kind = host_kind(request.host)
+        if kind is None or request.match_info["path"] not in self.paths or kind == MISS:
+            raise web.HTTPNotFound()
+        if kind == HANG:
+            await asyncio.sleep(3600)
+        if kind == RESET:
+            request.transport.abort()
+            raise web.HTTPServiceUnavailable()
+        if kind == SLOW:
+            await asyncio.sleep(self.slow_delay)
+        return self.serve(request, self.large if kind == LARGE else self.small)
+    
+    @staticmethod
+    def serve(request: web.Request, body: bytes) -> web.Response:
+        """İçeriği tek aralıklı Range desteğiyle sunar"""
+        headers = {"Accept-Ranges": "bytes", "ETag": f'"{len(body):x}"', "Content-Type": "application/zip"}
+        match = RANGE_PATTERN.match(request.headers.get("Range", ""))
+        if match is None:
+            # HEAD yanıtında aiohttp gövdeyi göndermez, Content-Length korunur
+            return web.Response(body=body, headers=headers)
+        
+        first, last = match.groups()
+        if not first:
+            start, end = max(0, len(body) - int(last or 0)), len(body) - 1
+        else:
+            start, end = int(first), min(int(last), len(body) - 1) if last else len(body) - 1
+        if start > end:
+            raise web.HTTPRequestRangeNotSatisfiable(headers={"Content-Range": f"bytes */{len(body)}"})
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+        return web.Response(status=206, body=memoryview(body)[start:end + 1], headers=headers)
+
+def run_server(config: dict, ready):
+    """
+    Alt süreçte çalışır: sunucuyu başlatır ve portunu ready kuyruğuna yazar
+    
+    Args:
+        config: SimulatedInternet ayarları
+        ready: Port numarasının bildirileceği multiprocessing kuyruğu
+    """
+    async def serve():
+        runner = web.AppRunner(SimulatedInternet(**config).app(), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0, backlog=4096)
+        await site.start()
+        ready.put(site._server.sockets[0].getsockname()[1])
+        await asyncio.Event().wait()
+    
+    run_event_loop(serve())
@@ -9,30 +9,29 @@ Bu uygulama, domain listesindeki her domain için /Archive.zip dosyasının varl
 import asyncio
 import logging
 import argparse
-import sys
 from pathlib import Path
 from colorama import init, Fore, Style
 
-from utils.archive_checker import ArchiveChecker
+from utils.archive_checker import ArchiveChecker, load_probe_paths
 from utils.file_manager import FileManager
+from utils.progress_journal import ProgressJournal
+from utils.dns_resolver import CachedResolver, DNSResolver
+from utils.domain_source import STDIN
+from utils.http_session import SessionFactory
+from utils.logging_setup import setup_queue_logging
+from utils.metrics import RequestMetrics, create_exporter
+from utils.request_scheduler import RequestScheduler
+from utils.result_writer import ResultWriter
+from utils.sharding import iter_feed, merge_stats, run_event_loop, run_fed_shards, shard_file_name
+from utils.validator_store import PROBE, ValidatorStore
 
 # Colorama'yı başlat
 init()
 
 # Logging yapılandırması
 def setup_logging():
-    """Logging yapılandırmasını ayarlar"""
-    # Logs klasörünü oluştur
-    Path("logs").mkdir(exist_ok=True)
-    
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('logs/archive_checker.log'),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    """Logging yapılandırmasını ayarlar (dosya ve konsol yazımı ayrı thread'de yapılır)"""
+    setup_queue_logging('logs/archive_checker.log')
 
 def print_banner():
     """Uygulama banner'ını yazdırır"""
@@ -48,7 +47,7 @@ def print_banner():
 """
     print(banner)
 
-def print_stats(stats: dict):
+def print_stats(stats: dict, output_path: str = "data/results/available_archives.txt"):
     """İstatistikleri yazdırır"""
     print(f"\n{Fore.GREEN}══════════════════════════════════════════════════════════════{Style.RESET_ALL}")
     print(f"{Fore.YELLOW}📊 KONTROL İSTATİSTİKLERİ{Style.RESET_ALL}")
@@ -64,14 +63,129 @@ def print_stats(stats: dict):
     print(f"{Fore.YELLOW}📈 Bulunma Oranı: {stats['success_rate']:.1f}%{Style.RESET_ALL}")
     
     if stats['found_archives'] > 0:
-        print(f"\n{Fore.GREEN}🎉 Sonuçlar 'data/results/available_archives.txt' dosyasına kaydedildi{Style.RESET_ALL}")
+        print(f"\n{Fore.GREEN}🎉 Sonuçlar '{output_path}' dosyasına kaydedildi{Style.RESET_ALL}")
+
+def build_scheduler(args: argparse.Namespace) -> RequestScheduler:
+    """Komut satırı ayarlarından istek scheduler'ını oluşturur"""
+    return RequestScheduler(
+        max_in_flight=args.max_in_flight or (args.workers if args.adaptive else 0),
+        rate=args.rate,
+        host_rate=args.host_rate,
+        adaptive=args.adaptive
+    )
+
+async def run_check(args: argparse.Namespace, domains, output_file: str,
+                    show_progress: bool = True, on_progress=None, shard=None) -> dict:
+    """
+    Domain akışını tek bir event loop'ta kontrol eder
+    
+    Args:
+        args: Komut satırı ayarları
+        domains: Kontrol edilecek domain akışı
+        output_file: Sonuçların yazılacağı dosya adı (data/results/ klasöründe)
+        show_progress: İlerleme çubuğu gösterilsin mi
+        on_progress: (kontrol edilen, bulunan) ile çağrılır
+        shard: (parça no, parça sayısı); metrik dosyası ve portu parçaya göre ayrılır
+        
+    Returns:
+        dict: Bu çalışmanın ve journal'daki önceki çalışmaların sayıları
+    """
+    # İlerleme journal'ı (çökme sonrası --resume ile devam için)
+    journal_path = Path("data/results") / f"{output_file}.journal"
+    
+    # DNS ön çözümleme aşaması (opsiyonel)
+    dns_resolver = None
+    if args.dns_prefilter:
+        dns_resolver = DNSResolver(concurrency=args.dns_workers, cache_path=args.dns_cache)
+    
+    # İstek aşaması süreleri (yalnızca metrik çıktısı istendiğinde oturuma eklenir)
+    metrics = RequestMetrics()
+    metrics_enabled = bool(args.metrics_file) or args.metrics_port is not None
+    
+    # Paylaşılan bağlantı havuzu
+    session_factory = SessionFactory(
+        limit=args.pool_limit or args.workers * 2,
+        limit_per_host=args.per_host_limit,
+        keepalive_timeout=args.keepalive,
+        timeout=args.timeout,
+        resolver=CachedResolver(dns_resolver) if dns_resolver is not None else None,
+        trace_configs=[metrics.trace_config()] if metrics_enabled else None
+    )
+    
+    scheduler = build_scheduler(args)
+    metrics.add_gauges("scheduler", lambda: {"in_flight": scheduler.in_flight, "limit": scheduler.limit, **scheduler.stats})
+    exporter = create_exporter(metrics, args.metrics_file, args.metrics_interval, args.metrics_port, shard)
+    
+    # Kontrolcü'yü başlat
+    with ProgressJournal(journal_path, resume=args.resume) as journal:
+        async with exporter, session_factory, ArchiveChecker(
+            max_workers=args.workers,
+            timeout=args.timeout,
+            connect_timeout=args.connect_timeout,
+            tls_timeout=args.tls_timeout,
+            read_timeout=args.read_timeout,
+            max_retries=args.max_retries,
+            retry_delay=args.retry_delay,
+            output_file=output_file,
+            output_format=args.format,
+            probe_strategy=args.probe_strategy,
+            dns_resolver=dns_resolver,
+            session_factory=session_factory,
+            scheduler=scheduler,
+            group_by=args.group_by,
+            group_limit=args.group_limit,
+            validation=args.validate,
+            paths=load_probe_paths(args.paths, args.paths_file),
+            stop_on_first=not args.all_paths,
+            validator_store=None if args.no_revalidate else ValidatorStore(args.validator_cache, PROBE)
+        ) as checker:
+            
+            # Tüm domain'leri kontrol et
+            await checker.check_all_domains(
+                domains, journal=journal, show_progress=show_progress, on_progress=on_progress
+            )
+    
+    return {
+        "checked": checker.checked_count,
+        "found": checker.found_count,
+        "previous_total": journal.previous_total,
+        "previous_found": journal.previous_found,
+        "dns_failed": checker.dns_failed_count
+    }
+
+def check_shard(shard_index: int, shard_count: int, config: dict, progress, inbox) -> dict:
+    """
+    Alt süreçte çalışır: domain akışının bu sürece düşen parçasını kendi event loop'unda kontrol eder
+    
+    Args:
+        shard_index: Parça numarası
+        shard_count: Toplam parça sayısı
+        config: Komut satırı ayarları
+        progress: Ortak ilerleme sayaçları (ShardProgress)
+        inbox: Ana süreçte okunup bu parçaya yönlendirilen domain'lerin kuyruğu
+        
+    Returns:
+        dict: Parçanın sayıları
+    """
+    setup_logging()
+    args = argparse.Namespace(**config)
+    # Global oran sınırı süreçler arasında paylaştırılır
+    args.rate = args.rate / shard_count
+    domains = iter_feed(inbox)
+    output_file = shard_file_name(args.output, shard_index, shard_count)
+    return run_event_loop(
+        run_check(args, domains, output_file, show_progress=False, on_progress=progress.update,
+                  shard=(shard_index, shard_count)),
+        use_uvloop=not args.no_uvloop
+    )
 
 async def main():
     """Ana uygulama fonksiyonu"""
     parser = argparse.ArgumentParser(description='Archive.zip Varlık Kontrolcüsü')
     parser.add_argument(
         'domain_file',
-        help='Domain listesi dosyası (data/domains/ klasöründe)'
+        nargs='+',
+        help='Domain listesi dosyaları: dosya adı, glob deseni ("feeds/*.gz") veya stdin için "-" (göreli yollar data/domains/ içinde aranır; .gz/.xz/.bz2 desteklenir)'
     )
     parser.add_argument(
         '--workers',
@@ -85,14 +199,193 @@ async def main():
         default=10,
         help='Kontrol zaman aşımı saniye (varsayılan: 10)'
     )
+    parser.add_argument(
+        '--connect-timeout',
+        type=float,
+        default=5,
+        help='TCP bağlantısı zaman aşımı saniye; yanıt vermeyen host\'lar toplam süre beklenmeden bırakılır (varsayılan: 5)'
+    )
+    parser.add_argument(
+        '--tls-timeout',
+        type=float,
+        default=5,
+        help='HTTPS için bağlantı süresine eklenen TLS el sıkışması süresi saniye (varsayılan: 5)'
+    )
+    parser.add_argument(
+        '--read-timeout',
+        type=float,
+        default=None,
+        help='İki okuma arasında en fazla bekleme saniye (varsayılan: --timeout)'
+    )
+    parser.add_argument(
+        '--max-retries',
+        type=int,
+        default=2,
+        help='Geçici hatalar (zaman aşımı, bağlantı sıfırlama, 429/5xx) için ertelenmiş yeniden deneme sayısı; 0 kapatır (varsayılan: 2)'
+    )
+    parser.add_argument(
+        '--retry-delay',
+        type=float,
+        default=2,
+        help='İlk yeniden denemeden önceki bekleme saniye, her denemede ikiye katlanır (varsayılan: 2)'
+    )
     parser.add_argument(
         '--output',
         default='available_archives.txt',
         help='Çıktı dosyası adı (varsayılan: available_archives.txt)'
     )
+    parser.add_argument(
+        '--format',
+        choices=['txt', 'jsonl', 'csv'],
+        default=None,
+        help='Çıktı formatı (varsayılan: dosya uzantısından belirlenir)'
+    )
+    parser.add_argument(
+        '--probe-strategy',
+        choices=['sequential', 'short-circuit', 'race'],
+        default='sequential',
+        help='HTTPS/HTTP deneme stratejisi (varsayılan: sequential)'
+    )
+    parser.add_argument(
+        '--dns-prefilter',
+        action='store_true',
+        help='HTTP denemelerinden önce DNS çözümle, çözümlenemeyen domain\'leri atla'
+    )
+    parser.add_argument(
+        '--dns-workers',
+        type=int,
+        default=200,
+        help='Eşzamanlı DNS sorgusu sayısı (varsayılan: 200)'
+    )
+    parser.add_argument(
+        '--dns-cache',
+        default='data/cache/dns_cache.sqlite3',
+        help='DNS önbellek dosyası (varsayılan: data/cache/dns_cache.sqlite3)'
+    )
+    parser.add_argument(
+        '--pool-limit',
+        type=int,
+        default=None,
+        help='Toplam eşzamanlı bağlantı sayısı (varsayılan: worker sayısının 2 katı)'
+    )
+    parser.add_argument(
+        '--per-host-limit',
+        type=int,
+        default=0,
+        help='Host başına eşzamanlı bağlantı sayısı (varsayılan: 0, sınırsız)'
+    )
+    parser.add_argument(
+        '--keepalive',
+        type=float,
+        default=30,
+        help='Boştaki bağlantıların açık tutulma süresi saniye (varsayılan: 30)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Önceki çalışmanın journal kaydından devam et (tamamlanan domain\'leri atla)'
+    )
+    parser.add_argument(
+        '--paths',
+        default=None,
+        help='Denenecek dosya yolları, virgülle ayrılmış (varsayılan: Archive.zip)'
+    )
+    parser.add_argument(
+        '--paths-file',
+        default=None,
+        help='Her satırda bir dosya yolu bulunan liste (ör. backup.zip, site.tar.gz)'
+    )
+    parser.add_argument(
+        '--all-paths',
+        action='store_true',
+        help='İlk bulunan dosyada durma, domain\'deki tüm yolları dene'
+    )
+    parser.add_argument(
+        '--validate',
+        choices=['headers', 'signature'],
+        default='headers',
+        help='Bulunan dosyanın doğrulanması: headers (HEAD + MIME/boyut) veya signature '
+             '(Range ile ilk 4 byte, ZIP imzası) (varsayılan: headers)'
+    )
+    parser.add_argument(
+        '--max-in-flight',
+        type=int,
+        default=0,
+        help='Aynı anda açık en fazla istek sayısı (varsayılan: 0, yalnızca worker sayısı sınırlar)'
+    )
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=0,
+        help='Saniyede en fazla istek sayısı, tüm süreçler toplamı (varsayılan: 0, sınırsız)'
+    )
+    parser.add_argument(
+        '--host-rate',
+        type=float,
+        default=0,
+        help='Aynı host\'a saniyede en fazla istek sayısı (varsayılan: 0, sınırsız)'
+    )
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='AIMD: hata/zaman aşımı oranı düşükken eşzamanlılığı artır, yükselince düşür'
+    )
+    parser.add_argument(
+        '--group-by',
+        choices=['ip', 'subnet', 'host'],
+        default=None,
+        help='Domain\'leri IP, /24 subnet veya host\'a göre grupla ve gruplar arasında sırayla dağıt '
+             '(ip ve subnet DNS ön filtresini açar)'
+    )
+    parser.add_argument(
+        '--group-limit',
+        type=int,
+        default=4,
+        help='Bir gruptan aynı anda kontrol edilecek en fazla domain (varsayılan: 4)'
+    )
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=1,
+        help='Domain\'leri bu kadar sürece bölerek kontrol et; --resume aynı sayıyla kullanılmalı (varsayılan: 1)'
+    )
+    parser.add_argument(
+        '--no-uvloop',
+        action='store_true',
+        help='Alt süreçlerde kurulu olsa bile uvloop kullanma'
+    )
+    parser.add_argument(
+        '--metrics-file',
+        help='DNS, bağlantı, TLS ve ilk byte sürelerini bu JSON dosyasına periyodik yaz (data/results/ klasöründe)'
+    )
+    parser.add_argument(
+        '--metrics-interval',
+        type=float,
+        default=10,
+        help='Metrik dosyasının yazılma aralığı, saniye (varsayılan: 10)'
+    )
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        help='Metrikleri 127.0.0.1:PORT/metrics adresinde Prometheus biçiminde sun (süreç başına port + süreç no)'
+    )
+    parser.add_argument(
+        '--validator-cache',
+        default='data/cache/validators.sqlite3',
+        help='Bulunan dosyaların ETag/Last-Modified/boyut kayıtları (varsayılan: data/cache/validators.sqlite3)'
+    )
+    parser.add_argument(
+        '--no-revalidate',
+        action='store_true',
+        help='Önceki taramanın kayıtlarıyla koşullu istek (If-None-Match/If-Modified-Since) gönderme'
+    )
     
     args = parser.parse_args()
     
+    # IP gruplaması için domain'lerin önceden çözümlenmesi gerekir
+    if args.group_by in ('ip', 'subnet'):
+        args.dns_prefilter = True
+    
     # Banner'ı yazdır
     print_banner()
     
@@ -100,46 +393,78 @@ async def main():
     setup_logging()
     logger = logging.getLogger(__name__)
     
-    # Domain dosyasının varlığını kontrol et
-    domain_file_path = Path("data/domains") / args.domain_file
-    if not domain_file_path.exists():
-        print(f"{Fore.RED}❌ Domain dosyası bulunamadı: {domain_file_path}{Style.RESET_ALL}")
+    if STDIN in args.domain_file and args.processes > 1:
+        parser.error("stdin (-) --processes ile birlikte kullanılamaz")
+    
+    # Domain kaynaklarının varlığını kontrol et
+    domain_sources = FileManager().resolve_domain_sources(args.domain_file)
+    if not domain_sources:
+        print(f"{Fore.RED}❌ Domain dosyası bulunamadı: {' '.join(args.domain_file)}{Style.RESET_ALL}")
         print(f"{Fore.YELLOW}💡 Lütfen domain listesini 'data/domains/' klasörüne koyun{Style.RESET_ALL}")
         return
     
-    print(f"{Fore.CYAN}📋 Domain dosyası: {args.domain_file}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}📋 Domain dosyası: {', '.join(str(source) for source in domain_sources)}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}🔧 Worker sayısı: {args.workers}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}⏱️  Zaman aşımı: {args.timeout} saniye{Style.RESET_ALL}")
     print(f"{Fore.CYAN}📄 Çıktı dosyası: {args.output}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}🔀 Deneme stratejisi: {args.probe_strategy}{Style.RESET_ALL}")
+    if args.dns_prefilter:
+        print(f"{Fore.CYAN}🌐 DNS ön filtresi: açık ({args.dns_workers} worker){Style.RESET_ALL}")
+    if args.paths or args.paths_file:
+        paths = load_probe_paths(args.paths, args.paths_file)
+        print(f"{Fore.CYAN}🗂️  Denenecek yollar: {len(paths)} ({', '.join(paths[:5])}{', ...' if len(paths) > 5 else ''}){Style.RESET_ALL}")
+    if args.group_by:
+        print(f"{Fore.CYAN}🏘️  Gruplama: {args.group_by} (grup başına {args.group_limit} domain){Style.RESET_ALL}")
+    if args.resume:
+        print(f"{Fore.CYAN}⏯️  Devam modu: açık{Style.RESET_ALL}")
+    if args.processes > 1:
+        print(f"{Fore.CYAN}🧩 Süreç sayısı: {args.processes}{Style.RESET_ALL}")
     print(f"{Fore.GREEN}══════════════════════════════════════════════════════════════{Style.RESET_ALL}\n")
     
     try:
-        # File manager'ı başlat
-        file_manager = FileManager()
+        output_path = Path("data/results") / args.output
         
-        # Domain listesini oku
-        domains = await file_manager.read_domain_list(args.domain_file)
+        if args.processes > 1:
+            # Liste burada bir kez okunup süreçlere dağıtılır; her süreç kendi event loop'u ve
+            # bağlantı havuzuyla bir parçayı kontrol eder
+            shard_stats = await run_fed_shards(
+                check_shard, args.processes, vars(args), FileManager().iter_domains(args.domain_file),
+                desc="Kontrol ediliyor", hits_label="Bulunan"
+            )
+            counts = merge_stats(shard_stats, ("checked", "found", "previous_total", "previous_found", "dns_failed"))
+            
+            # Parça sonuçlarını asıl çıktı dosyasında birleştir
+            shard_paths = [
+                Path("data/results") / shard_file_name(args.output, index, args.processes)
+                for index in range(args.processes)
+            ]
+            await ResultWriter.merge_files(shard_paths, output_path, args.format)
+            if len(shard_stats) < args.processes:
+                print(f"{Fore.RED}❌ {args.processes - len(shard_stats)} süreç hata ile bitti (ayrıntılar log dosyasında){Style.RESET_ALL}")
+        else:
+            # Domain listesini akış halinde oku (tüm liste belleğe alınmaz)
+            domains = FileManager().iter_domains(args.domain_file)
+            counts = await run_check(args, domains, args.output)
         
-        if not domains:
+        if counts["checked"] == 0 and counts["previous_total"] == 0:
             print(f"{Fore.RED}❌ Domain listesi boş veya okunamadı{Style.RESET_ALL}")
             return
         
-        # Kontrolcü'yü başlat
-        async with ArchiveChecker(
-            max_workers=args.workers,
-            timeout=args.timeout
-        ) as checker:
-            
-            # Tüm domain'leri kontrol et
-            results = await checker.check_all_domains(domains)
-            
-            # Sonuçlar zaten anlık olarak kaydedildi, sadece istatistikleri hesapla
-            
-            # İstatistikleri hesapla
-            stats = checker.get_stats(len(domains), len(results))
-            
-            # İstatistikleri yazdır
-            print_stats(stats)
+        if counts["previous_total"]:
+            print(f"{Fore.CYAN}⏭️  Önceki çalışmadan atlanan: {counts['previous_total']} domain{Style.RESET_ALL}")
+        if counts["dns_failed"]:
+            print(f"{Fore.CYAN}🚫 DNS çözümlenemeyen: {counts['dns_failed']} domain{Style.RESET_ALL}")
+        
+        # Sonuçlar zaten anlık olarak kaydedildi, sadece istatistikleri hesapla
+        
+        # İstatistikleri hesapla (önceki çalışmalar dahil)
+        stats = ArchiveChecker.get_stats(
+            counts["checked"] + counts["previous_total"],
+            counts["found"] + counts["previous_found"]
+        )
+        
+        # İstatistikleri yazdır
+        print_stats(stats, str(output_path))
             
     except KeyboardInterrupt:
         print(f"\n{Fore.YELLOW}⚠️  Kullanıcı tarafından durduruldu{Style.RESET_ALL}")
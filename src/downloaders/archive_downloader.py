@@ -1,40 +1,145 @@
 import asyncio
 import aiohttp
-import aiofiles
+import json
 import logging
+import os
 from pathlib import Path
-from typing import List, Optional, Tuple
-from asyncio_throttle import Throttler
+from urllib.parse import unquote, urlsplit
+from typing import AsyncIterable, Iterable, List, Optional, Sequence, Tuple, Union
 from tqdm import tqdm
 import time
 
 from src.utils.url_validator import URLValidator
 from src.utils.file_manager import FileManager
+from src.utils.blob_store import BlobStore
+from src.utils.download_budget import ByteRateLimiter, DownloadBudget
+from src.utils.download_index import DownloadIndex
+from src.utils.http_session import SessionFactory, TimeoutPolicy
+from src.utils.probe_strategies import ERROR, RETRYABLE_OUTCOMES, TIMEOUT, classify_exception
+from src.utils.progress import ThrottledProgress
+from src.utils.retry_queue import RetryQueue
+from src.utils.validator_store import ValidatorStore
+from src.utils.request_scheduler import RequestScheduler
+from src.utils.sharding import shard_of
+from src.utils.zip_listing import ZipListingError, list_remote_zip
+from src.utils.zip_signature import ZIP_SIGNATURES, expected_signatures, verify_archive_file
+from src.downloaders.resumable_download import ResumableDownload
 
 logger = logging.getLogger(__name__)
 
+def archive_file_name(url: str) -> str:
+    """
+    URL'deki dosya adını döndürür (domain klasöründe bu adla saklanır)
+    
+    Args:
+        url: Arşiv URL'i
+        
+    Returns:
+        str: Dosya adı (URL'de yoksa Archive.zip)
+    """
+    name = Path(unquote(urlsplit(url).path)).name
+    if name in ("", ".", ".."):
+        return "Archive.zip"
+    return name
+
 class ArchiveDownloader:
     """Archive.zip dosyalarını indiren ana sınıf"""
     
-    def __init__(self, max_workers: int = 10, timeout: int = 30):
+    def __init__(self, max_workers: int = 10, timeout: int = 30,
+                 session_factory: Optional[SessionFactory] = None,
+                 scheduler: Optional[RequestScheduler] = None, paths: Optional[Sequence[str]] = None,
+                 segments: int = 4, segment_min_size: int = 16 * 1024 * 1024,
+                 write_buffer: int = 1024 * 1024, fsync_interval: int = 64 * 1024 * 1024,
+                 dedup: bool = True, etag_dedup: bool = False, list_output: Optional[Path] = None,
+                 max_bandwidth: float = 0, max_file_size: int = 0, max_total_size: int = 0,
+                 min_free_space: int = 0, validator_store: Optional[ValidatorStore] = None,
+                 connect_timeout: Optional[float] = None, tls_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None, max_retries: int = 2, retry_delay: float = 2.0):
         self.max_workers = max_workers
         self.timeout = timeout
-        self.throttler = Throttler(rate_limit=max_workers, period=1)
+        # Büyük dosyalar, sunucu destekliyorsa paralel aralık istekleriyle indirilir
+        self.segments = segments
+        self.segment_min_size = segment_min_size
+        # Diske büyük tamponlarla yazılır, fsync toplu yapılır
+        self.write_buffer = write_buffer
+        self.fsync_interval = fsync_interval
+        # Bağlanma/TLS/okuma için ayrı süreler; okuma süresi iki veri parçası arasındaki beklemedir
+        self.timeouts = TimeoutPolicy(timeout, connect_timeout, tls_timeout, read_timeout)
+        # Geçici hatayla (zaman aşımı, bağlantı kopması, 5xx, 429) biten indirmeler sona ertelenip yeniden denenir
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        # Eşzamanlılık worker sayısıyla, istek oranı scheduler ile sınırlanır
+        self.scheduler = scheduler or RequestScheduler()
         self.file_manager = FileManager()
         self.session = None
         
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout),
-            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+        # İndirilen arşivlerin dizini (domain, URL -> hash, boyut, ETag)
+        self.index = DownloadIndex(self.file_manager.index_path, self.file_manager.legacy_manifest_path)
+        
+        # Aynı içerik tek kopya saklanır; domain klasörlerinde bloba sabit bağlantı bulunur
+        self.blob_store = None
+        if dedup:
+            self.blob_store = BlobStore(self.file_manager.base_dir / "blobs", self.index)
+        self.etag_dedup = etag_dedup
+        
+        # Tüm indirmeler ortak bant genişliği ve boyut/disk alanı sınırlarını paylaşır
+        self.limiter = ByteRateLimiter(max_bandwidth) if max_bandwidth > 0 else None
+        self.budget = None
+        if max_file_size or max_total_size or min_free_space:
+            self.budget = DownloadBudget(
+                self.file_manager.downloads_dir, max_file_size=max_file_size,
+                max_total_size=max_total_size, min_free_space=min_free_space
+            )
+        
+        # İndirilen sürümün doğrulayıcıları; mevcut dosyalar koşullu istekle güncel tutulur
+        self.validator_store = validator_store
+        
+        # Liste modu: dosyalar indirilmez, ZIP içeriği JSONL olarak bu dosyaya yazılır
+        self.list_output = Path(list_output) if list_output is not None else None
+        self._list_fd: Optional[int] = None
+        
+        # Dışarıdan verilen havuz paylaşılır ve burada kapatılmaz
+        self._owns_factory = session_factory is None
+        self.session_factory = session_factory or SessionFactory(limit=max_workers * 2, timeout=timeout)
+        
+        # URL testleri de aynı bağlantı havuzunu kullanır
+        self.validator = URLValidator(
+            timeout=10, session_factory=self.session_factory, scheduler=self.scheduler, paths=paths,
+            connect_timeout=connect_timeout, tls_timeout=tls_timeout
         )
+        
+    async def __aenter__(self):
+        self.session = self.session_factory.get_session()
+        await self.validator.__aenter__()
+        # Eski düz klasör yerleşimi varsa hash önekli yerleşime taşınır
+        await asyncio.to_thread(self.file_manager.migrate_download_layout)
+        self.index.open()
+        if self.validator_store is not None:
+            self.validator_store.open()
+        if self.list_output is not None:
+            # O_APPEND: her kayıt tek write ile eklenir, paralel süreçler aynı dosyaya yazabilir
+            self.list_output.parent.mkdir(parents=True, exist_ok=True)
+            self._list_fd = os.open(self.list_output, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        await self.validator.__aexit__(exc_type, exc_val, exc_tb)
+        if self._list_fd is not None:
+            os.close(self._list_fd)
+            self._list_fd = None
+        if self.validator_store is not None:
+            self.validator_store.close()
+        self.index.close()
+        if self.blob_store is not None and self.blob_store.stats["deduplicated"]:
+            stats = self.blob_store.stats
+            logger.info(
+                f"Tekilleştirme: {stats['deduplicated']} dosya depoda zaten vardı, "
+                f"{stats['saved_bytes'] / 1024 / 1024:.1f} MB yazılmadı"
+            )
+        if self._owns_factory:
+            await self.session_factory.close()
     
-    async def download_archive(self, domain: str, url: str) -> Tuple[bool, Optional[str]]:
+    async def download_archive(self, domain: str, url: str) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         Tek bir Archive.zip dosyasını indirir
         
@@ -43,86 +148,380 @@ class ArchiveDownloader:
             url: İndirilecek URL
             
         Returns:
-            Tuple[bool, Optional[str]]: (başarılı mı, hata mesajı)
+            Tuple[bool, Optional[str], Optional[str]]: (başarılı mı, hata mesajı, hata türü)
         """
         try:
-            async with self.throttler:
+            if self.budget is not None:
+                if self.budget.exhausted:
+                    return False, "Toplam indirme sınırına ulaşıldı", ERROR
+                # Boş alan eşiğin altındaysa yeni indirme başlatılmaz, yer açılması beklenir
+                await self.budget.wait_for_space()
+            
+            async with self.scheduler.slot(domain) as slot:
                 # Domain klasörünü oluştur
                 domain_dir = self.file_manager.get_domain_download_path(domain)
-                archive_path = domain_dir / "Archive.zip"
+                archive_path = domain_dir / archive_file_name(url)
                 
-                # Dosya zaten varsa atla
+                # Tamamlanmış dosya varsa atla (yarım dosyalar .part olarak tutulur)
+                download = ResumableDownload(
+                    self.session, url, archive_path, timeout=self.timeouts.for_url(url),
+                    segments=self.segments, segment_min_size=self.segment_min_size,
+                    buffer_size=self.write_buffer, sync_interval=self.fsync_interval,
+                    on_status=slot.check_status,
+                    store=self.blob_store, etag_dedup=self.etag_dedup,
+                    limiter=self.limiter, budget=self.budget
+                )
                 if archive_path.exists():
-                    logger.info(f"Dosya zaten mevcut: {archive_path}")
-                    return True, None
+                    if await self.is_downloaded(domain, url, archive_path):
+                        if not await self.archive_changed(url, slot):
+                            logger.info("Dosya zaten mevcut: %s", archive_path)
+                            return True, None, None
+                        # Sunucudaki dosya değişmiş: yeni sürüm indirilip eskisinin yerine konur
+                        logger.info("Dosya sunucuda değişmiş, yeniden indiriliyor: %s", archive_path)
+                    else:
+                        # Eski sürümlerden kalan yarım dosya: kaldığı yerden tamamlanır
+                        logger.warning("Mevcut dosya eksik, indirme devam ediyor: %s", archive_path)
+                        os.replace(archive_path, download.part_path)
                 
-                # İndirme işlemi
-                async with self.session.get(url) as response:
-                    if response.status == 200:
-                        # Dosyayı kaydet
-                        async with aiofiles.open(archive_path, 'wb') as f:
-                            async for chunk in response.content.iter_chunked(8192):
-                                await f.write(chunk)
-                        
-                        logger.info(f"Başarıyla indirildi: {domain} - {archive_path}")
-                        return True, None
+                # İndirme işlemi (.part dosyasına, doğrulandıktan sonra asıl adına taşınır)
+                success, error_msg = await download.run()
+                if success:
+                    if self.validator_store is not None:
+                        self.validator_store.store(url, download.etag, download.last_modified, download.size)
+                    self.index.record(domain, url, download.sha256, download.size, download.etag)
+                    if download.deduplicated:
+                        logger.info("Depoda aynı dosya var, bağlandı: %s - %s", domain, archive_path)
                     else:
-                        error_msg = f"HTTP {response.status}"
-                        logger.error(f"İndirme hatası: {domain} - {error_msg}")
-                        return False, error_msg
+                        logger.info("Başarıyla indirildi: %s - %s", domain, archive_path)
+                else:
+                    logger.error("İndirme hatası: %s - %s", domain, error_msg)
+                return success, error_msg, download.outcome
                         
         except asyncio.TimeoutError:
             error_msg = "Zaman aşımı"
-            logger.error(f"Zaman aşımı: {domain}")
-            return False, error_msg
+            logger.error("Zaman aşımı: %s", domain)
+            return False, error_msg, TIMEOUT
         except Exception as e:
             error_msg = str(e)
-            logger.error(f"Beklenmeyen hata: {domain} - {error_msg}")
-            return False, error_msg
+            logger.error("Beklenmeyen hata: %s - %s", domain, error_msg)
+            return False, error_msg, classify_exception(e)
+    
+    async def is_downloaded(self, domain: str, url: str, archive_path: Path) -> bool:
+        """
+        Mevcut dosyanın tamamlanmış bir indirme olup olmadığını döndürür
+        
+        Dizinde kaydı olan dosyada boyut karşılaştırması yeterlidir; kaydı olmayan (eski
+        sürümlerle indirilmiş) dosyalar boyut ve imza okunarak doğrulanır.
+        
+        Args:
+            domain: Domain adı
+            url: Dosya URL'i
+            archive_path: Diskteki dosya
+        
+        Returns:
+            bool: Dosya tamamsa True
+        """
+        entry = self.index.get(domain, url)
+        if entry is not None and entry[1] == archive_path.stat().st_size:
+            return True
+        return await asyncio.to_thread(verify_archive_file, archive_path, url)
+    
+    async def archive_changed(self, url: str, slot) -> bool:
+        """
+        İndirilmiş dosyanın sunucuda değişip değişmediğini koşullu HEAD isteğiyle denetler
+        
+        Doğrulayıcı kaydı olmayan (ör. önceki sürümlerle indirilmiş) dosyalar ve isteğin
+        başarısız olduğu durumlar değişmemiş sayılır; mevcut dosya korunur.
+        
+        Args:
+            url: Dosya URL'i
+            slot: Scheduler slot'u (yanıt durumu bildirilir)
+        
+        Returns:
+            bool: Dosya değiştiyse True
+        """
+        if self.validator_store is None:
+            return False
+        headers = self.validator_store.conditional_headers(url)
+        if not headers:
+            return False
+        try:
+            async with self.session.head(url, headers=headers, allow_redirects=True,
+                                         timeout=self.timeouts.for_url(url)) as response:
+                slot.check_status(response.status)
+                if response.status == 304:
+                    self.validator_store.mark_not_modified(url)
+                    return False
+                if response.status != 200:
+                    return False
+                previous = self.validator_store.get(url)
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                # Koşullu başlıkları yok sayan sunucular: doğrulayıcılar ve boyut karşılaştırılır
+                changed = (
+                    (etag is not None and etag != previous[0])
+                    or (last_modified is not None and last_modified != previous[1])
+                    or (response.content_length is not None and previous[2] is not None
+                        and response.content_length != previous[2])
+                )
+                if changed:
+                    self.validator_store.stats["changed"] += 1
+                return changed
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug("Koşullu istek başarısız, mevcut dosya korunuyor: %s - %s", url, e)
+            return False
+    
+    async def list_archive(self, domain: str, url: str, final: bool = True) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        ZIP dosyasının içindekileri indirmeden listeler ve JSONL çıktısına yazar
+        
+        Merkezi dizin dosyanın sonundan birkaç Range isteğiyle okunur; her dosya için ad, boyut
+        ve tarih bir satır olarak yazılır.
+        
+        Args:
+            domain: Domain adı
+            url: ZIP dosyasının URL'i
+            final: Son deneme mi; değilse geçici hata çıktıya yazılmaz (yeniden denenecek)
+            
+        Returns:
+            Tuple[bool, Optional[str], Optional[str]]: (başarılı mı, hata mesajı, hata türü)
+        """
+        error_msg = None
+        outcome = None
+        entries: List[dict] = []
+        archive_size = None
+        try:
+            if expected_signatures(url) is not ZIP_SIGNATURES:
+                error_msg = "Yalnızca ZIP arşivleri listelenebilir"
+                outcome = ERROR
+            else:
+                async with self.scheduler.slot(domain):
+                    entries, archive_size = await list_remote_zip(self.session, url, self.timeouts.for_url(url))
+        except ZipListingError as e:
+            error_msg = str(e)
+            outcome = ERROR
+        except asyncio.TimeoutError:
+            error_msg = "Zaman aşımı"
+            outcome = TIMEOUT
+        except Exception as e:
+            error_msg = str(e)
+            outcome = classify_exception(e)
+        
+        if outcome in RETRYABLE_OUTCOMES and not final:
+            # Ertelenen deneme çıktıya yazılmaz; son sonuç yeniden denemede yazılır
+            logger.debug("Listeleme yeniden denenecek: %s - %s", domain, error_msg)
+            return False, error_msg, outcome
+        
+        if error_msg is not None:
+            logger.error("Listeleme hatası: %s - %s", domain, error_msg)
+            records = [{"domain": domain, "url": url, "error": error_msg}]
+        else:
+            logger.info("Listelendi: %s - %s dosya", domain, len(entries))
+            records = [
+                {"domain": domain, "url": url, "archive_size": archive_size, **entry} for entry in entries
+            ]
+        
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode("utf-8")
+        try:
+            await asyncio.to_thread(os.write, self._list_fd, data)
+        except OSError as e:
+            logger.error(f"Liste kaydetme hatası: {e}")
+        return error_msg is None, error_msg, outcome
     
-    async def process_domain(self, domain: str) -> Tuple[bool, str, Optional[str]]:
+    async def fetch_archive(self, domain: str, url: str, final: bool = True) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Liste modunda arşivi listeler, aksi halde indirir; (başarılı mı, hata mesajı, hata türü) döndürür"""
+        if self.list_output is not None:
+            return await self.list_archive(domain, url, final)
+        return await self.download_archive(domain, url)
+    
+    async def process_domain(self, domain: str, final: bool = True) -> Tuple[bool, str, Optional[str], Optional[str]]:
         """
         Tek bir domain'i işler (URL test + indirme)
         
         Args:
             domain: İşlenecek domain
+            final: Son deneme mi (geçici hatalar yalnızca son denemede loglanır ve listeye yazılır)
             
         Returns:
-            Tuple[bool, str, Optional[str]]: (başarılı mı, URL, hata mesajı)
+            Tuple[bool, str, Optional[str], Optional[str]]: (başarılı mı, URL, hata mesajı, hata türü)
         """
-        async with URLValidator(timeout=10) as validator:
-            # URL'leri test et
-            is_accessible, working_url, error = await validator.check_archive_urls(domain)
-            
-            if not is_accessible:
+        # URL'leri test et (paylaşılan bağlantı havuzu üzerinden)
+        is_accessible, working_url, error, outcome = await self.validator.check_archive_urls(domain)
+        
+        if not is_accessible:
+            # Yeniden denenecek geçici hatalar loglanmaz: log yalnızca son sonuç için yazılır
+            if final or outcome is None:
                 await self.file_manager.save_download_log(domain, "", False, error)
-                return False, "", error
-            
-            # Dosyayı indir
-            success, download_error = await self.download_archive(domain, working_url)
-            
-            # Log kaydet
+            return False, "", error, outcome
+        
+        # Dosyayı indir (liste modunda yalnızca içeriği listele)
+        success, download_error, outcome = await self.fetch_archive(domain, working_url, final)
+        
+        # Log kaydet
+        if success or final or outcome not in RETRYABLE_OUTCOMES:
             await self.file_manager.save_download_log(
                 domain, working_url, success, download_error
             )
+        
+        if success:
+            return True, working_url, None, None
+        else:
+            return False, working_url, download_error, outcome
+    
+    async def download_confirmed(self, domain: str, url: str,
+                                 final: bool = True) -> Tuple[bool, str, Optional[str], Optional[str]]:
+        """
+        Varlığı daha önce doğrulanmış bir Archive.zip'i tekrar test etmeden indirir
+        
+        Args:
+            domain: Domain adı
+            url: Doğrulanmış Archive.zip URL'i
+            final: Son deneme mi (geçici hatalar yalnızca son denemede loglanır ve listeye yazılır)
+            
+        Returns:
+            Tuple[bool, str, Optional[str], Optional[str]]: (başarılı mı, URL, hata mesajı, hata türü)
+        """
+        success, download_error, outcome = await self.fetch_archive(domain, url, final)
+        
+        if success or final or outcome not in RETRYABLE_OUTCOMES:
+            await self.file_manager.save_download_log(domain, url, success, download_error)
+        
+        if success:
+            return True, url, None, None
+        return False, url, download_error, outcome
+    
+    async def download_stream(
+        self,
+        hits: Union[AsyncIterable[Tuple[str, str]], Iterable[Tuple[str, str]]],
+        show_progress: bool = True,
+        on_progress=None
+    ) -> dict:
+        """
+        Doğrulanmış (domain, url) akışını sabit sayıda worker ile indirir
+        
+        Args:
+            hits: (domain, url) üreten (async) iterable - ör. kontrolcü sonuçları
+            show_progress: İlerleme çubuğu gösterilsin mi
+            on_progress: Her indirme sonrası (başarılı, başarısız) sayılarıyla çağrılır
             
+        Returns:
+            dict: İndirme istatistikleri
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_workers * 2)
+        successful_downloads = 0
+        failed_downloads = 0
+        
+        async def producer():
+            try:
+                if hasattr(hits, '__aiter__'):
+                    async for hit in hits:
+                        await queue.put(hit)
+                else:
+                    for hit in hits:
+                        await queue.put(hit)
+            except Exception as e:
+                logger.error(f"Sonuç kaynağı okuma hatası: {e}")
+            
+            for _ in range(self.max_workers):
+                await queue.put(None)
+        
+        retries = RetryQueue(max_retries=self.max_retries, base_delay=self.retry_delay)
+        
+        async def download(hit: Tuple[str, str], attempt: int, progress):
+            nonlocal successful_downloads, failed_downloads
+            final = attempt >= self.max_retries
+            success, _, error, outcome = await self.download_confirmed(*hit, final=final)
+            if not success and outcome in RETRYABLE_OUTCOMES and retries.push(hit, attempt + 1):
+                logger.debug("🔁 Yeniden indirilecek: %s - %s", hit[0], error)
+                return
             if success:
-                return True, working_url, None
+                successful_downloads += 1
+                if attempt:
+                    retries.stats["recovered"] += 1
             else:
-                return False, working_url, download_error
+                failed_downloads += 1
+            progress.update()
+            if on_progress is not None:
+                on_progress(successful_downloads, failed_downloads)
+        
+        async def worker(progress):
+            # Ana aşama: sonuç kuyruğu (ertelenenler yalnızca çok birikirse araya alınır)
+            retries.begin()
+            try:
+                while True:
+                    entry = retries.pop_ready() if retries.full else None
+                    if entry is not None:
+                        try:
+                            await download(*entry, progress)
+                        finally:
+                            retries.task_done()
+                        continue
+                    
+                    hit = await queue.get()
+                    if hit is None:
+                        break
+                    await download(tuple(hit), 0, progress)
+            finally:
+                retries.task_done()
+            
+            # Ertelenen indirmeler
+            while True:
+                entry = await retries.get()
+                if entry is None:
+                    return
+                try:
+                    await download(*entry, progress)
+                finally:
+                    retries.task_done()
+        
+        progress = ThrottledProgress(
+            tqdm(desc="İndiriliyor", unit="dosya", disable=not show_progress),
+            postfix=lambda: {"Başarılı": successful_downloads, "Başarısız": failed_downloads}
+        )
+        tasks = [asyncio.create_task(producer())]
+        tasks.extend(asyncio.create_task(worker(progress)) for _ in range(self.max_workers))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            progress.close()
+            retries.log_stats("indirme")
+        
+        total = successful_downloads + failed_downloads
+        logger.info(f"İndirme tamamlandı: {successful_downloads}/{total} başarılı")
+        return {
+            "total_domains": total,
+            "successful_downloads": successful_downloads,
+            "failed_downloads": failed_downloads,
+            "success_rate": (successful_downloads / total * 100) if total > 0 else 0
+        }
     
-    async def download_all_archives(self, domain_list_file: str) -> dict:
+    async def download_all_archives(self, domain_list_file: Union[str, Sequence[str], AsyncIterable[str]],
+                                    shard: Optional[Tuple[int, int]] = None,
+                                    show_progress: bool = True, on_progress=None) -> dict:
         """
         Tüm domain'lerden Archive.zip dosyalarını indirir
         
         Args:
-            domain_list_file: Domain listesi dosyası
+            domain_list_file: Domain listesi dosyası, glob deseni veya "-" (stdin); tek ya da liste.
+                Önceden okunmuş domain akışı da verilebilir (ör. --processes'te ana süreçten gelen)
+            shard: (parça no, parça sayısı) verilirse yalnızca bu parçaya düşen domain'ler işlenir
+            show_progress: İlerleme çubuğu gösterilsin mi
+            on_progress: Her indirme sonrası (başarılı, başarısız) sayılarıyla çağrılır
             
         Returns:
             dict: İndirme istatistikleri
         """
         # Domain listesini oku
-        domains = await self.file_manager.read_domain_list(domain_list_file)
+        if hasattr(domain_list_file, '__aiter__'):
+            domains = [domain async for domain in domain_list_file]
+        else:
+            domains = await self.file_manager.read_domain_list(domain_list_file)
+        if shard is not None:
+            shard_index, shard_count = shard
+            domains = [domain for domain in domains if shard_of(domain, shard_count) == shard_index]
         
         if not domains:
             logger.error("Domain listesi boş veya okunamadı")
@@ -133,9 +532,11 @@ class ArchiveDownloader:
         # Semaphore ile eşzamanlı işlem sayısını sınırla
         semaphore = asyncio.Semaphore(self.max_workers)
         
-        async def process_with_semaphore(domain):
+        retries = RetryQueue(max_retries=self.max_retries, base_delay=self.retry_delay)
+        
+        async def process_with_semaphore(domain, attempt=0):
             async with semaphore:
-                return await self.process_domain(domain)
+                return domain, attempt, await self.process_domain(domain, final=attempt >= self.max_retries)
         
         # Tüm domain'leri işle
         tasks = [process_with_semaphore(domain) for domain in domains]
@@ -144,18 +545,44 @@ class ArchiveDownloader:
         successful_downloads = 0
         failed_downloads = 0
         
-        with tqdm(total=len(domains), desc="İndiriliyor", unit="domain") as pbar:
+        def record(domain, attempt, result, progress) -> None:
+            nonlocal successful_downloads, failed_downloads
+            success, url, error, outcome = result
+            if not success and outcome in RETRYABLE_OUTCOMES and retries.push(domain, attempt + 1):
+                logger.debug("🔁 Yeniden indirilecek: %s - %s", domain, error)
+                return
+            
+            if success:
+                successful_downloads += 1
+                if attempt:
+                    retries.stats["recovered"] += 1
+            else:
+                failed_downloads += 1
+            
+            progress.update()
+            if on_progress is not None:
+                on_progress(successful_downloads, failed_downloads)
+        
+        async def retry_worker(progress):
+            while True:
+                entry = await retries.get()
+                if entry is None:
+                    return
+                try:
+                    record(*await process_with_semaphore(*entry), progress)
+                finally:
+                    retries.task_done()
+        
+        pbar = tqdm(total=len(domains), desc="İndiriliyor", unit="domain", disable=not show_progress)
+        postfix = lambda: {"Başarılı": successful_downloads, "Başarısız": failed_downloads}
+        with ThrottledProgress(pbar, postfix=postfix) as progress:
             for task in asyncio.as_completed(tasks):
-                success, url, error = await task
-                
-                if success:
-                    successful_downloads += 1
-                    pbar.set_postfix({"Başarılı": successful_downloads, "Başarısız": failed_downloads})
-                else:
-                    failed_downloads += 1
-                    pbar.set_postfix({"Başarılı": successful_downloads, "Başarısız": failed_downloads})
-                
-                pbar.update(1)
+                record(*await task, progress)
+            
+            # Geçici hatayla ertelenen domain'ler artan beklemeyle yeniden denenir
+            if len(retries):
+                await asyncio.gather(*(retry_worker(progress) for _ in range(self.max_workers)))
+        retries.log_stats("indirme")
         
         # İstatistikleri hesapla
         stats = {
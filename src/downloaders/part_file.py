@@ -0,0 +1,207 @@
+import asyncio
+import errno
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class BufferedWriter:
+    """
+    Dosyanın belirli bir konumundan itibaren sırayla yazan tamponlu yazıcı
+    
+    Gelen küçük parçalar buffer_size dolana kadar bellekte birleştirilir ve tek bir pwrite ile
+    thread havuzunda yazılır. Bir tampon diske yazılırken sonraki tampon doldurulmaya devam eder,
+    böylece ağdan okuma ile disk yazması örtüşür.
+    """
+    
+    def __init__(self, part_file: "PartFile", offset: int, buffer_size: int,
+                 on_flush: Optional[Callable[[int], None]] = None, hasher: Optional[Any] = None):
+        """
+        Args:
+            part_file: Yazılacak açık dosya
+            offset: Yazmaya başlanacak konum
+            buffer_size: Diske yazmadan önce biriktirilecek byte sayısı
+            on_flush: Her tampon diske yazıldıktan sonra yazılan byte sayısıyla çağrılır
+            hasher: Verilirse yazılan veri sırayla bu hashlib nesnesine de eklenir
+        """
+        self.part_file = part_file
+        self.position = offset
+        self.buffer_size = buffer_size
+        self.on_flush = on_flush
+        self.hasher = hasher
+        
+        self._buffer = bytearray()
+        self._pending: Optional[asyncio.Task] = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # Hata veya iptalde de alınmış veri yazılır (ilerleme kaybolmaz)
+        await self.flush()
+    
+    async def write(self, data: bytes):
+        """Veriyi tampona ekler; tampon dolduysa arka planda diske yazar"""
+        self._buffer += data
+        if len(self._buffer) >= self.buffer_size:
+            await self._wait_pending()
+            buffer, self._buffer = self._buffer, bytearray()
+            self._pending = asyncio.create_task(self._write_at(buffer))
+    
+    async def flush(self):
+        """Bekleyen yazmayı ve tamponda kalan veriyi diske yazar"""
+        await self._wait_pending()
+        if self._buffer:
+            buffer, self._buffer = self._buffer, bytearray()
+            self._pending = asyncio.create_task(self._write_at(buffer))
+            await self._wait_pending()
+    
+    async def _wait_pending(self):
+        """
+        Arka plandaki yazmanın bitmesini bekler
+        
+        Yazma iptalden korunur: thread'deki pwrite sürerken dosya tanıtıcısı kapatılmamalıdır.
+        İptal edilen bekleme, çıkıştaki flush() ile tekrar beklenir.
+        """
+        if self._pending is None:
+            return
+        try:
+            await asyncio.shield(self._pending)
+        finally:
+            if self._pending is not None and self._pending.done():
+                self._pending = None
+    
+    async def _write_at(self, buffer: bytearray):
+        position = self.position
+        self.position += len(buffer)
+        await self.part_file.write_at(buffer, position, self.hasher)
+        if self.on_flush is not None:
+            self.on_flush(len(buffer))
+
+class PartFile:
+    """
+    Yarım indirme dosyasına konumlu (pwrite) yazan, yer ayıran ve toplu fsync yapan sınıf
+    
+    Paralel parçalar aynı dosya tanıtıcısını paylaşır; her parça kendi BufferedWriter'ı ile kendi
+    konumuna yazar. fsync her yazmada değil, sync_interval byte biriktikçe bir kez yapılır.
+    """
+    
+    def __init__(self, path: Path, buffer_size: int = 1024 * 1024, sync_interval: int = 64 * 1024 * 1024,
+                 prepare_sync: Optional[Callable[[], Any]] = None,
+                 on_sync: Optional[Callable[[Any], None]] = None):
+        """
+        Args:
+            path: Dosya yolu
+            buffer_size: Yazıcı başına tampon boyutu (byte)
+            sync_interval: Kaç byte yazıldıkça fsync yapılacağı (0: yalnızca kapatırken)
+            prepare_sync: fsync'ten önce çağrılır; dönen değer on_sync'e verilir (ör. durum anlık görüntüsü)
+            on_sync: fsync tamamlandıktan sonra çağrılır (ör. durum dosyasını kaydetmek için)
+        """
+        self.path = Path(path)
+        self.buffer_size = max(1, buffer_size)
+        self.sync_interval = sync_interval
+        self.prepare_sync = prepare_sync
+        self.on_sync = on_sync
+        
+        self._fd: Optional[int] = None
+        self._unsynced = 0
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
+    async def open(self, truncate: bool = False) -> "PartFile":
+        """
+        Dosyayı yazmak için açar (yoksa oluşturur)
+        
+        Args:
+            truncate: Mevcut içerik silinsin mi
+        """
+        flags = os.O_WRONLY | os.O_CREAT | (os.O_TRUNC if truncate else 0)
+        self._fd = await asyncio.to_thread(os.open, self.path, flags, 0o644)
+        return self
+    
+    @property
+    def size(self) -> int:
+        """Dosyanın diskteki boyutu"""
+        return os.fstat(self._fd).st_size
+    
+    async def preallocate(self, size: int):
+        """
+        Dosya için diskte yer ayırır (Content-Length biliniyorsa parçalanmayı ve yer hatasını önler)
+        
+        Args:
+            size: Dosyanın son boyutu
+        """
+        await asyncio.to_thread(self._preallocate, size)
+    
+    def _preallocate(self, size: int):
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(self._fd, 0, size)
+                return
+            except OSError as e:
+                if e.errno not in (errno.EOPNOTSUPP, errno.EINVAL, errno.ENOSYS):
+                    raise
+                # Dosya sistemi desteklemiyor: seyrek dosya ile devam edilir
+        os.ftruncate(self._fd, size)
+    
+    def writer(self, offset: int, on_flush: Optional[Callable[[int], None]] = None,
+               hasher: Optional[Any] = None) -> BufferedWriter:
+        """
+        Verilen konumdan itibaren yazan tamponlu yazıcı döndürür
+        
+        Args:
+            offset: Yazmaya başlanacak konum
+            on_flush: Her tampon diske yazıldıktan sonra yazılan byte sayısıyla çağrılır
+            hasher: Verilirse yazılan veri bu hashlib nesnesine de eklenir (ör. sha256)
+        
+        Returns:
+            BufferedWriter: `async with` ile kullanılır, çıkışta tamponu boşaltır
+        """
+        return BufferedWriter(self, offset, self.buffer_size, on_flush, hasher)
+    
+    async def write_at(self, data: bytes, position: int, hasher: Optional[Any] = None):
+        """Veriyi thread havuzunda verilen konuma yazar (ve hash'e ekler); gerekirse toplu fsync yapar"""
+        await asyncio.to_thread(self._pwrite_all, data, position, hasher)
+        self._unsynced += len(data)
+        if self.sync_interval > 0 and self._unsynced >= self.sync_interval:
+            await self.sync()
+    
+    def _pwrite_all(self, data: bytes, position: int, hasher: Optional[Any] = None):
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(self._fd, view, position)
+            view = view[written:]
+            position += written
+        if hasher is not None:
+            # hashlib büyük tamponlarda GIL'i bırakır; hash event loop'u bloklamaz
+            hasher.update(data)
+    
+    async def sync(self):
+        """Yazılan veriyi diske kalıcı olarak yazar ve on_sync'i çağırır"""
+        self._unsynced = 0
+        snapshot = self.prepare_sync() if self.prepare_sync is not None else None
+        await asyncio.to_thread(os.fsync, self._fd)
+        if self.on_sync is not None:
+            self.on_sync(snapshot)
+    
+    async def close(self, sync: bool = True):
+        """
+        Dosyayı kapatır
+        
+        Args:
+            sync: Kapatmadan önce fsync yapılsın mı
+        """
+        if self._fd is None:
+            return
+        try:
+            if sync and self._unsynced:
+                await self.sync()
+        finally:
+            fd, self._fd = self._fd, None
+            os.close(fd)
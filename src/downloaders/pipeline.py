@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from typing import AsyncIterable, Callable, Iterable, Optional, Union
+
+from src.utils.archive_checker import ArchiveChecker
+from src.utils.progress_journal import ProgressJournal
+from src.downloaders.archive_downloader import ArchiveDownloader
+
+logger = logging.getLogger(__name__)
+
+class CheckDownloadPipeline:
+    """Kontrol ve indirmeyi tek geçişte yapan sınıf: bulunan URL'ler doğrudan indirme aşamasına akar"""
+    
+    def __init__(self, checker: ArchiveChecker, downloader: ArchiveDownloader, hit_queue_size: int = 10000):
+        """
+        Args:
+            checker: Varlık kontrolünü yapan ArchiveChecker (açılmış olmalı)
+            downloader: İndirmeyi yapan ArchiveDownloader (açılmış olmalı)
+            hit_queue_size: İndirilmeyi bekleyen bulunan URL kuyruğunun kapasitesi
+        """
+        self.checker = checker
+        self.downloader = downloader
+        self.hit_queue_size = hit_queue_size
+    
+    async def run(
+        self,
+        domains: Union[AsyncIterable[str], Iterable[str]],
+        journal: Optional[ProgressJournal] = None,
+        show_progress: bool = True,
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> dict:
+        """
+        Domain'leri kontrol eder ve bulunanları kontrol devam ederken indirir
+        
+        Args:
+            domains: Kontrol edilecek domain listesi veya akışı
+            journal: Verilirse kontrol ilerlemesi kaydedilir (--resume için)
+            show_progress: İlerleme çubuğu gösterilsin mi
+            on_progress: Her kontrol sonrası (kontrol edilen, bulunan) ile çağrılır
+        
+        Returns:
+            dict: Kontrol ve indirme istatistikleri
+        """
+        hit_queue: asyncio.Queue = asyncio.Queue(maxsize=self.hit_queue_size)
+        
+        async def on_hit(domain: str, url: str):
+            await hit_queue.put((domain, url))
+        
+        async def confirmed_hits():
+            while True:
+                hit = await hit_queue.get()
+                if hit is None:
+                    return
+                yield hit
+        
+        def on_download_progress(successful: int, failed: int):
+            self.checker.progress_extra = {"İndirilen": successful, "İndirilemeyen": failed}
+        
+        # İndirme aşaması kontrol ile eşzamanlı çalışır; URL'ler tekrar test edilmez
+        download_task = asyncio.create_task(
+            self.downloader.download_stream(confirmed_hits(), show_progress=False, on_progress=on_download_progress)
+        )
+        
+        try:
+            found = await self.checker.check_all_domains(
+                domains, journal=journal, on_hit=on_hit, show_progress=show_progress, on_progress=on_progress
+            )
+            await hit_queue.put(None)
+            download_stats = await download_task
+        finally:
+            if not download_task.done():
+                download_task.cancel()
+                await asyncio.gather(download_task, return_exceptions=True)
+        
+        checked = self.checker.checked_count
+        successful = download_stats["successful_downloads"]
+        # Dosya bulunamayan domain'ler ve indirilemeyen dosyalar başarısız sayılır
+        failed = download_stats["failed_downloads"] + (checked - self.checker.found_count)
+        stats = {
+            "total_domains": checked,
+            "found_archives": self.checker.found_count,
+            "successful_downloads": successful,
+            "failed_downloads": failed,
+            "success_rate": (successful / (successful + failed) * 100) if successful + failed > 0 else 0
+        }
+        logger.info(f"Pipeline tamamlandı: {checked} domain kontrol edildi, {len(found)} dosya bulundu, {successful} indirildi")
+        return stats
@@ -0,0 +1,501 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import aiohttp
+
+from src.downloaders.part_file import BufferedWriter, PartFile
+from src.utils.blob_store import BlobStore, hash_file
+from src.utils.download_budget import ByteRateLimiter, DownloadBudget
+from src.utils.probe_strategies import ERROR, classify_status
+from src.utils.zip_signature import matches_signature, read_prefix, verify_archive_file
+
+logger = logging.getLogger(__name__)
+
+# İndirme istekleri sıkıştırmasız yapılır; aksi halde Content-Length ve aralıklar uyuşmaz
+DOWNLOAD_HEADERS = {"Accept-Encoding": "identity"}
+
+# Content-Range: bytes <başlangıç>-<bitiş>/<toplam veya *>
+CONTENT_RANGE_PATTERN = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+class DownloadError(Exception):
+    """İndirmenin başarısız olduğunu (mesajıyla birlikte) bildiren hata"""
+    
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        # Hata bir HTTP yanıtından geliyorsa durum kodu (yeniden deneme kararı için)
+        self.status = status
+
+class DownloadRestart(Exception):
+    """Sunucudaki dosya değişti veya kısmi indirme kullanılamıyor; indirme baştan başlamalı"""
+
+class ResumableDownload:
+    """
+    Tek bir dosyayı .part dosyasına indiren, kaldığı yerden devam edebilen sınıf
+    
+    - Yarım kalan indirme Range isteğiyle kaldığı yerden sürer (If-Range ile dosya değişmişse baştan)
+    - Sunucu Accept-Ranges bildiriyor ve dosya yeterince büyükse paralel parçalar halinde indirilir
+    - Dosya ancak boyutu ve arşiv imzası doğrulandıktan sonra asıl adına taşınır
+    - Depo verilirse SHA-256 yazarken hesaplanır ve dosya içerik adresli depoya alınır
+    
+    İlerleme .part.json durum dosyasında tutulur; süreç yarıda kesilse de sonraki çalışma devam eder.
+    """
+    
+    def __init__(self, session: aiohttp.ClientSession, url: str, target_path: Path,
+                 timeout: Optional[aiohttp.ClientTimeout] = None, segments: int = 4,
+                 segment_min_size: int = 16 * 1024 * 1024, buffer_size: int = 1024 * 1024,
+                 sync_interval: int = 64 * 1024 * 1024,
+                 on_status: Optional[Callable[[int], None]] = None,
+                 store: Optional[BlobStore] = None, etag_dedup: bool = False,
+                 limiter: Optional[ByteRateLimiter] = None, budget: Optional[DownloadBudget] = None):
+        """
+        Args:
+            session: İsteklerde kullanılacak oturum
+            url: İndirilecek URL
+            target_path: Doğrulanan dosyanın taşınacağı yol
+            timeout: İstek başına zaman aşımı
+            segments: Paralel parça sayısı (1: tek akış)
+            segment_min_size: Parçalı indirme için en küçük dosya boyutu (byte)
+            buffer_size: Diske tek seferde yazılacak tampon boyutu, parça başına (byte)
+            sync_interval: Kaç byte'ta bir fsync yapılıp durum dosyasının kaydedileceği (0: yalnızca sonda)
+            on_status: Her yanıtın HTTP durumuyla çağrılır (ör. scheduler'a bildirmek için)
+            store: Verilirse dosya bu içerik adresli depoya alınır, hedefe sabit bağlantı konur
+            etag_dedup: Depoda aynı ETag ve boyutla bir blob varsa gövde indirilmeden bağlanır
+            limiter: Tüm indirmelerin paylaştığı byte/saniye sınırı
+            budget: Dosya başı/toplam boyut ve boş disk alanı sınırları
+        """
+        self.session = session
+        self.url = url
+        self.target_path = Path(target_path)
+        self.part_path = self.target_path.with_name(self.target_path.name + ".part")
+        self.state_path = self.target_path.with_name(self.target_path.name + ".part.json")
+        self.timeout = timeout
+        self.segments = max(1, segments)
+        self.segment_min_size = segment_min_size
+        self.buffer_size = buffer_size
+        self.sync_interval = sync_interval
+        self.on_status = on_status
+        self.store = store
+        self.etag_dedup = etag_dedup
+        self.limiter = limiter
+        self.budget = budget
+        
+        # Sonuç: depoya alınan dosyanın hash'i, boyutu, ETag'i ve Last-Modified değeri
+        self.sha256: Optional[str] = None
+        self.size: Optional[int] = None
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.deduplicated = False
+        # Başarısızlıkta hata türü (probe_strategies sonuç türleri; ör. SERVER_ERROR)
+        self.outcome: Optional[str] = None
+        
+        self.state: dict = {}
+        # Hash dosyanın başından itibaren sırayla yazılan kısmı kapsar; kalanı sonda diskten okunur
+        self._hasher = hashlib.sha256()
+        self._hashed = 0
+        self._etag_match: Optional[str] = None
+        # Bütçeden bu indirme için ayrılan byte (başarısızlıkta geri verilir)
+        self._reserved = 0
+    
+    async def run(self) -> Tuple[bool, Optional[str]]:
+        """
+        İndirmeyi yapar (gerekirse kaldığı yerden devam eder)
+        
+        Returns:
+            Tuple[bool, Optional[str]]: (başarılı mı, hata mesajı)
+        """
+        succeeded = False
+        try:
+            try:
+                if self._load_state():
+                    logger.info("Yarım indirme devam ediyor: %s", self.part_path)
+                    await self._resume()
+                else:
+                    await self._fresh()
+            except DownloadRestart:
+                logger.info("Kısmi indirme kullanılamıyor, baştan indiriliyor: %s", self.url)
+                self._release()
+                self.discard()
+                try:
+                    await self._fresh()
+                except DownloadRestart:
+                    self.discard()
+                    raise DownloadError("Dosya indirme sırasında değişti")
+            await self._finalize()
+            succeeded = True
+            return True, None
+        except DownloadError as e:
+            self.outcome = classify_status(e.status) if e.status is not None else ERROR
+            return False, str(e)
+        finally:
+            if not succeeded:
+                self._release()
+            if self.state and self.part_path.exists():
+                # Hata veya iptal: ilerleme kaydedilir, sonraki çalışma kaldığı yerden sürer
+                self._save_state()
+    
+    def _admit(self, size: Optional[int], remaining: Optional[int] = None):
+        """Dosyanın boyut ve disk sınırlarına uyduğunu kontrol eder ve bütçeden yer ayırır"""
+        if self.budget is None or size is None:
+            return
+        remaining = size if remaining is None else remaining
+        error = self.budget.admit(size, remaining)
+        if error is not None:
+            raise DownloadError(error)
+        self._reserved += remaining
+    
+    def _release(self):
+        if self.budget is not None and self._reserved:
+            self.budget.release(self._reserved)
+        self._reserved = 0
+    
+    async def _received(self, size: int, written: Optional[int] = None):
+        """
+        Ağdan okunan parçayı global bant genişliği ve (boyut bilinmiyorsa) bütçe sınırına işler
+        
+        Args:
+            size: Okunan byte
+            written: Boyutu bilinmeyen dosyada şimdiye kadar okunan toplam byte
+        """
+        if self.limiter is not None:
+            await self.limiter.consume(size)
+        if self.budget is not None and written is not None:
+            self._reserved += size
+            error = self.budget.account(written, size)
+            if error is not None:
+                raise DownloadError(error)
+    
+    def discard(self):
+        """Yarım dosyayı ve durum dosyasını siler"""
+        for path in (self.part_path, self.state_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        self.state = {}
+    
+    def _load_state(self) -> bool:
+        """Önceki çalışmadan kalan yarım indirmeyi yükler; devam edilebilirse True döndürür"""
+        if not self.part_path.exists() or self.part_path.stat().st_size == 0:
+            self.discard()
+            return False
+        
+        state = None
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            # Durum dosyası yok (ör. eski sürümden kalan yarım dosya): tek akışla devam edilir
+            state = {"url": self.url, "validator": None, "size": None, "segments": None}
+        except (OSError, ValueError) as e:
+            logger.warning(f"İndirme durumu okunamadı: {self.state_path} - {e}")
+        
+        if not isinstance(state, dict) or state.get("url") != self.url:
+            self.discard()
+            return False
+        self.state = state
+        return True
+    
+    def _save_state(self, snapshot: Optional[str] = None):
+        """
+        İndirme durumunu atomik olarak diske yazar
+        
+        Args:
+            snapshot: Kaydedilecek JSON (verilmezse güncel durum; fsync öncesi alınan anlık görüntü)
+        """
+        temp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(snapshot if snapshot is not None else json.dumps(self.state))
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            logger.warning(f"İndirme durumu kaydedilemedi: {self.state_path} - {e}")
+    
+    def _range_headers(self, start: int, end: Optional[int] = None) -> dict:
+        """Kalan aralığı isteyen başlıklar (dosya değiştiyse sunucu tamamını gönderir)"""
+        headers = dict(DOWNLOAD_HEADERS)
+        headers["Range"] = f"bytes={start}-{end if end is not None else ''}"
+        if self.state.get("validator"):
+            headers["If-Range"] = self.state["validator"]
+        return headers
+    
+    @staticmethod
+    def _validator(response: aiohttp.ClientResponse) -> Optional[str]:
+        """If-Range için doğrulayıcı (zayıf ETag'ler If-Range'de kullanılamaz)"""
+        etag = response.headers.get("ETag")
+        if etag and not etag.startswith("W/"):
+            return etag
+        return response.headers.get("Last-Modified")
+    
+    def _check_range(self, response: aiohttp.ClientResponse, start: int):
+        """
+        206 yanıtının istenen aralıkla ve bilinen dosya boyutuyla uyuştuğunu kontrol eder
+        
+        If-Range'i yok sayan sunucularda değişmiş dosyanın parçaları birleştirilmesin diye
+        uyuşmazlıkta indirme baştan başlatılır.
+        """
+        match = CONTENT_RANGE_PATTERN.match(response.headers.get("Content-Range", ""))
+        if match is None or int(match.group(1)) != start:
+            raise DownloadRestart()
+        total = match.group(3)
+        if total != "*":
+            if self.state.get("size") is None:
+                self.state["size"] = int(total)
+            elif int(total) != self.state["size"]:
+                raise DownloadRestart()
+    
+    def _notify_status(self, status: int):
+        if self.on_status is not None:
+            self.on_status(status)
+    
+    def _open_part(self) -> PartFile:
+        """Durum dosyası her fsync'ten sonra kaydedilen .part dosyası"""
+        return PartFile(
+            self.part_path, buffer_size=self.buffer_size, sync_interval=self.sync_interval,
+            prepare_sync=lambda: json.dumps(self.state), on_sync=self._save_state
+        )
+    
+    async def _fresh(self):
+        """Dosyayı baştan indirir; boyut biliniyorsa yer ayırır ve ilk yanıtı ilk parça olarak kullanır"""
+        async with self.session.get(self.url, headers=DOWNLOAD_HEADERS, timeout=self.timeout) as response:
+            self._notify_status(response.status)
+            if response.status != 200:
+                raise DownloadError(f"HTTP {response.status}", response.status)
+            
+            # Arşiv değilse (ör. 200 dönen HTML hata sayfası) dosyanın tamamını indirme
+            prefix = await read_prefix(response.content)
+            if not matches_signature(self.url, prefix):
+                response.close()
+                raise DownloadError("Arşiv imzası yok")
+            
+            size = response.content_length
+            etag = response.headers.get("ETag")
+            if self.store is not None and self.etag_dedup:
+                self._etag_match = self.store.find_by_etag(etag, size)
+                if self._etag_match is not None:
+                    # Aynı ETag ve boyutta içerik depoda var: gövde indirilmez
+                    response.close()
+                    self.etag = etag
+                    self.last_modified = response.headers.get("Last-Modified")
+                    return
+            
+            self._admit(size)
+            self._hasher = hashlib.sha256()
+            self._hashed = 0
+            self.state = {
+                "url": self.url,
+                "validator": self._validator(response),
+                "etag": etag,
+                "last_modified": response.headers.get("Last-Modified"),
+                "size": size,
+                "segments": None
+            }
+            
+            async with await self._open_part().open(truncate=True) as part:
+                if size is None:
+                    # Boyut bilinmiyor: tek akış, devam konumu dosya boyutundan alınır
+                    self._save_state()
+                    async with self._writer(part, 0) as writer:
+                        await writer.write(prefix)
+                        await self._copy(response, writer, len(prefix))
+                    return
+                
+                count = self.segments if self._can_segment(response, size) else 1
+                self.state["segments"] = self._plan_segments(size, count)
+                await part.preallocate(size)
+                self._save_state()
+                try:
+                    await self._run_segments(part, first_response=response, prefix=prefix)
+                finally:
+                    # İlk yanıt yalnızca ilk parça kadar okunur; kalanı indirilmeden bağlantı kapatılır
+                    response.close()
+    
+    async def _resume(self):
+        """Yarım kalan indirmeyi kalan aralıklar için Range istekleriyle tamamlar"""
+        async with await self._open_part().open() as part:
+            if self.state.get("segments"):
+                if part.size != self.state.get("size"):
+                    raise DownloadRestart()
+                remaining = sum(end + 1 - start - done for start, end, done in self.state["segments"])
+                self._admit(self.state["size"], max(0, remaining))
+                await self._run_segments(part)
+                return
+            
+            offset = part.size
+            size = self.state.get("size")
+            if size is not None and offset >= size:
+                return
+            self._admit(size, None if size is None else size - offset)
+            
+            async with self.session.get(self.url, headers=self._range_headers(offset), timeout=self.timeout) as response:
+                self._notify_status(response.status)
+                if response.status == 416:
+                    # İstenen aralık dosyanın dışında: dosya tamamlanmış olabilir, doğrulama karar verir
+                    return
+                if response.status == 200:
+                    # Sunucu aralığı desteklemiyor veya dosya değişmiş
+                    response.close()
+                    raise DownloadRestart()
+                if response.status != 206:
+                    raise DownloadError(f"HTTP {response.status}", response.status)
+                
+                self._check_range(response, offset)
+                async with self._writer(part, offset) as writer:
+                    await self._copy(response, writer, offset if size is None else None)
+    
+    def _can_segment(self, response: aiohttp.ClientResponse, size: int) -> bool:
+        """Sunucu aralık isteklerini destekliyor ve dosya yeterince büyükse True"""
+        return (
+            self.segments > 1
+            and size >= self.segment_min_size
+            and response.headers.get("Accept-Ranges", "").lower() == "bytes"
+        )
+    
+    @staticmethod
+    def _plan_segments(size: int, count: int) -> List[List[int]]:
+        """Dosyayı eşit parçalara böler: her parça [başlangıç, bitiş (dahil), diske yazılan byte]"""
+        count = max(1, min(count, size))
+        step = -(-size // count)
+        return [[start, min(start + step, size) - 1, 0] for start in range(0, size, step)]
+    
+    async def _run_segments(self, part: PartFile, first_response: Optional[aiohttp.ClientResponse] = None,
+                            prefix: bytes = b""):
+        """Eksik parçaları paralel indirir; bir parça başarısız olursa diğerleri iptal edilir"""
+        coroutines = []
+        for index, segment in enumerate(self.state["segments"]):
+            start, end, done = segment
+            if start + done > end:
+                continue
+            if index == 0 and first_response is not None:
+                coroutines.append(self._write_segment(part, segment, first_response, prefix))
+            else:
+                coroutines.append(self._fetch_segment(part, segment))
+        if not coroutines:
+            return
+        
+        tasks = [asyncio.create_task(coroutine) for coroutine in coroutines]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _fetch_segment(self, part: PartFile, segment: List[int]):
+        """Tek bir parçanın kalan kısmını Range isteğiyle indirir"""
+        start, end, done = segment
+        headers = self._range_headers(start + done, end)
+        async with self.session.get(self.url, headers=headers, timeout=self.timeout) as response:
+            self._notify_status(response.status)
+            if response.status == 200:
+                response.close()
+                raise DownloadRestart()
+            if response.status != 206:
+                raise DownloadError(f"HTTP {response.status}", response.status)
+            self._check_range(response, start + done)
+            await self._write_segment(part, segment, response)
+    
+    async def _write_segment(self, part: PartFile, segment: List[int], response: aiohttp.ClientResponse,
+                             prefix: bytes = b""):
+        """Yanıt gövdesini parçanın dosyadaki konumuna yazar (parçanın sonunda durur)"""
+        start, end, _ = segment
+        
+        def flushed(size: int):
+            # Durum yalnızca diske yazılmış byte'ları sayar; devam ederken eksik kalan olmaz
+            segment[2] += size
+        
+        async def body():
+            if prefix:
+                yield prefix
+            async for chunk in response.content.iter_any():
+                yield chunk
+        
+        received = segment[2]
+        async with self._writer(part, start + received, on_flush=flushed) as writer:
+            async for chunk in body():
+                remaining = end + 1 - (start + received)
+                if len(chunk) > remaining:
+                    chunk = chunk[:remaining]
+                await self._received(len(chunk))
+                await writer.write(chunk)
+                received += len(chunk)
+                if start + received > end:
+                    break
+        
+        if start + segment[2] <= end:
+            raise DownloadError(f"Parça eksik indirildi: {start}-{end}")
+    
+    def _writer(self, part: PartFile, offset: int,
+                on_flush: Optional[Callable[[int], None]] = None) -> BufferedWriter:
+        """Yazıcı döndürür; hash'in kaldığı konumdan yazıyorsa veri yazılırken hash'e de eklenir"""
+        if self.store is None or offset != self._hashed:
+            return part.writer(offset, on_flush)
+        
+        def flushed(size: int):
+            self._hashed += size
+            if on_flush is not None:
+                on_flush(size)
+        
+        return part.writer(offset, flushed, self._hasher)
+    
+    async def _copy(self, response: aiohttp.ClientResponse, writer: BufferedWriter,
+                    written: Optional[int] = None):
+        """
+        Yanıt gövdesini sırayla yazıcıya aktarır (gelen parçalar yazıcıda birleştirilir)
+        
+        Args:
+            response: Okunacak yanıt
+            writer: Yazıcı
+            written: Boyut bilinmiyorsa dosyada zaten bulunan byte (bütçe sınırı okurken denetlenir)
+        """
+        async for chunk in response.content.iter_any():
+            if written is not None:
+                written += len(chunk)
+            await self._received(len(chunk), written)
+            await writer.write(chunk)
+    
+    async def _finalize(self):
+        """Yarım dosyayı doğrular ve asıl adına taşır (depo varsa depoya alır); doğrulanamazsa siler"""
+        if self._etag_match is not None:
+            self.deduplicated = await asyncio.to_thread(self.store.add, None, self._etag_match, self.target_path)
+            self.sha256 = self._etag_match
+            self.size = self.target_path.stat().st_size
+            return
+        
+        size = self.part_path.stat().st_size
+        expected = self.state.get("size")
+        if expected is not None and size != expected:
+            raise DownloadError(f"Dosya boyutu uyuşmuyor: {size}/{expected} byte")
+        
+        segments = self.state.get("segments") or []
+        if any(start + done <= end for start, end, done in segments):
+            raise DownloadError("Dosyanın bazı parçaları eksik")
+        
+        if not await asyncio.to_thread(verify_archive_file, self.part_path, self.url):
+            self.discard()
+            raise DownloadError("İndirilen dosya doğrulanamadı")
+        
+        self.size = size
+        self.etag = self.state.get("etag")
+        self.last_modified = self.state.get("last_modified")
+        if self.store is None:
+            os.replace(self.part_path, self.target_path)
+        else:
+            # Sırayla yazılmayan kısım (paralel parçalar, devam edilen indirme) diskten hash'lenir
+            hasher = await asyncio.to_thread(hash_file, self.part_path, self._hasher, self._hashed)
+            self.sha256 = hasher.hexdigest()
+            self.deduplicated = await asyncio.to_thread(self.store.add, self.part_path, self.sha256, self.target_path)
+        try:
+            self.state_path.unlink()
+        except FileNotFoundError:
+            pass
+        self.state = {}
@@ -9,29 +9,30 @@ Bu uygulama, domain listesindeki her domain için /Archive.zip dosyasını indir
 import asyncio
 import logging
 import argparse
-import sys
 from pathlib import Path
 from colorama import init, Fore, Style
 
 from src.downloaders.archive_downloader import ArchiveDownloader
+from src.downloaders.pipeline import CheckDownloadPipeline
+from src.utils.archive_checker import ArchiveChecker, load_probe_paths
+from src.utils.domain_source import STDIN
+from src.utils.download_budget import GB, MB
+from src.utils.file_manager import FileManager
+from src.utils.result_writer import ResultWriter
+from src.utils.http_session import SessionFactory
+from src.utils.logging_setup import setup_queue_logging
+from src.utils.metrics import RequestMetrics, create_exporter
+from src.utils.request_scheduler import RequestScheduler
+from src.utils.sharding import iter_feed, merge_stats, run_event_loop, run_fed_shards, shard_file_name
+from src.utils.validator_store import DOWNLOAD, PROBE, ValidatorStore
 
 # Colorama'yı başlat
 init()
 
 # Logging yapılandırması
 def setup_logging():
-    """Logging yapılandırmasını ayarlar"""
-    # Logs klasörünü oluştur
-    Path("logs").mkdir(exist_ok=True)
-    
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('logs/archive_downloader.log'),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    """Logging yapılandırmasını ayarlar (dosya ve konsol yazımı ayrı thread'de yapılır)"""
+    setup_queue_logging('logs/archive_downloader.log')
 
 def print_banner():
     """Uygulama banner'ını yazdırır"""
@@ -58,6 +59,8 @@ def print_stats(stats: dict):
         return
     
     print(f"{Fore.CYAN}📁 Toplam Domain: {stats['total_domains']}{Style.RESET_ALL}")
+    if 'found_archives' in stats:
+        print(f"{Fore.CYAN}🔎 Archive.zip Bulunan: {stats['found_archives']}{Style.RESET_ALL}")
     print(f"{Fore.GREEN}✅ Başarılı İndirme: {stats['successful_downloads']}{Style.RESET_ALL}")
     print(f"{Fore.RED}❌ Başarısız İndirme: {stats['failed_downloads']}{Style.RESET_ALL}")
     print(f"{Fore.YELLOW}📈 Başarı Oranı: {stats['success_rate']:.1f}%{Style.RESET_ALL}")
@@ -65,12 +68,177 @@ def print_stats(stats: dict):
     if stats['successful_downloads'] > 0:
         print(f"\n{Fore.GREEN}🎉 İndirilen dosyalar 'data/downloads/' klasöründe bulunabilir{Style.RESET_ALL}")
 
+def build_scheduler(args: argparse.Namespace) -> RequestScheduler:
+    """Komut satırı ayarlarından istek scheduler'ını oluşturur"""
+    return RequestScheduler(
+        max_in_flight=args.max_in_flight or (args.workers if args.adaptive else 0),
+        rate=args.rate,
+        host_rate=args.host_rate,
+        adaptive=args.adaptive
+    )
+
+async def run_downloads(args: argparse.Namespace, shard=None, show_progress: bool = True,
+                        on_progress=None, items=None) -> dict:
+    """
+    Seçili moddaki indirme işlemini tek bir event loop'ta çalıştırır
+    
+    Args:
+        args: Komut satırı ayarları
+        shard: (parça no, parça sayısı); çıktı ve metrik dosyaları parçaya göre ayrılır
+        show_progress: İlerleme çubuğu gösterilsin mi
+        on_progress: (tamamlanan, bulunan/başarılı) ile çağrılır
+        items: Verilirse girdi dosyadan okunmaz; bu akıştaki domain'ler (--from-results ile
+            (domain, URL) çiftleri) işlenir
+        
+    Returns:
+        dict: İndirme istatistikleri
+    """
+    download_progress = None
+    if on_progress is not None:
+        download_progress = lambda successful, failed: on_progress(successful + failed, successful)
+    
+    # İstek aşaması süreleri (yalnızca metrik çıktısı istendiğinde oturuma eklenir)
+    metrics = RequestMetrics()
+    metrics_enabled = bool(args.metrics_file) or args.metrics_port is not None
+    
+    # Paylaşılan bağlantı havuzu (URL testi ve indirme aynı havuzu kullanır)
+    session_factory = SessionFactory(
+        limit=args.pool_limit or args.workers * 2,
+        limit_per_host=args.per_host_limit,
+        keepalive_timeout=args.keepalive,
+        timeout=args.timeout,
+        trace_configs=[metrics.trace_config()] if metrics_enabled else None
+    )
+    
+    # Kontrol ve indirme istekleri aynı oran/eşzamanlılık sınırlarını paylaşır
+    scheduler = build_scheduler(args)
+    paths = load_probe_paths(args.paths, args.paths_file)
+    metrics.add_gauges("scheduler", lambda: {"in_flight": scheduler.in_flight, "limit": scheduler.limit, **scheduler.stats})
+    exporter = create_exporter(metrics, args.metrics_file, args.metrics_interval, args.metrics_port, shard)
+    
+    # İndirici'yi başlat
+    async with exporter, session_factory, ArchiveDownloader(
+        max_workers=args.workers,
+        timeout=args.timeout,
+        connect_timeout=args.connect_timeout,
+        tls_timeout=args.tls_timeout,
+        read_timeout=args.read_timeout,
+        max_retries=args.max_retries,
+        retry_delay=args.retry_delay,
+        session_factory=session_factory,
+        scheduler=scheduler,
+        paths=paths,
+        segments=args.segments,
+        segment_min_size=args.segment_min_size * 1024 * 1024,
+        write_buffer=args.write_buffer * 1024 * 1024,
+        fsync_interval=args.fsync_interval * 1024 * 1024,
+        dedup=not args.no_dedup,
+        etag_dedup=args.etag_dedup,
+        list_output=Path("data/results") / args.list if args.list else None,
+        max_bandwidth=args.max_bandwidth * MB,
+        max_file_size=int(args.max_file_size * MB),
+        max_total_size=int(args.max_total_size * GB),
+        min_free_space=int(args.min_free_space * GB),
+        validator_store=None if args.no_revalidate else ValidatorStore(args.validator_cache, DOWNLOAD)
+    ) as downloader:
+        
+        if args.from_results:
+            # Doğrulanmış URL'leri tekrar test etmeden indir
+            hits = items if items is not None else ResultWriter.read_results(Path("data/results") / args.from_results)
+            return await downloader.download_stream(
+                hits, show_progress=show_progress, on_progress=download_progress
+            )
+        
+        if args.pipeline:
+            # Kontrol ve indirmeyi tek geçişte yap
+            output_file = args.output if shard is None else shard_file_name(args.output, *shard)
+            async with ArchiveChecker(
+                max_workers=args.check_workers or args.workers,
+                timeout=args.check_timeout,
+                connect_timeout=args.connect_timeout,
+                tls_timeout=args.tls_timeout,
+                read_timeout=args.read_timeout,
+                max_retries=args.max_retries,
+                retry_delay=args.retry_delay,
+                output_file=output_file,
+                session_factory=session_factory,
+                scheduler=scheduler,
+                validation=args.validate,
+                paths=paths,
+                stop_on_first=not args.all_paths,
+                validator_store=None if args.no_revalidate else ValidatorStore(args.validator_cache, PROBE)
+            ) as checker:
+                domains = items if items is not None else FileManager().iter_domains(args.domain_file)
+                return await CheckDownloadPipeline(checker, downloader).run(
+                    domains, show_progress=show_progress, on_progress=on_progress
+                )
+        
+        # İndirme işlemini başlat
+        return await downloader.download_all_archives(
+            items if items is not None else args.domain_file,
+            show_progress=show_progress, on_progress=download_progress
+        )
+
+def download_shard(shard_index: int, shard_count: int, config: dict, progress, inbox) -> dict:
+    """
+    Alt süreçte çalışır: bu sürece düşen domain parçasını kendi event loop'unda işler
+    
+    Args:
+        shard_index: Parça numarası
+        shard_count: Toplam parça sayısı
+        config: Komut satırı ayarları
+        progress: Ortak ilerleme sayaçları (ShardProgress)
+        inbox: Ana süreçte okunup bu parçaya yönlendirilen girdinin kuyruğu
+        
+    Returns:
+        dict: Parçanın indirme istatistikleri
+    """
+    setup_logging()
+    args = argparse.Namespace(**config)
+    # Global oran, bant genişliği ve toplam boyut sınırları süreçler arasında paylaştırılır
+    args.rate = args.rate / shard_count
+    args.max_bandwidth = args.max_bandwidth / shard_count
+    args.max_total_size = args.max_total_size / shard_count
+    return run_event_loop(
+        run_downloads(args, shard=(shard_index, shard_count), show_progress=False, on_progress=progress.update,
+                      items=iter_feed(inbox)),
+        use_uvloop=not args.no_uvloop
+    )
+
 async def main():
     """Ana uygulama fonksiyonu"""
     parser = argparse.ArgumentParser(description='Archive.zip İndirici')
     parser.add_argument(
         'domain_file',
-        help='Domain listesi dosyası (data/domains/ klasöründe)'
+        nargs='*',
+        help='Domain listesi dosyaları: dosya adı, glob deseni ("feeds/*.gz") veya stdin için "-" (göreli yollar data/domains/ içinde aranır; .gz/.xz/.bz2 desteklenir)'
+    )
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='Kontrol ve indirmeyi tek geçişte yap (bulunanlar tekrar test edilmeden indirilir)'
+    )
+    parser.add_argument(
+        '--from-results',
+        default=None,
+        help='Kontrol sonuç dosyasındaki URL\'leri test etmeden indir (data/results/ klasöründe)'
+    )
+    parser.add_argument(
+        '--check-workers',
+        type=int,
+        default=None,
+        help='Pipeline modunda eşzamanlı kontrol worker sayısı (varsayılan: --workers)'
+    )
+    parser.add_argument(
+        '--check-timeout',
+        type=int,
+        default=10,
+        help='Pipeline modunda kontrol zaman aşımı saniye (varsayılan: 10)'
+    )
+    parser.add_argument(
+        '--output',
+        default='available_archives.txt',
+        help='Pipeline modunda bulunanların yazılacağı dosya (varsayılan: available_archives.txt)'
     )
     parser.add_argument(
         '--workers',
@@ -84,6 +252,203 @@ async def main():
         default=30,
         help='İndirme zaman aşımı saniye (varsayılan: 30)'
     )
+    parser.add_argument(
+        '--connect-timeout',
+        type=float,
+        default=5,
+        help='TCP bağlantısı zaman aşımı saniye; yanıt vermeyen host\'lar toplam süre beklenmeden bırakılır (varsayılan: 5)'
+    )
+    parser.add_argument(
+        '--tls-timeout',
+        type=float,
+        default=5,
+        help='HTTPS için bağlantı süresine eklenen TLS el sıkışması süresi saniye (varsayılan: 5)'
+    )
+    parser.add_argument(
+        '--read-timeout',
+        type=float,
+        default=None,
+        help='İki okuma arasında en fazla bekleme saniye (varsayılan: --timeout)'
+    )
+    parser.add_argument(
+        '--max-retries',
+        type=int,
+        default=2,
+        help='Geçici hatalar (zaman aşımı, bağlantı sıfırlama, 429/5xx) için ertelenmiş yeniden deneme sayısı; 0 kapatır (varsayılan: 2)'
+    )
+    parser.add_argument(
+        '--retry-delay',
+        type=float,
+        default=2,
+        help='İlk yeniden denemeden önceki bekleme saniye, her denemede ikiye katlanır (varsayılan: 2)'
+    )
+    parser.add_argument(
+        '--segments',
+        type=int,
+        default=4,
+        help='Büyük dosyalar için paralel parça sayısı, sunucu Range destekliyorsa (varsayılan: 4)'
+    )
+    parser.add_argument(
+        '--segment-min-size',
+        type=int,
+        default=16,
+        help='Parçalı indirme için en küçük dosya boyutu MB (varsayılan: 16)'
+    )
+    parser.add_argument(
+        '--write-buffer',
+        type=int,
+        default=1,
+        help='Diske tek seferde yazılan tampon boyutu MB, indirme parçası başına (varsayılan: 1)'
+    )
+    parser.add_argument(
+        '--fsync-interval',
+        type=int,
+        default=64,
+        help='Kaç MB yazıldıkça fsync yapılacağı, 0: yalnızca dosya sonunda (varsayılan: 64)'
+    )
+    parser.add_argument(
+        '--list',
+        nargs='?',
+        const='archive_listing.jsonl',
+        default=None,
+        metavar='DOSYA',
+        help='İndirme yerine ZIP içeriğini Range istekleriyle listele ve JSONL olarak yaz '
+             '(data/results/ klasöründe, varsayılan: archive_listing.jsonl)'
+    )
+    parser.add_argument(
+        '--no-dedup',
+        action='store_true',
+        help='İçerik adresli depoyu kullanma, her domain için ayrı kopya sakla'
+    )
+    parser.add_argument(
+        '--etag-dedup',
+        action='store_true',
+        help='Depoda aynı ETag ve boyutta dosya varsa gövdeyi indirmeden bağla'
+    )
+    parser.add_argument(
+        '--max-bandwidth',
+        type=float,
+        default=0,
+        help='Tüm indirmelerin toplam hızı MB/s, tüm süreçler toplamı (varsayılan: 0, sınırsız)'
+    )
+    parser.add_argument(
+        '--max-file-size',
+        type=float,
+        default=0,
+        help='Content-Length bu değeri (MB) aşan dosyaları indirme (varsayılan: 0, sınırsız)'
+    )
+    parser.add_argument(
+        '--max-total-size',
+        type=float,
+        default=0,
+        help='Bu çalışmada indirilecek toplam boyut GB (varsayılan: 0, sınırsız)'
+    )
+    parser.add_argument(
+        '--min-free-space',
+        type=float,
+        default=0,
+        help='Diskte en az bu kadar GB boş alan kalsın; altına inince yeni indirmeler bekletilir '
+             '(varsayılan: 0, denetlenmez)'
+    )
+    parser.add_argument(
+        '--pool-limit',
+        type=int,
+        default=None,
+        help='Toplam eşzamanlı bağlantı sayısı (varsayılan: worker sayısının 2 katı)'
+    )
+    parser.add_argument(
+        '--per-host-limit',
+        type=int,
+        default=0,
+        help='Host başına eşzamanlı bağlantı sayısı (varsayılan: 0, sınırsız)'
+    )
+    parser.add_argument(
+        '--keepalive',
+        type=float,
+        default=30,
+        help='Boştaki bağlantıların açık tutulma süresi saniye (varsayılan: 30)'
+    )
+    parser.add_argument(
+        '--paths',
+        default=None,
+        help='Denenecek dosya yolları, virgülle ayrılmış (varsayılan: Archive.zip)'
+    )
+    parser.add_argument(
+        '--paths-file',
+        default=None,
+        help='Her satırda bir dosya yolu bulunan liste (ör. backup.zip, site.tar.gz)'
+    )
+    parser.add_argument(
+        '--all-paths',
+        action='store_true',
+        help='Pipeline modunda ilk bulunan dosyada durma, domain\'deki tüm yolları dene'
+    )
+    parser.add_argument(
+        '--validate',
+        choices=['headers', 'signature'],
+        default='headers',
+        help='Pipeline modunda bulunan dosyanın doğrulanması: headers (HEAD + MIME/boyut) veya '
+             'signature (Range ile ilk 4 byte, ZIP imzası) (varsayılan: headers)'
+    )
+    parser.add_argument(
+        '--max-in-flight',
+        type=int,
+        default=0,
+        help='Aynı anda açık en fazla istek sayısı (varsayılan: 0, yalnızca worker sayısı sınırlar)'
+    )
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=0,
+        help='Saniyede en fazla istek sayısı, tüm süreçler toplamı (varsayılan: 0, sınırsız)'
+    )
+    parser.add_argument(
+        '--host-rate',
+        type=float,
+        default=0,
+        help='Aynı host\'a saniyede en fazla istek sayısı (varsayılan: 0, sınırsız)'
+    )
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='AIMD: hata/zaman aşımı oranı düşükken eşzamanlılığı artır, yükselince düşür'
+    )
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=1,
+        help='Domain\'leri bu kadar sürece bölerek işle (varsayılan: 1)'
+    )
+    parser.add_argument(
+        '--no-uvloop',
+        action='store_true',
+        help='Alt süreçlerde kurulu olsa bile uvloop kullanma'
+    )
+    parser.add_argument(
+        '--metrics-file',
+        help='DNS, bağlantı, TLS ve ilk byte sürelerini bu JSON dosyasına periyodik yaz (data/results/ klasöründe)'
+    )
+    parser.add_argument(
+        '--metrics-interval',
+        type=float,
+        default=10,
+        help='Metrik dosyasının yazılma aralığı, saniye (varsayılan: 10)'
+    )
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        help='Metrikleri 127.0.0.1:PORT/metrics adresinde Prometheus biçiminde sun (süreç başına port + süreç no)'
+    )
+    parser.add_argument(
+        '--validator-cache',
+        default='data/cache/validators.sqlite3',
+        help='Bulunan dosyaların ETag/Last-Modified/boyut kayıtları (varsayılan: data/cache/validators.sqlite3)'
+    )
+    parser.add_argument(
+        '--no-revalidate',
+        action='store_true',
+        help='Önceki taramanın kayıtlarıyla koşullu istek (If-None-Match/If-Modified-Since) gönderme'
+    )
     
     args = parser.parse_args()
     
@@ -94,31 +459,74 @@ async def main():
     setup_logging()
     logger = logging.getLogger(__name__)
     
-    # Domain dosyasının varlığını kontrol et
-    domain_file_path = Path("data/domains") / args.domain_file
-    if not domain_file_path.exists():
-        print(f"{Fore.RED}❌ Domain dosyası bulunamadı: {domain_file_path}{Style.RESET_ALL}")
-        print(f"{Fore.YELLOW}💡 Lütfen domain listesini 'data/domains/' klasörüne koyun{Style.RESET_ALL}")
-        return
-    
-    print(f"{Fore.CYAN}📋 Domain dosyası: {args.domain_file}{Style.RESET_ALL}")
+    if args.from_results:
+        # Sonuç dosyasının varlığını kontrol et
+        results_path = Path("data/results") / args.from_results
+        if not results_path.exists():
+            print(f"{Fore.RED}❌ Sonuç dosyası bulunamadı: {results_path}{Style.RESET_ALL}")
+            return
+        print(f"{Fore.CYAN}📋 Sonuç dosyası: {args.from_results}{Style.RESET_ALL}")
+    else:
+        if not args.domain_file:
+            parser.error("domain_file veya --from-results gerekli")
+        
+        if STDIN in args.domain_file and args.processes > 1:
+            parser.error("stdin (-) --processes ile birlikte kullanılamaz")
+        
+        # Domain kaynaklarının varlığını kontrol et
+        domain_sources = FileManager().resolve_domain_sources(args.domain_file)
+        if not domain_sources:
+            print(f"{Fore.RED}❌ Domain dosyası bulunamadı: {' '.join(args.domain_file)}{Style.RESET_ALL}")
+            print(f"{Fore.YELLOW}💡 Lütfen domain listesini 'data/domains/' klasörüne koyun{Style.RESET_ALL}")
+            return
+        
+        print(f"{Fore.CYAN}📋 Domain dosyası: {', '.join(str(source) for source in domain_sources)}{Style.RESET_ALL}")
+        if args.pipeline:
+            print(f"{Fore.CYAN}🔀 Mod: tek geçiş (kontrol + indirme){Style.RESET_ALL}")
+    if args.list:
+        print(f"{Fore.CYAN}📄 Mod: içerik listeleme -> data/results/{args.list}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}🔧 Worker sayısı: {args.workers}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}⏱️  Zaman aşımı: {args.timeout} saniye{Style.RESET_ALL}")
+    if args.processes > 1:
+        print(f"{Fore.CYAN}🧩 Süreç sayısı: {args.processes}{Style.RESET_ALL}")
     print(f"{Fore.GREEN}══════════════════════════════════════════════════════════════{Style.RESET_ALL}\n")
     
     try:
-        # İndirici'yi başlat
-        async with ArchiveDownloader(
-            max_workers=args.workers,
-            timeout=args.timeout
-        ) as downloader:
-            
-            # İndirme işlemini başlat
-            stats = await downloader.download_all_archives(args.domain_file)
-            
-            # İstatistikleri yazdır
-            print_stats(stats)
-            
+        if args.processes > 1:
+            # Girdi burada bir kez okunup süreçlere dağıtılır; her süreç kendi event loop'u ve
+            # bağlantı havuzuyla bir parçayı işler
+            if args.from_results:
+                items = ResultWriter.read_results(Path("data/results") / args.from_results)
+                key = lambda hit: hit[0]
+            else:
+                items = FileManager().iter_domains(args.domain_file)
+                key = lambda domain: domain
+            shard_stats = await run_fed_shards(
+                download_shard, args.processes, vars(args), items, key,
+                desc="İşleniyor", hits_label="Bulunan" if args.pipeline else "Başarılı"
+            )
+            keys = ["total_domains", "successful_downloads", "failed_downloads"]
+            if args.pipeline:
+                keys.append("found_archives")
+                # Parça sonuçlarını asıl çıktı dosyasında birleştir
+                await ResultWriter.merge_files(
+                    [
+                        Path("data/results") / shard_file_name(args.output, index, args.processes)
+                        for index in range(args.processes)
+                    ],
+                    Path("data/results") / args.output
+                )
+            stats = merge_stats(shard_stats, keys)
+            total = stats["total_domains"]
+            stats["success_rate"] = (stats["successful_downloads"] / total * 100) if total > 0 else 0
+            if len(shard_stats) < args.processes:
+                print(f"{Fore.RED}❌ {args.processes - len(shard_stats)} süreç hata ile bitti (ayrıntılar log dosyasında){Style.RESET_ALL}")
+        else:
+            stats = await run_downloads(args)
+        
+        # İstatistikleri yazdır
+        print_stats(stats)
+        
     except KeyboardInterrupt:
         print(f"\n{Fore.YELLOW}⚠️  Kullanıcı tarafından durduruldu{Style.RESET_ALL}")
         logger.info("Kullanıcı tarafından durduruldu")
@@ -1,137 +1,547 @@
 import asyncio
-import aiohttp
 import logging
-from typing import List, Optional, Tuple
-from asyncio_throttle import Throttler
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 from tqdm import tqdm
 import aiofiles
 from pathlib import Path
 
+from .progress_journal import ProgressJournal
+from .result_writer import ResultWriter
+from .dns_resolver import CachedResolver, DNSResolver
+from .http_session import SessionFactory, TimeoutPolicy
+from .request_scheduler import RequestScheduler
+from .politeness import GROUP_KEYS, PolitenessQueue, group_key
+from .progress import ThrottledProgress
+from .retry_queue import RetryQueue
+from .validator_store import ValidatorStore
+from .zip_signature import SIGNATURE_RANGE_HEADERS, matches_signature, read_prefix
+from .probe_strategies import (
+    ABSENT, DNS, ERROR, FOUND, RATE_LIMITED, REFUSED, RESET, RETRYABLE_OUTCOMES, TIMEOUT, UNREACHABLE,
+    ProbeOutcome, classify_exception, classify_status, get_probe_strategy
+)
+
 logger = logging.getLogger(__name__)
 
+# HEAD'i desteklemeyen sunucuların döndürdüğü durumlar (imza kontrolüne geçilir)
+HEAD_UNSUPPORTED_STATUSES = (405, 501)
+
+# Bulunan dosyanın nasıl doğrulanacağı
+VALIDATION_MODES = ("headers", "signature")
+
+# Varsayılan olarak denenen dosya yolları ve protokoller (öncelik sırasıyla)
+DEFAULT_PATHS = ("Archive.zip",)
+PROBE_SCHEMES = ("https", "http")
+
+# Bu sonuçları veren protokol aynı domain'in diğer yollarında denenmez
+DEAD_OUTCOMES = (REFUSED, DNS, UNREACHABLE, TIMEOUT, RESET, RATE_LIMITED, ERROR)
+
+def load_probe_paths(paths: Optional[str] = None, paths_file: Optional[str] = None) -> List[str]:
+    """
+    Denenecek dosya yollarını virgülle ayrılmış listeden ve/veya dosyadan okur
+    
+    Args:
+        paths: Virgülle ayrılmış yollar (ör. "Archive.zip,backup.zip")
+        paths_file: Her satırda bir yol bulunan dosya (# ile başlayanlar yorum)
+        
+    Returns:
+        List[str]: Baştaki / kaldırılmış, tekrarsız yollar (hiç verilmezse varsayılan)
+    """
+    entries: List[str] = []
+    if paths:
+        entries.extend(paths.split(","))
+    if paths_file:
+        with open(paths_file, "r", encoding="utf-8") as f:
+            entries.extend(line for line in f if not line.lstrip().startswith("#"))
+    
+    result: List[str] = []
+    for entry in entries:
+        entry = entry.strip().lstrip("/")
+        if entry and entry not in result:
+            result.append(entry)
+    return result or list(DEFAULT_PATHS)
+
 class ArchiveChecker:
     """Archive.zip dosyalarının varlığını kontrol eden sınıf"""
     
-    def __init__(self, max_workers: int = 10, timeout: int = 10):
+    def __init__(self, max_workers: int = 10, timeout: int = 10,
+                 output_file: str = "available_archives.txt", output_format: Optional[str] = None,
+                 probe_strategy: str = "sequential", dns_resolver: Optional[DNSResolver] = None,
+                 session_factory: Optional[SessionFactory] = None,
+                 scheduler: Optional[RequestScheduler] = None, group_by: Optional[str] = None,
+                 group_limit: int = 4, group_buffer: int = 10000, validation: str = "headers",
+                 paths: Optional[Sequence[str]] = None, stop_on_first: bool = True,
+                 validator_store: Optional[ValidatorStore] = None, connect_timeout: Optional[float] = None,
+                 tls_timeout: Optional[float] = None, read_timeout: Optional[float] = None,
+                 max_retries: int = 2, retry_delay: float = 2.0):
+        if group_by is not None and group_by not in GROUP_KEYS:
+            raise ValueError(f"Bilinmeyen gruplama anahtarı: {group_by}")
+        if validation not in VALIDATION_MODES:
+            raise ValueError(f"Bilinmeyen doğrulama yöntemi: {validation}")
+        
         self.max_workers = max_workers
         self.timeout = timeout
-        self.throttler = Throttler(rate_limit=max_workers, period=1)
+        # Bağlanma/TLS/okuma için ayrı süreler: yanıt vermeyen host worker'ı toplam süre boyunca tutmaz
+        self.timeouts = TimeoutPolicy(timeout, connect_timeout, tls_timeout, read_timeout)
+        # Geçici hatayla (zaman aşımı, bağlantı kopması, 5xx, 429) biten domain'ler sona ertelenip yeniden denenir
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        # Eşzamanlılık worker sayısıyla, istek oranı scheduler ile sınırlanır
+        self.scheduler = scheduler or RequestScheduler()
         self.session = None
         self.available_archives = []
+        self.checked_count = 0
+        self.output_path = Path("data/results") / output_file
+        self.result_writer = ResultWriter(self.output_path, output_format)
+        self.probe_strategy = get_probe_strategy(probe_strategy)
+        # headers: HEAD + MIME/boyut (HEAD desteklenmezse imza), signature: Range GET ile ZIP imzası
+        self.validation = validation
+        # Her domain'de denenecek dosya yolları; stop_on_first ise ilk bulunan yeterli
+        self.paths = [path.lstrip("/") for path in paths] if paths else list(DEFAULT_PATHS)
+        self.stop_on_first = stop_on_first
+        # Önceki taramada bulunan URL'lere koşullu istek gönderilir (değişmediyse 304)
+        self.validator_store = validator_store
+        self.found_count = 0
+        self.dns_resolver = dns_resolver
+        self.dns_failed_count = 0
+        # Aynı IP/subnet/host'a düşen domain'ler gruplanır, gruplar sırayla işlenir
+        self.group_by = group_by
+        self.group_limit = group_limit
+        self.group_buffer = group_buffer
+        # İlerleme çubuğunda gösterilecek ek sayaçlar (ör. pipeline indirme sayıları)
+        self.progress_extra = {}
+        
+        # Dışarıdan verilen havuz paylaşılır ve burada kapatılmaz
+        self._owns_factory = session_factory is None
+        if session_factory is None:
+            session_factory = SessionFactory(
+                limit=max_workers * 2,
+                timeout=timeout,
+                resolver=CachedResolver(dns_resolver) if dns_resolver is not None else None
+            )
+        self.session_factory = session_factory
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout),
-            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        )
+        if self.dns_resolver is not None:
+            # HTTP istekleri DNS aşamasının önbelleğini kullanır (CachedResolver)
+            self.dns_resolver.open()
+        if self.validator_store is not None:
+            self.validator_store.open()
+        
+        self.session = self.session_factory.get_session()
+        await self.result_writer.start()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        await self.result_writer.close()
+        if self._owns_factory:
+            await self.session_factory.close()
+        if self.dns_resolver is not None:
+            self.dns_resolver.close()
+        if self.validator_store is not None:
+            self.validator_store.close()
     
     async def check_archive_exists(self, domain: str) -> Tuple[bool, str, Optional[str]]:
         """
-        Domain'de Archive.zip dosyasının varlığını kontrol eder
+        Domain'de arşiv dosyasının (varsayılan: Archive.zip) varlığını kontrol eder
         
         Args:
             domain: Kontrol edilecek domain
             
         Returns:
-            Tuple[bool, str, Optional[str]]: (mevcut mu, URL, hata mesajı)
+            Tuple[bool, str, Optional[str]]: (mevcut mu, ilk bulunan URL, hata mesajı)
+        """
+        hits, error, _ = await self.check_domain(domain)
+        if hits:
+            return True, hits[0], None
+        return False, "", error
+    
+    async def check_domain(self, domain: str) -> Tuple[List[str], Optional[str], bool]:
+        """
+        Yol listesindeki dosyaları sırayla dener
+        
+        Yollar aynı worker'da art arda denendiği için istekler host'a açılmış keep-alive
+        bağlantısını tekrar kullanır. Yanıt vermeyen protokol (ör. kapalı HTTPS portu)
+        sonraki yollarda denenmez; host'a hiç ulaşılamıyorsa kalan yollar atlanır.
+        
+        Args:
+            domain: Kontrol edilecek domain
+            
+        Returns:
+            Tuple[List[str], Optional[str], bool]: (bulunan URL'ler, hata mesajı, yeniden denenmeli mi)
+        """
+        hits: List[str] = []
+        last_error = None
+        schemes = list(PROBE_SCHEMES)
+        seen_outcomes = set()
+        
+        for path in self.paths:
+            outcomes: Dict[str, str] = {}
+            
+            async def probe(probe_domain: str, url: str) -> ProbeOutcome:
+                result = await self.probe_url(probe_domain, url)
+                outcomes[url] = result[0]
+                return result
+            
+            urls_to_test = [f"{scheme}://{domain}/{path}" for scheme in schemes]
+            exists, url, error = await self.probe_strategy.probe(domain, urls_to_test, probe)
+            seen_outcomes.update(outcomes.values())
+            if exists:
+                hits.append(url)
+                if self.stop_on_first:
+                    break
+                continue
+            
+            last_error = error
+            schemes = [
+                scheme for scheme, url in zip(schemes, urls_to_test)
+                if outcomes.get(url) not in DEAD_OUTCOMES
+            ]
+            if not schemes:
+                logger.debug("⏩ Kalan yollar atlandı: %s", domain)
+                break
+        
+        if hits:
+            return hits, None, False
+        # Sunucu kesin bir yanıt (ör. 404) verdiyse geçici hatalar sonucu değiştirmez
+        retryable = ABSENT not in seen_outcomes and any(outcome in RETRYABLE_OUTCOMES for outcome in seen_outcomes)
+        return hits, last_error, retryable
+    
+    async def probe_url(self, domain: str, url: str) -> ProbeOutcome:
+        """
+        Tek bir URL'i seçili doğrulama yöntemiyle dener ve sonucu sınıflandırır
+        
+        Args:
+            domain: Kontrol edilen domain
+            url: Denenecek URL
+            
+        Returns:
+            ProbeOutcome: (sonuç türü, URL, açıklama)
+        """
+        try:
+            if self.validation == "headers":
+                outcome = await self.probe_headers(domain, url)
+                if outcome is not None:
+                    return outcome
+                # Sunucu HEAD desteklemiyor: kısmi GET ile imzaya bak
+                logger.debug("HEAD desteklenmiyor, imza kontrolüne geçiliyor: %s", url)
+            return await self.probe_signature(domain, url)
+                    
+        except asyncio.TimeoutError:
+            logger.debug("⏱️ Zaman aşımı: %s", domain)
+            return TIMEOUT, url, "Zaman aşımı"
+        except Exception as e:
+            logger.debug("❌ Hata: %s - %s", domain, e)
+            return classify_exception(e), url, str(e)
+    
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Önceki taramada kaydedilen doğrulayıcılardan If-None-Match / If-Modified-Since başlıkları"""
+        if self.validator_store is None:
+            return {}
+        return self.validator_store.conditional_headers(url)
+    
+    def not_modified(self, domain: str, url: str) -> ProbeOutcome:
+        """304: dosya önceki taramadan beri değişmedi, hâlâ mevcut"""
+        self.validator_store.mark_not_modified(url)
+        logger.info("✅ Archive.zip değişmedi: %s - %s (HTTP 304)", domain, url)
+        return FOUND, url, None
+    
+    async def probe_headers(self, domain: str, url: str) -> Optional[ProbeOutcome]:
+        """
+        HEAD isteğinin MIME type ve boyut başlıklarına göre karar verir
+        
+        Args:
+            domain: Kontrol edilen domain
+            url: Denenecek URL
+            
+        Returns:
+            Optional[ProbeOutcome]: Sonuç veya sunucu HEAD desteklemiyorsa None
+        """
+        async with self.scheduler.slot(domain) as slot:
+            async with self.session.head(url, headers=self.conditional_headers(url), allow_redirects=True,
+                                         timeout=self.timeouts.for_url(url)) as response:
+                slot.check_status(response.status)
+                if response.status == 304:
+                    return self.not_modified(domain, url)
+                if response.status in HEAD_UNSUPPORTED_STATUSES:
+                    return None
+                if response.status != 200:
+                    logger.debug("❌ Archive.zip yok: %s - HTTP %s", domain, response.status)
+                    return classify_status(response.status), url, f"HTTP {response.status}"
+                
+                # MIME type kontrolü yap
+                content_type = response.headers.get('content-type', '').lower()
+                
+                # Archive.zip için geçerli MIME type'lar
+                valid_mime_types = [
+                    'application/zip',
+                    'application/x-zip-compressed',
+                    'application/octet-stream',
+                    'binary/octet-stream',
+                    'application/force-download'
+                ]
+                
+                # Content-Length kontrolü (çok küçük dosyalar şüpheli)
+                content_length = response.headers.get('content-length')
+                if content_length:
+                    size = int(content_length)
+                    if size < 1024:  # 1KB'dan küçük dosyalar şüpheli
+                        logger.debug("❌ Çok küçük dosya: %s - %s bytes", domain, size)
+                        return ABSENT, url, f"Çok küçük dosya: {size} bytes"
+                
+                # MIME type kontrolü
+                is_valid_mime = any(mime in content_type for mime in valid_mime_types)
+                
+                if is_valid_mime or 'zip' in content_type or 'archive' in content_type:
+                    logger.info("✅ Archive.zip bulundu: %s - %s (MIME: %s)", domain, url, content_type)
+                    if self.validator_store is not None:
+                        self.validator_store.store_response(url, response.headers)
+                    return FOUND, url, None
+                
+                logger.debug("❌ Geçersiz MIME type: %s - %s", domain, content_type)
+                return ABSENT, url, f"Geçersiz MIME type: {content_type}"
+    
+    async def probe_signature(self, domain: str, url: str) -> ProbeOutcome:
+        """
+        İlk 4 byte'ı Range ile isteyip dosya imzasını (ZIP için PK\\x03\\x04) kontrol eder
+        
+        Sunucu Range desteklemiyorsa (200) yalnızca ilk byte'lar okunur ve bağlantı
+        gövdenin kalanı indirilmeden kapatılır.
+        
+        Args:
+            domain: Kontrol edilen domain
+            url: Denenecek URL
+            
+        Returns:
+            ProbeOutcome: (sonuç türü, URL, açıklama)
         """
-        urls_to_test = [
-            f"https://{domain}/Archive.zip",
-            f"http://{domain}/Archive.zip"
-        ]
+        headers = {**SIGNATURE_RANGE_HEADERS, **self.conditional_headers(url)}
+        async with self.scheduler.slot(domain) as slot:
+            async with self.session.get(url, headers=headers, allow_redirects=True,
+                                        timeout=self.timeouts.for_url(url)) as response:
+                slot.check_status(response.status)
+                if response.status == 304:
+                    return self.not_modified(domain, url)
+                if response.status == 416:
+                    logger.debug("❌ Boş dosya: %s - HTTP 416", domain)
+                    return ABSENT, url, "Boş dosya (HTTP 416)"
+                if response.status not in (200, 206):
+                    logger.debug("❌ Archive.zip yok: %s - HTTP %s", domain, response.status)
+                    return classify_status(response.status), url, f"HTTP {response.status}"
+                
+                prefix = await read_prefix(response.content)
+                if response.status == 200:
+                    # Range yok sayıldı: dosyanın tamamını indirmemek için bağlantıyı kapat
+                    response.close()
+                
+                if matches_signature(url, prefix):
+                    logger.info("✅ Arşiv bulundu: %s - %s (dosya imzası)", domain, url)
+                    if self.validator_store is not None:
+                        self.validator_store.store_response(url, response.headers)
+                    return FOUND, url, None
+                
+                logger.debug("❌ Arşiv imzası yok: %s - %r", domain, prefix)
+                return ABSENT, url, "Arşiv imzası yok"
+    
+    async def iter_results(
+        self,
+        domain_source: Union[AsyncIterable[str], Iterable[str]],
+        queue_size: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, List[str], Optional[str]]]:
+        """
+        Domain kaynağını sınırlı bir kuyruk üzerinden sabit sayıda worker'a dağıtır
+        ve sonuçları tamamlandıkça akış halinde döndürür.
+        
+        Kuyruklar sınırlı olduğu için bellek kullanımı girdi boyutundan bağımsızdır;
+        tüketici yavaşlarsa worker'lar ve kaynak okuma da bekler. DNS çözümleyicisi
+        verilmişse domain'ler önce ayrı bir DNS aşamasından geçer ve çözümlenemeyenler
+        HTTP worker'larına hiç gönderilmez. Gruplama açıksa domain'ler worker'lara dosya
+        sırasıyla değil, grup başına eşzamanlılık sınırıyla gruplar arasında sırayla dağıtılır.
+        Geçici hatayla biten domain'ler sonuç olarak verilmeden ertelenir; worker'lar ana iş
+        bitince (veya ertelenenler çok birikince) bunları artan beklemeyle yeniden dener.
+        
+        Args:
+            domain_source: Domain'leri üreten (async) iterable
+            queue_size: Kuyruk kapasitesi (varsayılan: max_workers * 2)
+            
+        Yields:
+            Tuple[str, List[str], Optional[str]]: (domain, bulunan URL'ler, hata mesajı)
+        """
+        queue_size = queue_size or self.max_workers * 2
+        domain_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        result_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        
+        retries = RetryQueue(max_retries=self.max_retries, base_delay=self.retry_delay)
         
-        for url in urls_to_test:
+        grouped = None
+        if self.group_by is not None:
+            grouped = PolitenessQueue(self.group_limit, max(queue_size, self.group_buffer))
+        
+        async def enqueue(domain: str):
+            if grouped is not None:
+                await grouped.put(group_key(domain, self.group_by, self.dns_resolver), domain)
+            else:
+                await domain_queue.put(domain)
+        
+        async def producer():
             try:
-                async with self.throttler:
-                    async with self.session.head(url, allow_redirects=True) as response:
-                        if response.status == 200:
-                            # MIME type kontrolü yap
-                            content_type = response.headers.get('content-type', '').lower()
-                            
-                            # Archive.zip için geçerli MIME type'lar
-                            valid_mime_types = [
-                                'application/zip',
-                                'application/x-zip-compressed',
-                                'application/octet-stream',
-                                'binary/octet-stream',
-                                'application/force-download'
-                            ]
-                            
-                            # Content-Length kontrolü (çok küçük dosyalar şüpheli)
-                            content_length = response.headers.get('content-length')
-                            if content_length:
-                                size = int(content_length)
-                                if size < 1024:  # 1KB'dan küçük dosyalar şüpheli
-                                    logger.debug(f"❌ Çok küçük dosya: {domain} - {size} bytes")
-                                    continue
-                            
-                            # MIME type kontrolü
-                            is_valid_mime = any(mime in content_type for mime in valid_mime_types)
-                            
-                            if is_valid_mime or 'zip' in content_type or 'archive' in content_type:
-                                logger.info(f"✅ Archive.zip bulundu: {domain} - {url} (MIME: {content_type})")
-                                return True, url, None
-                            else:
-                                logger.debug(f"❌ Geçersiz MIME type: {domain} - {content_type}")
-                                
+                if self.dns_resolver is not None:
+                    async for domain, resolvable in self.dns_resolver.iter_resolved(domain_source):
+                        if resolvable:
+                            await enqueue(domain)
                         else:
-                            logger.debug(f"❌ Archive.zip yok: {domain} - HTTP {response.status}")
-                            
-            except asyncio.TimeoutError:
-                logger.debug(f"⏱️ Zaman aşımı: {domain}")
+                            self.dns_failed_count += 1
+                            await result_queue.put((domain, [], f"DNS çözümlenemedi: {domain}"))
+                elif hasattr(domain_source, '__aiter__'):
+                    async for domain in domain_source:
+                        await enqueue(domain)
+                else:
+                    for domain in domain_source:
+                        await enqueue(domain)
             except Exception as e:
-                logger.debug(f"❌ Hata: {domain} - {str(e)}")
+                logger.error(f"Domain kaynağı okuma hatası: {e}")
+            
+            if grouped is not None:
+                # Kuyruk boşalınca worker'lar None alır
+                await grouped.close()
+                return
+            
+            # Her worker için bir bitiş işareti
+            for _ in range(self.max_workers):
+                await domain_queue.put(None)
+        
+        async def check(domain: str, attempt: int):
+            hits, error, retryable = await self.check_domain(domain)
+            if retryable and retries.push(domain, attempt + 1):
+                logger.debug("🔁 Yeniden denenecek: %s - %s", domain, error)
+                return
+            if hits and attempt:
+                retries.stats["recovered"] += 1
+            await result_queue.put((domain, hits, error))
         
-        return False, "", f"Archive.zip bulunamadı: {domain}"
+        async def worker():
+            # Ana aşama: domain kuyruğu (ertelenenler yalnızca çok birikirse araya alınır)
+            retries.begin()
+            try:
+                while True:
+                    entry = retries.pop_ready() if retries.full else None
+                    if entry is not None:
+                        try:
+                            await check(*entry)
+                        finally:
+                            retries.task_done()
+                        continue
+                    
+                    key = None
+                    if grouped is not None:
+                        entry = await grouped.get()
+                        key, domain = entry if entry is not None else (None, None)
+                    else:
+                        domain = await domain_queue.get()
+                    if domain is None:
+                        break
+                    try:
+                        await check(domain, 0)
+                    finally:
+                        if key is not None:
+                            await grouped.task_done(key)
+            finally:
+                retries.task_done()
+            
+            # Ertelenen domain'ler: bekleme süresi dolanlar, başka iş eklenemeyecek hale gelene kadar
+            while True:
+                entry = await retries.get()
+                if entry is None:
+                    break
+                try:
+                    await check(*entry)
+                finally:
+                    retries.task_done()
+            await result_queue.put(None)
+        
+        tasks = [asyncio.create_task(producer())]
+        tasks.extend(asyncio.create_task(worker()) for _ in range(self.max_workers))
+        
+        try:
+            finished_workers = 0
+            while finished_workers < self.max_workers:
+                result = await result_queue.get()
+                if result is None:
+                    finished_workers += 1
+                    continue
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            retries.log_stats("kontrol")
     
-    async def check_all_domains(self, domains: List[str]) -> List[Tuple[str, str]]:
+    async def check_all_domains(
+        self,
+        domains: Union[AsyncIterable[str], Iterable[str]],
+        journal: Optional[ProgressJournal] = None,
+        on_hit: Optional[Callable[[str, str], Awaitable[None]]] = None,
+        show_progress: bool = True,
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> List[Tuple[str, str]]:
         """
         Tüm domain'lerde Archive.zip varlığını kontrol eder
         
         Args:
-            domains: Kontrol edilecek domain listesi
+            domains: Kontrol edilecek domain listesi veya akışı
+            journal: Verilirse tamamlanan domain'ler kaydedilir, önceden tamamlananlar atlanır
+            on_hit: Her bulunan (domain, url) için çağrılır (ör. indirme aşamasına aktarmak için)
+            show_progress: İlerleme çubuğu gösterilsin mi
+            on_progress: Her sonuçtan sonra (kontrol edilen, bulunan) ile çağrılır
             
         Returns:
-            List[Tuple[str, str]]: [(domain, url)] - Archive.zip bulunan domain'ler
+            List[Tuple[str, str]]: [(domain, url)] - bulunan dosyalar (bir domain'de birden fazla olabilir)
         """
-        logger.info(f"Toplam {len(domains)} domain kontrol edilecek")
-        
-        # Semaphore ile eşzamanlı işlem sayısını sınırla
-        semaphore = asyncio.Semaphore(self.max_workers)
+        if journal is not None:
+            domains = journal.skip_finished(domains)
+            # Bulunanlar sonuç dosyasına yazıldıktan sonra journal'a işlenir
+            self.result_writer.on_flush = lambda batch: [
+                journal.record(domain, True, url) for domain, url in batch
+            ]
         
-        async def check_with_semaphore(domain):
-            async with semaphore:
-                return await self.check_archive_exists(domain)
-        
-        # Tüm domain'leri kontrol et
-        tasks = [check_with_semaphore(domain) for domain in domains]
+        total = len(domains) if hasattr(domains, '__len__') else None
+        if total is not None:
+            logger.info(f"Toplam {total} domain kontrol edilecek")
         
         # Progress bar ile ilerlemeyi göster
         found_archives = []
         not_found_count = 0
+        self.checked_count = 0
+        self.found_count = 0
         
-        with tqdm(total=len(domains), desc="Kontrol ediliyor", unit="domain") as pbar:
-            for task in asyncio.as_completed(tasks):
-                exists, url, error = await task
+        # Çubuk her sonuçta değil, sabit aralıklarla yenilenir
+        pbar = tqdm(total=total, desc="Kontrol ediliyor", unit="domain", disable=not show_progress)
+        postfix = lambda: {"Bulunan": self.found_count, "Bulunamayan": not_found_count, **self.progress_extra}
+        with ThrottledProgress(pbar, postfix=postfix) as progress:
+            async for domain, hits, error in self.iter_results(domains):
+                self.checked_count += 1
                 
-                if exists:
-                    domain = url.split('/')[2]
-                    found_archives.append((domain, url))
-                    # Anlık olarak dosyaya ekle
-                    await self.append_result(domain, url)
-                    pbar.set_postfix({"Bulunan": len(found_archives), "Bulunamayan": not_found_count})
+                if hits:
+                    self.found_count += 1
+                    for url in hits:
+                        found_archives.append((domain, url))
+                        # Yazıcı kuyruğuna ekle (toplu halde dosyaya yazılır)
+                        await self.append_result(domain, url)
+                        if on_hit is not None:
+                            await on_hit(domain, url)
                 else:
                     not_found_count += 1
-                    pbar.set_postfix({"Bulunan": len(found_archives), "Bulunamayan": not_found_count})
+                    if journal is not None:
+                        journal.record(domain, False, "")
                 
-                pbar.update(1)
+                progress.update()
+                if on_progress is not None:
+                    on_progress(self.checked_count, self.found_count)
+        
+        # Kuyrukta kalan sonuçları dosyaya yaz
+        await self.result_writer.flush()
+        self.result_writer.on_flush = None
         
-        logger.info(f"Kontrol tamamlandı: {len(found_archives)}/{len(domains)} domain'de Archive.zip bulundu")
+        logger.info(f"Kontrol tamamlandı: {self.found_count}/{self.checked_count} domain'de arşiv bulundu ({len(found_archives)} dosya)")
         return found_archives
     
     async def save_results(self, results: List[Tuple[str, str]], output_file: str = "available_archives.txt"):
@@ -159,35 +569,18 @@ class ArchiveChecker:
         except Exception as e:
             logger.error(f"Sonuç kaydetme hatası: {e}")
     
-    async def append_result(self, domain: str, url: str, output_file: str = "available_archives.txt"):
+    async def append_result(self, domain: str, url: str):
         """
-        Tek bir sonucu dosyaya ekler (anlık yazma için)
+        Tek bir sonucu yazıcı kuyruğuna ekler (dosyaya toplu halde yazılır)
         
         Args:
             domain: Domain adı
             url: Archive.zip URL'i
-            output_file: Çıktı dosyası adı
         """
-        output_path = Path("data/results") / output_file
-        output_path.parent.mkdir(exist_ok=True)
-        
-        try:
-            # Dosya yoksa header'ı oluştur
-            if not output_path.exists():
-                async with aiofiles.open(output_path, 'w', encoding='utf-8') as f:
-                    await f.write("# Archive.zip Bulunan Domain'ler\n")
-                    await f.write("# Format: domain - url\n\n")
-            
-            # Sonucu dosyaya ekle
-            async with aiofiles.open(output_path, 'a', encoding='utf-8') as f:
-                await f.write(f"{domain} - {url}\n")
-            
-            logger.debug(f"Sonuç eklendi: {domain} - {url}")
-            
-        except Exception as e:
-            logger.error(f"Sonuç ekleme hatası: {e}")
+        await self.result_writer.write(domain, url)
     
-    def get_stats(self, total_domains: int, found_count: int) -> dict:
+    @staticmethod
+    def get_stats(total_domains: int, found_count: int) -> dict:
         """
         İstatistikleri döndürür
         
@@ -0,0 +1,121 @@
+import hashlib
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from .download_index import DownloadIndex
+
+logger = logging.getLogger(__name__)
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+def hash_file(path: Path, hasher=None, start: int = 0):
+    """
+    Dosyanın start konumundan sonrasını hash'e ekler
+    
+    Args:
+        path: Dosya yolu
+        hasher: Devam edilecek hashlib nesnesi (varsayılan: yeni sha256)
+        start: Okumaya başlanacak konum
+    
+    Returns:
+        hashlib nesnesi
+    """
+    hasher = hasher if hasher is not None else hashlib.sha256()
+    with open(path, "rb") as f:
+        f.seek(start)
+        while True:
+            block = f.read(HASH_BLOCK_SIZE)
+            if not block:
+                break
+            hasher.update(block)
+    return hasher
+
+class BlobStore:
+    """
+    İndirilen dosyaları SHA-256'ya göre tek kopya saklayan içerik adresli depo
+    
+    Dosyalar blobs/<ilk 2 karakter>/<sha256> altında tutulur; domain klasöründeki dosya bu bloba
+    sabit bağlantıdır (hardlink). Aynı içeriği sunan domain'ler diskte tek kopya kaplar.
+    Hangi domain'in hangi hash'e bağlı olduğu DownloadIndex'te (manifest) tutulur.
+    """
+    
+    def __init__(self, blobs_dir: Path, index: DownloadIndex):
+        """
+        Args:
+            blobs_dir: Blobların saklandığı klasör
+            index: domain -> hash kayıtlarının tutulduğu dizin
+        """
+        self.blobs_dir = Path(blobs_dir)
+        self.index = index
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        self.stats = {"stored": 0, "deduplicated": 0, "saved_bytes": 0}
+    
+    def blob_path(self, sha256: str) -> Path:
+        """Hash'e ait blobun yolu"""
+        return self.blobs_dir / sha256[:2] / sha256
+    
+    def find_by_etag(self, etag: Optional[str], size: Optional[int]) -> Optional[str]:
+        """
+        Aynı ETag ve boyutla daha önce saklanmış blobun hash'ini döndürür
+        
+        Args:
+            etag: Yanıtın güçlü ETag'i
+            size: Yanıtın Content-Length değeri
+        
+        Returns:
+            Optional[str]: Blob hâlâ depodaysa hash'i, yoksa None
+        """
+        if not etag or etag.startswith("W/") or size is None:
+            return None
+        # Aynı ETag ve boyutla daha önce indirilmiş dosya (dizinde indeksli sorgu)
+        sha256 = self.index.find_by_etag(etag, size)
+        if sha256 is not None and self.blob_path(sha256).exists():
+            return sha256
+        return None
+    
+    def add(self, source: Optional[Path], sha256: str, target: Path) -> bool:
+        """
+        Dosyayı depoya alır ve hedef yola blobun sabit bağlantısını koyar
+        
+        Aynı hash'li blob zaten varsa kaynak silinir (tek kopya kalır).
+        
+        Args:
+            source: Doğrulanmış dosya (None ise blob zaten depodadır)
+            sha256: Dosyanın SHA-256 hash'i
+            target: Domain klasöründeki dosya yolu
+        
+        Returns:
+            bool: İçerik depoda zaten varsa True
+        """
+        blob = self.blob_path(sha256)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        
+        duplicate = blob.exists()
+        if duplicate:
+            if source is not None:
+                self.stats["saved_bytes"] += source.stat().st_size
+                source.unlink()
+            self.stats["deduplicated"] += 1
+        else:
+            os.replace(source, blob)
+            # Blob salt okunur yapılır; bağlantılar üzerinden yanlışlıkla değiştirilmesin
+            os.chmod(blob, 0o444)
+            self.stats["stored"] += 1
+        
+        # Hedefin yerine atomik olarak geçen geçici bağlantı
+        temp = target.with_name(target.name + ".link")
+        try:
+            temp.unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(blob, temp)
+        except OSError as e:
+            # Farklı dosya sistemi veya hardlink desteği yok: kopya ile devam edilir
+            logger.debug("Hardlink oluşturulamadı, kopyalanıyor: %s - %s", target, e)
+            shutil.copyfile(blob, temp)
+        os.replace(temp, target)
+        return duplicate
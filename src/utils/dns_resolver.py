@@ -0,0 +1,379 @@
+import asyncio
+import socket
+import sqlite3
+import time
+import ipaddress
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import ThreadedResolver
+
+try:
+    import aiodns
+    import pycares.errno as ares_errno
+except ImportError:  # aiodns opsiyonel: yoksa sistem çözümleyicisi kullanılır
+    aiodns = None
+    ares_errno = None
+
+logger = logging.getLogger(__name__)
+
+# Çözümleme sonuç türleri
+RESOLVED = "resolved"    # En az bir IP adresi bulundu
+NXDOMAIN = "nxdomain"    # Domain yok veya adres kaydı yok (kesin)
+SERVFAIL = "servfail"    # DNS sunucusu hata verdi
+UNKNOWN = "unknown"      # Geçici hata / zaman aşımı: karar HTTP aşamasına bırakılır
+
+class DNSResolver:
+    """HTTP denemelerinden önce domain'leri çözümleyen, sonuçları diskte TTL ile saklayan sınıf"""
+    
+    def __init__(self, concurrency: int = 200, cache_path: Optional[Union[str, Path]] = None,
+                 timeout: float = 5.0, positive_ttl: int = 3600, negative_ttl: int = 86400,
+                 servfail_ttl: int = 3600, min_ttl: int = 300, memory_cache_size: int = 100000):
+        """
+        Args:
+            concurrency: Eşzamanlı DNS sorgusu sayısı
+            cache_path: SQLite önbellek dosyası (None ise yalnızca bellekte tutulur)
+            timeout: Tek sorgu için zaman aşımı (saniye)
+            positive_ttl: TTL bilinmiyorsa başarılı çözümlemelerin saklanma süresi
+            negative_ttl: NXDOMAIN sonuçlarının saklanma süresi
+            servfail_ttl: SERVFAIL sonuçlarının saklanma süresi
+            min_ttl: Kayıt TTL'i bundan küçükse bu değer kullanılır
+            memory_cache_size: Bellekte tutulan son sonuç sayısı
+        """
+        self.concurrency = concurrency
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.timeout = timeout
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.servfail_ttl = servfail_ttl
+        self.min_ttl = min_ttl
+        self.memory_cache_size = memory_cache_size
+        
+        self.stats = {"cache_hits": 0, "resolved": 0, "nxdomain": 0, "servfail": 0, "unknown": 0}
+        
+        self._memory: "OrderedDict[str, Tuple[str, List[str], float]]" = OrderedDict()
+        self._pending_writes: List[Tuple[str, str, str, float]] = []
+        self._db: Optional[sqlite3.Connection] = None
+        self._aiodns = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    async def __aenter__(self):
+        self.open()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def open(self):
+        """Önbelleği açar ve çözümleyiciyi hazırlar"""
+        if self._semaphore is not None:
+            return
+        
+        if self.cache_path:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Birden fazla süreç (--processes) aynı önbelleği paylaşabilir
+            self._db = sqlite3.connect(str(self.cache_path), timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS dns_cache ("
+                "host TEXT PRIMARY KEY, status TEXT NOT NULL, ips TEXT NOT NULL, expires REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            # Süresi dolmuş kayıtları temizle
+            self._db.execute("DELETE FROM dns_cache WHERE expires < ?", (time.time(),))
+            self._db.commit()
+        
+        if aiodns is not None:
+            self._aiodns = aiodns.DNSResolver(timeout=self.timeout)
+        else:
+            logger.info("aiodns kurulu değil: DNS sorguları thread'lerde getaddrinfo ile yapılacak "
+                        "(kayıt TTL'leri yerine varsayılan süreler kullanılır; pip install aiodns)")
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+    
+    def close(self):
+        """Bekleyen önbellek kayıtlarını yazar ve kapatır"""
+        if self._db is not None:
+            self._flush_cache()
+            self._db.close()
+            self._db = None
+        self._semaphore = None
+        logger.info(f"DNS istatistikleri: {self.stats}")
+    
+    @staticmethod
+    def host_from_domain(domain: str) -> str:
+        """Domain'den port ve köşeli parantezleri ayıklayıp host adını döndürür"""
+        host = domain.strip().lower()
+        if host.startswith("["):
+            return host[1:host.find("]")] if "]" in host else host.strip("[")
+        if host.count(":") == 1:
+            host = host.split(":", 1)[0]
+        return host.rstrip(".")
+    
+    def get_cached(self, host: str) -> Optional[Tuple[str, List[str]]]:
+        """
+        Önbellekteki geçerli sonucu döndürür
+        
+        Args:
+            host: Host adı
+        
+        Returns:
+            Optional[Tuple[str, List[str]]]: (sonuç türü, IP listesi) veya None
+        """
+        now = time.time()
+        entry = self._memory.get(host)
+        if entry is not None:
+            if entry[2] > now:
+                self._memory.move_to_end(host)
+                return entry[0], entry[1]
+            del self._memory[host]
+        
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT status, ips, expires FROM dns_cache WHERE host = ?", (host,)
+            ).fetchone()
+            if row and row[2] > now:
+                ips = row[1].split(",") if row[1] else []
+                self._remember(host, row[0], ips, row[2])
+                return row[0], ips
+        return None
+    
+    def _remember(self, host: str, status: str, ips: List[str], expires: float):
+        """Sonucu bellekteki LRU önbelleğe ekler"""
+        self._memory[host] = (status, ips, expires)
+        self._memory.move_to_end(host)
+        if len(self._memory) > self.memory_cache_size:
+            self._memory.popitem(last=False)
+    
+    def _store(self, host: str, status: str, ips: List[str], ttl: float):
+        """Sonucu önbelleğe yazar (diske toplu halde)"""
+        expires = time.time() + ttl
+        self._remember(host, status, ips, expires)
+        if self._db is not None:
+            self._pending_writes.append((host, status, ",".join(ips), expires))
+            if len(self._pending_writes) >= 1000:
+                self._flush_cache()
+    
+    def _flush_cache(self):
+        """Bekleyen önbellek kayıtlarını SQLite'a yazar"""
+        if not self._pending_writes or self._db is None:
+            return
+        try:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO dns_cache (host, status, ips, expires) VALUES (?, ?, ?, ?)",
+                self._pending_writes
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"DNS önbelleği yazılamadı: {e}")
+        self._pending_writes = []
+    
+    async def resolve(self, domain: str) -> Tuple[str, List[str]]:
+        """
+        Domain'i çözümler (önce önbelleğe bakar)
+        
+        Args:
+            domain: Domain adı (port içerebilir)
+        
+        Returns:
+            Tuple[str, List[str]]: (sonuç türü, IP listesi)
+        """
+        host = self.host_from_domain(domain)
+        
+        try:
+            ipaddress.ip_address(host)
+            return RESOLVED, [host]
+        except ValueError:
+            pass
+        
+        cached = self.get_cached(host)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+        
+        # Aynı host için devam eden sorgu varsa onu bekle
+        inflight = self._inflight.get(host)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        
+        if self._semaphore is None:
+            self.open()
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[host] = future
+        try:
+            async with self._semaphore:
+                if self._aiodns is not None:
+                    status, ips, ttl = await self._query_aiodns(host)
+                else:
+                    status, ips, ttl = await self._query_system(host)
+            
+            self.stats[status] += 1
+            if status != UNKNOWN:
+                self._store(host, status, ips, ttl)
+            future.set_result((status, ips))
+            return status, ips
+        except BaseException:
+            future.set_result((UNKNOWN, []))
+            raise
+        finally:
+            del self._inflight[host]
+    
+    async def _query_aiodns(self, host: str) -> Tuple[str, List[str], float]:
+        """aiodns (c-ares) ile sorgu yapar; kayıt TTL'lerini kullanır"""
+        try:
+            result = await self._aiodns.getaddrinfo(host, family=socket.AF_UNSPEC, type=socket.SOCK_STREAM)
+        except aiodns.error.DNSError as e:
+            code = e.args[0] if e.args else None
+            if code in (ares_errno.ARES_ENOTFOUND, ares_errno.ARES_ENODATA):
+                return NXDOMAIN, [], self.negative_ttl
+            if code in (ares_errno.ARES_ESERVFAIL, ares_errno.ARES_EREFUSED):
+                return SERVFAIL, [], self.servfail_ttl
+            logger.debug("DNS geçici hata: %s - %s", host, e)
+            return UNKNOWN, [], 0
+        except Exception as e:
+            logger.debug("DNS hatası: %s - %s", host, e)
+            return UNKNOWN, [], 0
+        
+        ips = []
+        ttls = []
+        for node in result.nodes:
+            address = node.addr[0]
+            if isinstance(address, bytes):
+                address = address.decode()
+            if address not in ips:
+                ips.append(address)
+            ttls.append(node.ttl)
+        
+        if not ips:
+            return NXDOMAIN, [], self.negative_ttl
+        return RESOLVED, ips, max(self.min_ttl, min(ttls))
+    
+    async def _query_system(self, host: str) -> Tuple[str, List[str], float]:
+        """Sistem çözümleyicisi (getaddrinfo) ile sorgu yapar; TTL bilinmediği için varsayılanı kullanır"""
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await asyncio.wait_for(
+                loop.getaddrinfo(host, None, type=socket.SOCK_STREAM),
+                timeout=self.timeout
+            )
+        except socket.gaierror as e:
+            if e.errno in (socket.EAI_NONAME, getattr(socket, "EAI_NODATA", socket.EAI_NONAME)):
+                return NXDOMAIN, [], self.negative_ttl
+            if e.errno == socket.EAI_FAIL:
+                return SERVFAIL, [], self.servfail_ttl
+            if e.errno == socket.EAI_AGAIN:
+                # Çözümleyici geçici olarak yanıt veremedi (zaman aşımı, aşırı yük): saklanmaz
+                logger.debug("DNS geçici hata: %s - %s", host, e)
+                return UNKNOWN, [], 0
+            logger.debug("DNS hatası: %s - %s", host, e)
+            return UNKNOWN, [], 0
+        except (asyncio.TimeoutError, OSError) as e:
+            logger.debug("DNS geçici hata: %s - %s", host, e)
+            return UNKNOWN, [], 0
+        
+        ips = list(dict.fromkeys(info[4][0] for info in infos))
+        if not ips:
+            return NXDOMAIN, [], self.negative_ttl
+        return RESOLVED, ips, self.positive_ttl
+    
+    async def iter_resolved(
+        self,
+        domains: Union[AsyncIterable[str], Iterable[str]]
+    ) -> AsyncIterator[Tuple[str, bool]]:
+        """
+        Domain akışını kendi worker havuzuyla çözümler, sonuçları tamamlandıkça döndürür
+        
+        Args:
+            domains: Domain'leri üreten (async) iterable
+        
+        Yields:
+            Tuple[str, bool]: (domain, çözümlenebilir mi)
+        """
+        queue_size = self.concurrency * 2
+        domain_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        result_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        
+        async def producer():
+            try:
+                if hasattr(domains, '__aiter__'):
+                    async for domain in domains:
+                        await domain_queue.put(domain)
+                else:
+                    for domain in domains:
+                        await domain_queue.put(domain)
+            except Exception as e:
+                logger.error(f"Domain kaynağı okuma hatası: {e}")
+            
+            for _ in range(self.concurrency):
+                await domain_queue.put(None)
+        
+        async def worker():
+            while True:
+                domain = await domain_queue.get()
+                if domain is None:
+                    await result_queue.put(None)
+                    return
+                status, _ = await self.resolve(domain)
+                if status in (NXDOMAIN, SERVFAIL):
+                    logger.debug("🚫 DNS çözümlenemedi: %s - %s", domain, status)
+                await result_queue.put((domain, status not in (NXDOMAIN, SERVFAIL)))
+        
+        tasks = [asyncio.create_task(producer())]
+        tasks.extend(asyncio.create_task(worker()) for _ in range(self.concurrency))
+        
+        try:
+            finished_workers = 0
+            while finished_workers < self.concurrency:
+                result = await result_queue.get()
+                if result is None:
+                    finished_workers += 1
+                    continue
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+class CachedResolver(AbstractResolver):
+    """aiohttp için DNSResolver önbelleğini kullanan çözümleyici (HTTP aşamasında tekrar sorgu yapılmaz)"""
+    
+    def __init__(self, dns_resolver: DNSResolver):
+        self.dns_resolver = dns_resolver
+        self._fallback: Optional[ThreadedResolver] = None
+    
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET):
+        status, ips = await self.dns_resolver.resolve(host)
+        if status == UNKNOWN:
+            # Geçici hata: sistem çözümleyicisi ile tekrar dene
+            if self._fallback is None:
+                self._fallback = ThreadedResolver()
+            return await self._fallback.resolve(host, port, family)
+        if status != RESOLVED or not ips:
+            raise socket.gaierror(socket.EAI_NONAME, f"DNS çözümlenemedi: {host} ({status})")
+        
+        results = []
+        for ip in ips:
+            ip_family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+            if family not in (socket.AF_UNSPEC, ip_family):
+                continue
+            results.append({
+                "hostname": host,
+                "host": ip,
+                "port": port,
+                "family": ip_family,
+                "proto": 0,
+                "flags": socket.AI_NUMERICHOST,
+            })
+        
+        if not results:
+            raise socket.gaierror(socket.EAI_NONAME, f"Uygun adres ailesi bulunamadı: {host}")
+        return results
+    
+    async def close(self):
+        if self._fallback is not None:
+            await self._fallback.close()
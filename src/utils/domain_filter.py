@@ -0,0 +1,204 @@
+import bisect
+import hashlib
+import heapq
+import ipaddress
+import logging
+import re
+from array import array
+from typing import List, Optional
+
+try:
+    import idna
+except ImportError:  # idna opsiyonel (yarl ile gelir): yoksa Python'un IDNA 2003 codec'i kullanılır
+    idna = None
+
+logger = logging.getLogger(__name__)
+
+# Zaten normal biçimde olan host adları (küçük harf, ASCII, geçerli etiketler): hızlı yol
+LABEL = r"(?!-)[a-z0-9_-]{1,63}(?<!-)"
+HOSTNAME_PATTERN = re.compile(rf"(?:{LABEL}\.)*{LABEL}")
+URL_PARTS_PATTERN = re.compile(r"[/?#]")
+
+# Deneme URL'leri şemayla kurulduğu için bu portlar host adına eklenmez
+DEFAULT_PORTS = ("80", "443")
+
+def to_ascii(name: str) -> Optional[str]:
+    """
+    Unicode host adını IDNA (punycode) biçimine çevirir
+    
+    Args:
+        name: Host adı (ör. "bücher.de")
+    
+    Returns:
+        Optional[str]: ASCII host adı (ör. "xn--bcher-kva.de"), çevrilemezse None
+    """
+    try:
+        if idna is not None:
+            return idna.encode(name, uts46=True).decode("ascii")
+        return name.encode("idna").decode("ascii")
+    except (UnicodeError, ValueError):
+        return None
+
+def normalize_domain(value: str, strip_www: bool = True) -> Optional[str]:
+    """
+    Domain listesindeki bir satırı karşılaştırılabilir host adına çevirir
+    
+    Şema, kullanıcı bilgisi, yol/sorgu, varsayılan port (80/443), sondaki nokta ve "www."
+    kaldırılır; harfler küçültülür, Unicode adlar punycode'a çevrilir. Varsayılan dışındaki
+    portlar farklı bir servisi gösterdiği için korunur.
+    
+    Args:
+        value: Ham satır (ör. "https://WWW.Example.com:443/path")
+        strip_www: Baştaki "www." kaldırılsın mı
+    
+    Returns:
+        Optional[str]: Normal biçim (ör. "example.com"), geçersizse None
+    """
+    host = value.strip()
+    if HOSTNAME_PATTERN.fullmatch(host) and not (strip_www and host.startswith("www.")):
+        return host
+    
+    if "://" in host:
+        host = host.split("://", 1)[1]
+    match = URL_PARTS_PATTERN.search(host)
+    if match:
+        host = host[:match.start()]
+    host = host.rpartition("@")[2]
+    if not host:
+        return None
+    
+    if host.startswith("["):
+        # IPv6 adresi: [adres]:port
+        end = host.find("]")
+        if end < 0:
+            return None
+        try:
+            name = f"[{ipaddress.IPv6Address(host[1:end]).compressed}]"
+        except ValueError:
+            return None
+        rest = host[end + 1:]
+        port = rest[1:] if rest.startswith(":") else ""
+    else:
+        name, _, port = host.partition(":")
+        name = name.rstrip(".").lower()
+        if not name.isascii():
+            name = to_ascii(name)
+            if name is None:
+                return None
+        if len(name) > 253 or not HOSTNAME_PATTERN.fullmatch(name):
+            return None
+        if strip_www and name.startswith("www.") and name.count(".") >= 2:
+            name = name[4:]
+    
+    if port and not port.isdigit():
+        return None
+    if port and port not in DEFAULT_PORTS:
+        return f"{name}:{port}"
+    return name
+
+class HashSet64:
+    """
+    Çok sayıda öğeyi 64 bit hash olarak tutan, bellekte az yer kaplayan küme
+    
+    Yeni hash'ler küçük bir Python set'inde biriktirilir; set dolunca sıralanıp array('Q')
+    olarak bir "run"a dönüşür, benzer boyuttaki run'lar birleştirilir (en fazla ~log2(n) run).
+    Öğe başına ~8 byte yer kaplar (Python set'inde ~60-100 byte). Sorgu: set + her run'da
+    ikili arama. 64 bit hash'te yüz milyonlarca öğede bile çakışma olasılığı binde birkaç
+    mertebesindedir.
+    """
+    
+    def __init__(self, buffer_size: int = 262144):
+        """
+        Args:
+            buffer_size: Sıralı run'a dönüştürülmeden önce set'te tutulacak hash sayısı
+        """
+        self.buffer_size = buffer_size
+        self._pending = set()
+        self._runs: List[array] = []
+        self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    @staticmethod
+    def hash(item: str) -> int:
+        """Öğe için 64 bit hash (ProgressJournal.domain_hash ile aynı)"""
+        return int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "little")
+    
+    def __contains__(self, item: str) -> bool:
+        return self._contains_hash(self.hash(item))
+    
+    def _contains_hash(self, item_hash: int) -> bool:
+        if item_hash in self._pending:
+            return True
+        for run in self._runs:
+            position = bisect.bisect_left(run, item_hash)
+            if position < len(run) and run[position] == item_hash:
+                return True
+        return False
+    
+    def add(self, item: str) -> bool:
+        """
+        Öğeyi ekler
+        
+        Args:
+            item: Eklenecek öğe
+        
+        Returns:
+            bool: Öğe yeni eklendiyse True, zaten varsa False
+        """
+        item_hash = self.hash(item)
+        if self._contains_hash(item_hash):
+            return False
+        self._pending.add(item_hash)
+        self._count += 1
+        if len(self._pending) >= self.buffer_size:
+            self._flush()
+        return True
+    
+    def _flush(self):
+        """Bekleyen hash'leri sıralı run'a çevirir ve benzer boyuttaki run'ları birleştirir"""
+        run = array("Q", sorted(self._pending))
+        self._pending = set()
+        while self._runs and len(self._runs[-1]) <= len(run) * 2:
+            run = array("Q", heapq.merge(self._runs.pop(), run))
+        self._runs.append(run)
+
+class DomainFilter:
+    """Domain akışını normalleştiren ve tekrarları eleyen filtre"""
+    
+    def __init__(self, strip_www: bool = True):
+        """
+        Args:
+            strip_www: Baştaki "www." kaldırılsın mı (www.example.com ile example.com aynı sayılır)
+        """
+        self.strip_www = strip_www
+        self.seen = HashSet64()
+        self.duplicates = 0
+        self.invalid = 0
+    
+    def accept(self, value: str) -> Optional[str]:
+        """
+        Satırı normalleştirir; ilk kez görülüyorsa döndürür
+        
+        Args:
+            value: Ham satır
+        
+        Returns:
+            Optional[str]: Normal biçim veya geçersiz/tekrar ise None
+        """
+        domain = normalize_domain(value, self.strip_www)
+        if domain is None:
+            self.invalid += 1
+            return None
+        if not self.seen.add(domain):
+            self.duplicates += 1
+            return None
+        return domain
+    
+    def log_stats(self, source: str):
+        """Atlanan satır sayılarını loglar"""
+        if self.duplicates or self.invalid:
+            logger.info(
+                f"{source}: {self.duplicates} tekrar eden ve {self.invalid} geçersiz satır atlandı"
+            )
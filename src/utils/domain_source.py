@@ -0,0 +1,170 @@
+import asyncio
+import bz2
+import glob
+import gzip
+import logging
+import lzma
+import mmap
+import sys
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Callable, Iterator, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+# Standart girdiyi gösteren kaynak adı
+STDIN = "-"
+
+# Bir seferde taranan veri miktarı: satırlar bu boyuttaki bloklar halinde ayrıştırılır
+BATCH_SIZE = 4 * 1024 * 1024
+
+# Uzantıya göre sıkıştırılmış dosya açıcıları
+OPENERS = {
+    ".gz": gzip.open,
+    ".xz": lzma.open,
+    ".bz2": bz2.open,
+}
+
+Source = Union[str, Path]
+
+def resolve_sources(specs: Union[str, Sequence[str]], base_dir: Path) -> List[Source]:
+    """
+    Kaynak tanımlarını okunacak dosyalara çevirir
+    
+    Göreli yollar ve glob desenleri önce base_dir içinde, bulunamazsa çalışma klasöründe aranır.
+    
+    Args:
+        specs: Dosya adı, glob deseni (ör. "feeds/*.gz") veya "-" (stdin); tek ya da liste
+        base_dir: Domain listelerinin klasörü
+    
+    Returns:
+        List[Source]: Dosya yolları (ve stdin için "-"); bulunamayan kaynaklar loglanıp atlanır
+    """
+    if isinstance(specs, str):
+        specs = [specs]
+    
+    sources: List[Source] = []
+    for spec in specs:
+        if spec == STDIN:
+            sources.append(STDIN)
+            continue
+        path = Path(spec)
+        candidates = [path] if path.is_absolute() else [base_dir / path, path]
+        if glob.has_magic(spec):
+            for candidate in candidates:
+                matches = sorted(Path(match) for match in glob.glob(str(candidate)) if Path(match).is_file())
+                if matches:
+                    sources.extend(matches)
+                    break
+            else:
+                logger.error(f"Desene uyan dosya bulunamadı: {spec}")
+            continue
+        for candidate in candidates:
+            if candidate.is_file():
+                sources.append(candidate)
+                break
+        else:
+            logger.error(f"Dosya bulunamadı: {base_dir / path}")
+    return sources
+
+def _split_lines(data: bytes) -> List[str]:
+    """Veri bloğunu boş ve yorum olmayan satırlara ayırır"""
+    lines = data.decode("utf-8", errors="replace").split("\n")
+    return [line for line in map(str.strip, lines) if line and not line.startswith("#")]
+
+def _scan_stream(stream: BinaryIO, batch_size: int) -> Iterator[List[str]]:
+    """Akışı (stdin, sıkıştırılmış dosya) blok blok okur; bloğu bölen yarım satır sonrakine taşınır"""
+    remainder = b""
+    while True:
+        data = stream.read(batch_size)
+        if not data:
+            break
+        data = remainder + data
+        end = data.rfind(b"\n")
+        if end < 0:
+            remainder = data
+            continue
+        remainder = data[end + 1:]
+        yield _split_lines(data[:end])
+    if remainder:
+        yield _split_lines(remainder)
+
+def _scan_file(path: Path, batch_size: int) -> Iterator[List[str]]:
+    """Düz metin dosyasını mmap ile satır sınırına hizalanmış bloklar halinde tarar"""
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            size = len(mapped)
+            position = 0
+            while position < size:
+                end = mapped.find(b"\n", min(position + batch_size, size - 1))
+                if end < 0:
+                    end = size
+                yield _split_lines(mapped[position:end])
+                position = end + 1
+
+def iter_line_batches(source: Source, batch_size: int = BATCH_SIZE) -> Iterator[List[str]]:
+    """
+    Kaynağın satırlarını bloklar halinde döndürür (senkron; thread içinde çalıştırılır)
+    
+    Args:
+        source: Dosya yolu veya "-" (stdin)
+        batch_size: Bir blokta okunacak byte sayısı
+    
+    Yields:
+        List[str]: Boş ve yorum olmayan, kırpılmış satırlar
+    """
+    if source == STDIN:
+        yield from _scan_stream(sys.stdin.buffer, batch_size)
+        return
+    opener = OPENERS.get(Path(source).suffix.lower())
+    if opener is not None:
+        with opener(source, "rb") as stream:
+            yield from _scan_stream(stream, batch_size)
+    else:
+        yield from _scan_file(Path(source), batch_size)
+
+def _read_batches(sources: List[Source], accept: Optional[Callable[[str], Optional[str]]],
+                  batch_size: int) -> Iterator[List[str]]:
+    """Tüm kaynakları sırayla okur; accept verilmişse satırları süzer/dönüştürür"""
+    for source in sources:
+        try:
+            for lines in iter_line_batches(source, batch_size):
+                if accept is not None:
+                    lines = [domain for domain in map(accept, lines) if domain is not None]
+                if lines:
+                    yield lines
+        except (OSError, EOFError, lzma.LZMAError) as e:
+            logger.error(f"Kaynak okunamadı ({source}): {e}")
+
+async def iter_domain_batches(sources: List[Source], accept: Optional[Callable[[str], Optional[str]]] = None,
+                              batch_size: int = BATCH_SIZE) -> AsyncIterator[List[str]]:
+    """
+    Kaynakları thread'de okuyup satır bloklarını async olarak verir
+    
+    Satır başına değil blok başına bir thread geçişi yapılır; tüketici bir bloğu işlerken
+    sonraki blok arka planda okunur (ve açılır).
+    
+    Args:
+        sources: resolve_sources ile çözülmüş kaynaklar
+        accept: Her satıra thread içinde uygulanır (ör. DomainFilter.accept); None dönen satır atlanır
+        batch_size: Bir blokta okunacak byte sayısı
+    
+    Yields:
+        List[str]: Satır blokları
+    """
+    loop = asyncio.get_running_loop()
+    batches = _read_batches(sources, accept, batch_size)
+    pending = loop.run_in_executor(None, next, batches, None)
+    try:
+        while True:
+            lines = await pending
+            if lines is None:
+                break
+            pending = loop.run_in_executor(None, next, batches, None)
+            yield lines
+    finally:
+        # Tüketici erken bıraktıysa okuma bitmeden generator kapatılamaz
+        if not pending.done():
+            await asyncio.gather(pending, return_exceptions=True)
+        batches.close()
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import shutil
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+GB = 1024 * MB
+
+class ByteRateLimiter:
+    """
+    Tüm indirmelerin paylaştığı byte/saniye sınırı (token bucket)
+    
+    Okunan her parça kadar token harcanır; bucket borca girebilir, böylece burst'ten büyük
+    parçalar da beklemeden kilitlenmez, yalnızca sonraki okumalar gecikir. Okuma yavaşlayınca
+    TCP akış kontrolü sunucuyu da yavaşlatır.
+    """
+    
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Args:
+            rate: Saniyede en fazla byte
+            burst: Bucket kapasitesi (varsayılan: yarım saniyelik oran)
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else rate / 2
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+    
+    async def consume(self, size: int):
+        """
+        size byte'lık veri için token harcar; oran aşıldıysa gereken süre kadar bekler
+        
+        Args:
+            size: Okunan byte sayısı
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= size
+            if self._tokens < 0:
+                # Kilit tutulurken beklenir: sıradaki okumalar da sırayla (FIFO) bekler
+                await asyncio.sleep(-self._tokens / self.rate)
+
+class DownloadBudget:
+    """
+    İndirmelerin dosya başı ve toplam boyutunu, diskte kalması gereken boş alanı denetleyen sınıf
+    
+    - max_file_size: Content-Length bu değeri aşan dosyalar indirilmez
+    - max_total_size: Bu çalışmada indirilecek toplam byte (aşılacaksa yeni dosya başlatılmaz)
+    - min_free_space: Boş alan bu seviyenin altındaysa yeni indirmeler bekletilir
+    """
+    
+    def __init__(self, path: Path, max_file_size: int = 0, max_total_size: int = 0,
+                 min_free_space: int = 0, check_interval: float = 10.0):
+        """
+        Args:
+            path: Boş alanı denetlenecek klasör (indirme klasörü)
+            max_file_size: Dosya başına en fazla byte (0: sınırsız)
+            max_total_size: Toplam en fazla byte (0: sınırsız)
+            min_free_space: Diskte bırakılacak en az boş byte (0: denetlenmez)
+            check_interval: Boş alan beklenirken kontrol aralığı (saniye)
+        """
+        self.path = Path(path)
+        self.max_file_size = max_file_size
+        self.max_total_size = max_total_size
+        self.min_free_space = min_free_space
+        self.check_interval = check_interval
+        
+        # Başlatılan indirmeler için ayrılan (ve bitince düşülmeyen) byte toplamı
+        self.reserved = 0
+        self._paused = False
+    
+    @property
+    def exhausted(self) -> bool:
+        """Toplam sınır dolduysa True"""
+        return self.max_total_size > 0 and self.reserved >= self.max_total_size
+    
+    def free_space(self) -> int:
+        """İndirme klasörünün bulunduğu diskteki boş alan"""
+        return shutil.disk_usage(self.path).free
+    
+    async def wait_for_space(self):
+        """Boş alan eşiğin üstüne çıkana kadar yeni indirmeyi bekletir"""
+        if not self.min_free_space:
+            return
+        while self.free_space() < self.min_free_space:
+            if not self._paused:
+                # Uyarı, bekleyen worker sayısından bağımsız olarak bir kez yazılır
+                logger.warning(
+                    f"Disk alanı eşiğin altında ({self.free_space() / MB:.0f} MB boş, "
+                    f"en az {self.min_free_space / MB:.0f} MB): yeni indirmeler bekletiliyor"
+                )
+                self._paused = True
+            await asyncio.sleep(self.check_interval)
+        if self._paused:
+            self._paused = False
+            logger.info("Disk alanı yeterli, indirmeler devam ediyor")
+    
+    def admit(self, size: Optional[int], remaining: Optional[int] = None) -> Optional[str]:
+        """
+        Boyutu bilinen dosyanın indirilip indirilemeyeceğine karar verir ve yer ayırır
+        
+        Args:
+            size: Dosyanın toplam boyutu (Content-Length; bilinmiyorsa None)
+            remaining: İndirilecek kısım (devam eden indirmede; varsayılan: size)
+        
+        Returns:
+            Optional[str]: İndirilemezse hata mesajı, indirilebilirse None
+        """
+        if size is None:
+            return None
+        remaining = size if remaining is None else remaining
+        if self.max_file_size and size > self.max_file_size:
+            return f"Dosya boyutu sınırı aşıyor ({size / MB:.1f} MB > {self.max_file_size / MB:.1f} MB)"
+        if self.max_total_size and self.reserved + remaining > self.max_total_size:
+            return "Toplam indirme sınırına ulaşıldı"
+        if self.min_free_space and self.free_space() - remaining < self.min_free_space:
+            return f"Yetersiz disk alanı ({self.free_space() / MB:.0f} MB boş)"
+        self.reserved += remaining
+        return None
+    
+    def account(self, written: int, added: int) -> Optional[str]:
+        """
+        Boyutu bilinmeyen dosyada indirilen veriyi sınırlara ekler
+        
+        Args:
+            written: Dosyaya şimdiye kadar yazılan byte
+            added: Son eklenen byte
+        
+        Returns:
+            Optional[str]: Sınır aşıldıysa hata mesajı
+        """
+        self.reserved += added
+        if self.max_file_size and written > self.max_file_size:
+            return f"Dosya boyutu sınırı aştı ({self.max_file_size / MB:.1f} MB)"
+        if self.max_total_size and self.reserved > self.max_total_size:
+            return "Toplam indirme sınırına ulaşıldı"
+        return None
+    
+    def release(self, size: int):
+        """Başarısız indirme için ayrılan yeri geri verir"""
+        self.reserved = max(0, self.reserved - size)
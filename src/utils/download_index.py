@@ -0,0 +1,183 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+class DownloadIndex:
+    """
+    İndirilen arşivlerin SQLite dizini (manifest)
+    
+    Her (domain, URL) için SHA-256, boyut, ETag ve kayıt zamanı tutulur. İstatistikler ve
+    "dosya zaten indirildi mi" kontrolleri indirme klasörü taranmadan bu dizinden yapılır;
+    (ETag, boyut) indeksi tekilleştirmede aynı dosyanın yeniden indirilmesini önler.
+    """
+    
+    def __init__(self, path: Union[str, Path], legacy_manifest: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            path: SQLite dosyası
+            legacy_manifest: Eski sürümlerin JSONL manifest'i; varsa ilk açılışta içe aktarılır
+        """
+        self.path = Path(path)
+        self.legacy_manifest = Path(legacy_manifest) if legacy_manifest is not None else None
+        
+        self._db: Optional[sqlite3.Connection] = None
+        # (domain, url) -> kayıt satırı; diske toplu halde yazılır
+        self._pending_writes: Dict[Tuple[str, str], Tuple[str, str, Optional[str], int, Optional[str], float]] = {}
+        # Henüz yazılmamış kayıtların (ETag, boyut) -> sha256 karşılıkları
+        self._pending_etags: Dict[Tuple[str, int], str] = {}
+    
+    def open(self):
+        """Veritabanını açar (yoksa oluşturur)"""
+        if self._db is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Birden fazla süreç (--processes) aynı dosyayı paylaşabilir
+        self._db = sqlite3.connect(str(self.path), timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS archives ("
+            "domain TEXT NOT NULL, url TEXT NOT NULL, sha256 TEXT, size INTEGER NOT NULL, "
+            "etag TEXT, stored REAL NOT NULL, PRIMARY KEY (domain, url)"
+            ") WITHOUT ROWID"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS archives_etag ON archives (etag, size)")
+        self._db.commit()
+        if self.legacy_manifest is not None and self.legacy_manifest.exists():
+            self._import_legacy_manifest()
+    
+    def close(self):
+        """Bekleyen kayıtları yazar ve kapatır"""
+        if self._db is None:
+            return
+        self._flush()
+        self._db.close()
+        self._db = None
+    
+    def _import_legacy_manifest(self):
+        """JSONL manifest kayıtlarını dizine aktarır; dosya .imported uzantısıyla saklanır"""
+        rows = []
+        try:
+            with open(self.legacy_manifest, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        rows.append((
+                            entry["domain"], entry["url"], entry.get("sha256"), entry["size"],
+                            entry.get("etag"), entry.get("time", 0)
+                        ))
+                    except (ValueError, KeyError, TypeError):
+                        continue
+            self._db.executemany(
+                "INSERT OR REPLACE INTO archives (domain, url, sha256, size, etag, stored) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._db.commit()
+            os.replace(self.legacy_manifest, self.legacy_manifest.with_name(self.legacy_manifest.name + ".imported"))
+            logger.info(f"Eski manifest dizine aktarıldı: {len(rows)} kayıt ({self.legacy_manifest})")
+        except FileNotFoundError:
+            # Başka bir süreç aynı anda aktarıp taşıdı
+            pass
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Manifest içe aktarılamadı: {self.legacy_manifest} - {e}")
+    
+    def get(self, domain: str, url: str) -> Optional[Tuple[Optional[str], int, Optional[str]]]:
+        """
+        İndirilmiş arşivin kaydını döndürür
+        
+        Args:
+            domain: Domain adı
+            url: Dosya URL'i
+        
+        Returns:
+            Optional[Tuple]: (SHA-256, boyut, ETag) veya kayıt yoksa None
+        """
+        if self._db is None:
+            return None
+        pending = self._pending_writes.get((domain, url))
+        if pending is not None:
+            return pending[2], pending[3], pending[4]
+        row = self._db.execute(
+            "SELECT sha256, size, etag FROM archives WHERE domain = ? AND url = ?", (domain, url)
+        ).fetchone()
+        return tuple(row) if row else None
+    
+    def find_by_etag(self, etag: str, size: int) -> Optional[str]:
+        """
+        Aynı ETag ve boyutla kaydedilmiş arşivin hash'ini döndürür
+        
+        Args:
+            etag: Yanıtın ETag'i
+            size: Dosya boyutu
+        
+        Returns:
+            Optional[str]: SHA-256 veya kayıt yoksa None
+        """
+        if self._db is None:
+            return None
+        sha256 = self._pending_etags.get((etag, size))
+        if sha256 is not None:
+            return sha256
+        row = self._db.execute(
+            "SELECT sha256 FROM archives WHERE etag = ? AND size = ? AND sha256 IS NOT NULL "
+            "ORDER BY stored DESC LIMIT 1",
+            (etag, size)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def record(self, domain: str, url: str, sha256: Optional[str], size: int, etag: Optional[str] = None):
+        """
+        İndirilen arşivi kaydeder (diske toplu halde)
+        
+        Args:
+            domain: Domain adı
+            url: İndirilen URL
+            sha256: Dosyanın SHA-256 hash'i (tekilleştirme kapalıysa None)
+            size: Dosya boyutu (byte)
+            etag: Sunucunun bildirdiği ETag
+        """
+        if self._db is None:
+            return
+        self._pending_writes[(domain, url)] = (domain, url, sha256, size, etag, time.time())
+        if etag and sha256:
+            self._pending_etags[(etag, size)] = sha256
+        if len(self._pending_writes) >= 1000:
+            self._flush()
+    
+    def stats(self) -> dict:
+        """
+        Dizindeki kayıtların özetini döndürür
+        
+        Returns:
+            dict: Domain sayısı, arşiv sayısı ve toplam boyut
+        """
+        if self._db is None:
+            return {"total_domains": 0, "total_archives": 0, "total_size": 0}
+        self._flush()
+        domains, archives, size = self._db.execute(
+            "SELECT COUNT(DISTINCT domain), COUNT(*), COALESCE(SUM(size), 0) FROM archives"
+        ).fetchone()
+        return {"total_domains": domains, "total_archives": archives, "total_size": size}
+    
+    def _flush(self):
+        """Bekleyen kayıtları SQLite'a yazar"""
+        if not self._pending_writes or self._db is None:
+            return
+        try:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO archives (domain, url, sha256, size, etag, stored) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                list(self._pending_writes.values())
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"İndirme kayıtları yazılamadı: {e}")
+        self._pending_writes = {}
+        self._pending_etags = {}
@@ -1,11 +1,20 @@
 import os
+import re
+import hashlib
 import aiofiles
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Sequence, Union
+
+from .domain_filter import DomainFilter
+from .domain_source import Source, iter_domain_batches, resolve_sources
+from .download_index import DownloadIndex
 
 logger = logging.getLogger(__name__)
 
+# İndirme klasörlerinin hash öneki (downloads/ab/cd/<domain>/); eski düz yerleşimi ayırt etmek için
+SHARD_DIR_PATTERN = re.compile(r"[0-9a-f]{2}")
+
 class FileManager:
     """Dosya ve klasör yönetimi için sınıf"""
     
@@ -13,6 +22,9 @@ class FileManager:
         self.base_dir = Path(base_dir)
         self.downloads_dir = self.base_dir / "downloads"
         self.domains_dir = self.base_dir / "domains"
+        # İndirilen arşivlerin dizini; istatistikler klasör taranmadan buradan okunur
+        self.index_path = self.downloads_dir / "manifest.sqlite3"
+        self.legacy_manifest_path = self.downloads_dir / "manifest.jsonl"
         self.logs_dir = Path("logs")
         
         # Klasörleri oluştur
@@ -30,41 +42,74 @@ class FileManager:
             directory.mkdir(parents=True, exist_ok=True)
             logger.info(f"Klasör oluşturuldu: {directory}")
     
-    async def read_domain_list(self, filename: str) -> List[str]:
+    def resolve_domain_sources(self, sources: Union[str, Sequence[str]]) -> List[Source]:
         """
-        Domain listesini dosyadan okur
+        Domain kaynaklarını (dosya, glob deseni, "-" ile stdin) okunacak dosyalara çevirir
         
         Args:
-            filename: Domain listesi dosyasının adı
+            sources: Kaynak veya kaynak listesi (göreli yollar önce data/domains/ içinde aranır)
             
         Returns:
-            List[str]: Domain listesi
+            List[Source]: Bulunan kaynaklar
         """
-        file_path = self.domains_dir / filename
-        
-        if not file_path.exists():
-            logger.error(f"Dosya bulunamadı: {file_path}")
-            return []
+        return resolve_sources(sources, self.domains_dir)
+    
+    async def read_domain_list(self, sources: Union[str, Sequence[str]]) -> List[str]:
+        """
+        Domain listesini kaynaklardan okur (normalleştirilmiş, tekrarsız)
         
+        Args:
+            sources: Domain listesi dosyası, glob deseni veya "-" (stdin); tek ya da liste
+            
+        Returns:
+            List[str]: Domain listesi
+        """
         domains = []
         try:
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                async for line in f:
-                    domain = line.strip()
-                    if domain and not domain.startswith('#'):
-                        domains.append(domain)
-            
-            logger.info(f"{len(domains)} domain okundu: {filename}")
+            async for domain in self.iter_domains(sources):
+                domains.append(domain)
             return domains
             
         except Exception as e:
             logger.error(f"Dosya okuma hatası: {e}")
             return []
     
+    async def iter_domains(self, sources: Union[str, Sequence[str]]) -> AsyncIterator[str]:
+        """
+        Domain listesini akış halinde okur (tüm dosyayı belleğe almaz)
+        
+        Düz dosyalar mmap ile, .gz/.xz/.bz2 dosyaları ve stdin akış olarak bloklar halinde
+        thread'de okunur. Satırlar normalleştirilir (şema/yol/www. kaldırılır, küçük harf, IDNA)
+        ve tekrar edenler atlanır; görülen domain'ler hash olarak tutulur (domain başına ~8 byte).
+        
+        Args:
+            sources: Domain listesi dosyası, glob deseni veya "-" (stdin); tek ya da liste
+            
+        Yields:
+            str: Domain adı
+        """
+        resolved = self.resolve_domain_sources(sources)
+        if not resolved:
+            return
+        
+        count = 0
+        domain_filter = DomainFilter()
+        async for batch in iter_domain_batches(resolved, domain_filter.accept):
+            count += len(batch)
+            for domain in batch:
+                yield domain
+        
+        name = sources if isinstance(sources, str) else ", ".join(sources)
+        logger.info(f"{count} domain okundu: {name}")
+        domain_filter.log_stats(name)
+    
     def get_domain_download_path(self, domain: str) -> Path:
         """
         Domain için indirme klasörü yolunu döndürür
         
+        Klasörler adın hash önekine göre iki seviyeye dağıtılır (downloads/ab/cd/<domain>/);
+        milyonlarca domain tek klasörde toplanmaz.
+        
         Args:
             domain: Domain adı
             
@@ -73,10 +118,55 @@ class FileManager:
         """
         # Domain adını güvenli dosya adına çevir
         safe_domain = self._sanitize_filename(domain)
-        domain_dir = self.downloads_dir / safe_domain
-        domain_dir.mkdir(exist_ok=True)
+        domain_dir = self._sharded_path(safe_domain)
+        domain_dir.mkdir(parents=True, exist_ok=True)
         return domain_dir
     
+    def _sharded_path(self, safe_domain: str) -> Path:
+        """Güvenli domain adının hash önekli klasör yolu"""
+        prefix = hashlib.blake2b(safe_domain.encode("utf-8"), digest_size=2).hexdigest()
+        return self.downloads_dir / prefix[:2] / prefix[2:] / safe_domain
+    
+    def migrate_download_layout(self) -> int:
+        """
+        Eski düz yerleşimdeki (downloads/<domain>/) klasörleri hash önekli yerleşime taşır
+        
+        Taşıma yeniden adlandırmadır (dosyalar kopyalanmaz, blob bağlantıları korunur). Hedef
+        klasör zaten varsa yalnızca orada olmayan dosyalar taşınır.
+        
+        Returns:
+            int: Taşınan klasör sayısı
+        """
+        with os.scandir(self.downloads_dir) as entries:
+            legacy = [
+                entry.name for entry in entries
+                if entry.is_dir(follow_symlinks=False) and not SHARD_DIR_PATTERN.fullmatch(entry.name)
+            ]
+        
+        moved = 0
+        for name in legacy:
+            source = self.downloads_dir / name
+            target = self._sharded_path(name)
+            try:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                if not target.exists():
+                    os.replace(source, target)
+                else:
+                    for entry in source.iterdir():
+                        if not (target / entry.name).exists():
+                            os.replace(entry, target / entry.name)
+                    source.rmdir()
+                moved += 1
+            except FileNotFoundError:
+                # Başka bir süreç (--processes) aynı klasörü taşıdı
+                continue
+            except OSError as e:
+                logger.warning(f"Klasör taşınamadı: {source} - {e}")
+        
+        if moved:
+            logger.info(f"{moved} indirme klasörü yeni yerleşime taşındı")
+        return moved
+    
     def _sanitize_filename(self, filename: str) -> str:
         """
         Dosya adını güvenli hale getirir
@@ -124,16 +214,17 @@ class FileManager:
     
     def get_download_stats(self) -> dict:
         """
-        İndirme istatistiklerini döndürür
+        İndirme istatistiklerini dizinden (manifest) döndürür; indirme klasörü taranmaz
         
         Returns:
             dict: İstatistikler
         """
-        total_domains = len(list(self.downloads_dir.glob("*")))
-        successful_downloads = len([d for d in self.downloads_dir.glob("*") if (d / "Archive.zip").exists()])
-        
-        return {
-            "total_domains": total_domains,
-            "successful_downloads": successful_downloads,
-            "success_rate": (successful_downloads / total_domains * 100) if total_domains > 0 else 0
-        } 
\ No newline at end of file
+        index = DownloadIndex(self.index_path, self.legacy_manifest_path)
+        try:
+            index.open()
+            return index.stats()
+        except Exception as e:
+            logger.error(f"Dizin okuma hatası: {e}")
+            return {"total_domains": 0, "total_archives": 0, "total_size": 0}
+        finally:
+            index.close()
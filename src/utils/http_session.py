@@ -0,0 +1,142 @@
+import ssl
+import logging
+from typing import List, Optional
+
+import aiohttp
+from aiohttp.abc import AbstractResolver
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Aşama zaman aşımlarının varsayılanları (saniye); toplam süreyi aşamazlar
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_TLS_TIMEOUT = 5.0
+
+class TimeoutPolicy:
+    """
+    İstek aşamaları için ayrı zaman aşımları: TCP bağlantısı, TLS el sıkışması ve okuma
+    
+    Yanıt vermeyen host'lar toplam süre dolmadan bırakılır; worker yalnızca gerçekten veri
+    gönderen sunucularda uzun süre bekler. aiohttp'de TLS el sıkışması bağlanma süresine
+    (sock_connect) dahil olduğundan HTTPS URL'lerinde bağlanma bütçesi connect + tls olur.
+    """
+    
+    def __init__(self, total: float, connect: Optional[float] = None, tls: Optional[float] = None,
+                 read: Optional[float] = None):
+        """
+        Args:
+            total: İsteğin toplam zaman aşımı
+            connect: TCP bağlantısı için süre (varsayılan: 5 sn)
+            tls: TLS el sıkışması için ek süre (varsayılan: 5 sn)
+            read: İki okuma arasında en fazla bekleme (varsayılan: toplam süre)
+        """
+        self.total = total
+        self.connect = min(connect or DEFAULT_CONNECT_TIMEOUT, total)
+        self.tls = tls or DEFAULT_TLS_TIMEOUT
+        self.read = min(read or total, total)
+        
+        self._plain = aiohttp.ClientTimeout(total=total, sock_connect=self.connect, sock_read=self.read)
+        self._tls = aiohttp.ClientTimeout(
+            total=total, sock_connect=min(self.connect + self.tls, total), sock_read=self.read
+        )
+    
+    def for_url(self, url: str) -> aiohttp.ClientTimeout:
+        """
+        URL'in şemasına uygun zaman aşımını döndürür
+        
+        Args:
+            url: İstek URL'i
+        
+        Returns:
+            aiohttp.ClientTimeout: HTTPS için TLS süresi eklenmiş zaman aşımı
+        """
+        return self._tls if url.startswith("https:") else self._plain
+
+class SessionFactory:
+    """URLValidator, ArchiveChecker ve ArchiveDownloader'ın paylaştığı bağlantı havuzu"""
+    
+    def __init__(self, limit: int = 100, limit_per_host: int = 0, keepalive_timeout: float = 30,
+                 ttl_dns_cache: Optional[int] = 300, timeout: int = 30, verify_ssl: bool = True,
+                 resolver: Optional[AbstractResolver] = None, user_agent: str = DEFAULT_USER_AGENT,
+                 trace_configs: Optional[List[aiohttp.TraceConfig]] = None):
+        """
+        Args:
+            limit: Toplam eşzamanlı bağlantı sayısı (0: sınırsız)
+            limit_per_host: Host başına eşzamanlı bağlantı sayısı (0: sınırsız)
+            keepalive_timeout: Boşta kalan bağlantının açık tutulma süresi (saniye)
+            ttl_dns_cache: aiohttp DNS önbelleği süresi (None: süresiz)
+            timeout: Varsayılan istek zaman aşımı (saniye)
+            verify_ssl: SSL sertifikası doğrulansın mı
+            resolver: Özel DNS çözümleyicisi (ör. CachedResolver)
+            user_agent: İsteklerde kullanılacak User-Agent
+            trace_configs: Oturuma eklenecek TraceConfig'ler (ör. RequestMetrics.trace_config())
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+        self.resolver = resolver
+        self.user_agent = user_agent
+        self.trace_configs = trace_configs
+        
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def __aenter__(self):
+        self.get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
+    @property
+    def ssl_context(self) -> ssl.SSLContext:
+        """Tüm bağlantılarda tekrar kullanılan SSL context'i (bir kez oluşturulur)"""
+        if self._ssl_context is None:
+            context = ssl.create_default_context()
+            if not self.verify_ssl:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            self._ssl_context = context
+        return self._ssl_context
+    
+    def create_connector(self) -> aiohttp.TCPConnector:
+        """Ayarlara göre TCPConnector oluşturur"""
+        return aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=True,
+            ssl=self.ssl_context,
+            resolver=self.resolver
+        )
+    
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        Paylaşılan oturumu döndürür (ilk çağrıda oluşturulur)
+        
+        Returns:
+            aiohttp.ClientSession: Paylaşılan oturum
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=self.create_connector(),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': self.user_agent},
+                trace_configs=self.trace_configs
+            )
+            logger.debug(
+                f"HTTP oturumu oluşturuldu (limit={self.limit}, host başı={self.limit_per_host}, "
+                f"keepalive={self.keepalive_timeout}s)"
+            )
+        return self._session
+    
+    async def close(self):
+        """Oturumu ve bağlantı havuzunu kapatır"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
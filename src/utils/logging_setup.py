@@ -0,0 +1,58 @@
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Optional
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+
+def setup_queue_logging(log_file: str, level: int = logging.INFO) -> QueueListener:
+    """
+    Logging'i kuyruk üzerinden yapılandırır
+    
+    Event loop'taki log çağrıları kaydı yalnızca kuyruğa ekler; dosyaya ve konsola yazma ayrı bir
+    thread'de (QueueListener) yapılır, yavaş disk veya terminal event loop'u bekletmez.
+    Kuyrukta kalan kayıtlar program çıkarken yazılır.
+    
+    Args:
+        log_file: Log dosyasının yolu
+        level: Kök logger seviyesi
+    
+    Returns:
+        QueueListener: Çalışan dinleyici
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+    
+    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.FileHandler(log_file), logging.StreamHandler(sys.stdout)]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+    
+    if _listener is None:
+        atexit.register(_stop_listener)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+def _stop_listener():
+    """Kuyrukta bekleyen kayıtları yazar ve dinleyici thread'ini durdurur"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
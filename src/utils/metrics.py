@@ -0,0 +1,323 @@
+import asyncio
+import bisect
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import aiohttp
+from aiohttp import web
+
+from .probe_strategies import classify_exception
+from .sharding import shard_file_name
+
+logger = logging.getLogger(__name__)
+
+# Gecikme histogramlarının üst sınırları (saniye)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# İstek aşamaları:
+#   queue: bağlantı havuzunda bekleme, dns: ad çözümleme, connect: TCP (+TLS, https'te),
+#   ttfb: istek gönderildikten yanıt başlıklarına kadar (sunucu süresi), request: toplam süre
+PHASES = ("queue", "dns", "connect", "connect_tls", "ttfb", "request")
+
+class Histogram:
+    """Sabit aralıklı gecikme histogramı (Prometheus histogram biçimiyle uyumlu)"""
+    
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, value: float):
+        """Bir ölçüm ekler"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Aralıklar içinde doğrusal yaklaşımla yüzdelik değeri tahmin eder
+        
+        Args:
+            q: 0-1 arası yüzdelik (ör. 0.99)
+        
+        Returns:
+            Optional[float]: Tahmini değer (ölçüm yoksa None)
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index == len(self.buckets):
+                    # Son aralığın üst sınırı yok: en büyük sınır döndürülür
+                    return self.buckets[-1]
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+    
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99)
+        }
+
+class RequestMetrics:
+    """
+    HTTP isteklerinin aşama sürelerini ve sayaçlarını toplayan sınıf
+    
+    trace_config() ile oluşturulan TraceConfig paylaşılan oturuma eklenir; aiohttp her isteğin
+    DNS, bağlantı havuzu, bağlantı kurma ve yanıt aşamalarında buradaki kancaları çağırır.
+    """
+    
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets: Histogram aralıklarının üst sınırları (saniye)
+        """
+        self.started = time.time()
+        self.histograms: Dict[str, Histogram] = {phase: Histogram(buckets) for phase in PHASES}
+        self.statuses: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.events: Dict[str, int] = {}
+        self._gauges: Dict[str, Callable[[], dict]] = {}
+    
+    def add_gauges(self, name: str, provider: Callable[[], dict]):
+        """
+        Anlık değer sağlayıcısı ekler (ör. scheduler'ın eşzamanlılık sınırı)
+        
+        Args:
+            name: Grup adı
+            provider: Çağrıldığında {ad: sayı} döndüren fonksiyon
+        """
+        self._gauges[name] = provider
+    
+    def _count(self, counters: Dict[str, int], key: str):
+        counters[key] = counters.get(key, 0) + 1
+    
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Oturuma eklenecek TraceConfig'i döndürür"""
+        trace_config = aiohttp.TraceConfig(trace_config_ctx_factory=lambda trace_request_ctx: SimpleNamespace())
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_queued_start.append(self._on_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_queued_end)
+        trace_config.on_connection_create_start.append(self._on_create_start)
+        trace_config.on_connection_create_end.append(self._on_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_reuseconn)
+        trace_config.on_dns_resolvehost_start.append(self._on_dns_start)
+        trace_config.on_dns_resolvehost_end.append(self._on_dns_end)
+        trace_config.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        trace_config.on_request_headers_sent.append(self._on_headers_sent)
+        trace_config.on_request_end.append(self._on_request_end)
+        trace_config.on_request_exception.append(self._on_request_exception)
+        return trace_config
+    
+    @staticmethod
+    def _now() -> float:
+        return asyncio.get_running_loop().time()
+    
+    async def _on_request_start(self, session, ctx, params):
+        ctx.start = self._now()
+        ctx.https = params.url.scheme == "https"
+        ctx.dns = 0.0
+    
+    async def _on_queued_start(self, session, ctx, params):
+        ctx.queued = self._now()
+    
+    async def _on_queued_end(self, session, ctx, params):
+        self.histograms["queue"].observe(self._now() - ctx.queued)
+    
+    async def _on_create_start(self, session, ctx, params):
+        ctx.connect = self._now()
+    
+    async def _on_create_end(self, session, ctx, params):
+        # Bağlantı kurma süresine içindeki DNS çözümlemesi dahil edilmez
+        elapsed = self._now() - ctx.connect - ctx.dns
+        self.histograms["connect_tls" if getattr(ctx, "https", False) else "connect"].observe(elapsed)
+        self._count(self.events, "connection_created")
+    
+    async def _on_reuseconn(self, session, ctx, params):
+        self._count(self.events, "connection_reused")
+    
+    async def _on_dns_start(self, session, ctx, params):
+        ctx.dns_start = self._now()
+    
+    async def _on_dns_end(self, session, ctx, params):
+        ctx.dns = self._now() - ctx.dns_start
+        self.histograms["dns"].observe(ctx.dns)
+    
+    async def _on_dns_cache_hit(self, session, ctx, params):
+        self._count(self.events, "dns_cache_hit")
+    
+    async def _on_headers_sent(self, session, ctx, params):
+        ctx.sent = self._now()
+    
+    async def _on_request_end(self, session, ctx, params):
+        now = self._now()
+        if hasattr(ctx, "sent"):
+            self.histograms["ttfb"].observe(now - ctx.sent)
+        self.histograms["request"].observe(now - ctx.start)
+        status = params.response.status
+        self._count(self.statuses, f"{status // 100}xx")
+        if status in (429, 503):
+            self._count(self.statuses, str(status))
+    
+    async def _on_request_exception(self, session, ctx, params):
+        if isinstance(params.exception, asyncio.CancelledError):
+            # İptal edilen istek (ör. kapatılan parça) hata sayılmaz
+            self._count(self.events, "cancelled")
+            return
+        self._count(self.errors, classify_exception(params.exception))
+        
+    def snapshot(self) -> dict:
+        """Tüm ölçümlerin JSON'a yazılabilir anlık görüntüsü"""
+        return {
+            "time": int(time.time()),
+            "uptime": round(time.time() - self.started, 1),
+            "phases": {phase: histogram.snapshot() for phase, histogram in self.histograms.items()},
+            "statuses": dict(self.statuses),
+            "errors": dict(self.errors),
+            "events": dict(self.events),
+            "gauges": {name: provider() for name, provider in self._gauges.items()}
+        }
+    
+    def prometheus(self, prefix: str = "archive") -> str:
+        """Ölçümleri Prometheus metin biçiminde döndürür"""
+        lines: List[str] = [
+            f"# HELP {prefix}_phase_seconds HTTP istek aşaması süreleri",
+            f"# TYPE {prefix}_phase_seconds histogram"
+        ]
+        for phase, histogram in self.histograms.items():
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{prefix}_phase_seconds_bucket{{phase="{phase}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_phase_seconds_bucket{{phase="{phase}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{prefix}_phase_seconds_sum{{phase="{phase}"}} {histogram.sum}')
+            lines.append(f'{prefix}_phase_seconds_count{{phase="{phase}"}} {histogram.count}')
+        
+        for name, label, counters in (
+            ("responses_total", "status", self.statuses),
+            ("errors_total", "class", self.errors),
+            ("events_total", "event", self.events)
+        ):
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for key, value in sorted(counters.items()):
+                lines.append(f'{prefix}_{name}{{{label}="{key}"}} {value}')
+        
+        for group, provider in self._gauges.items():
+            for key, value in sorted(provider().items()):
+                lines.append(f"# TYPE {prefix}_{group}_{key} gauge")
+                lines.append(f"{prefix}_{group}_{key} {value}")
+        return "\n".join(lines) + "\n"
+
+class MetricsExporter:
+    """Ölçümleri belirli aralıklarla JSON dosyasına yazan ve isteğe bağlı /metrics sunan sınıf"""
+    
+    def __init__(self, metrics: RequestMetrics, snapshot_path: Optional[Path] = None,
+                 interval: float = 10.0, port: Optional[int] = None, host: str = "127.0.0.1"):
+        """
+        Args:
+            metrics: Dışa aktarılacak ölçümler
+            snapshot_path: JSON anlık görüntü dosyası (None: yazılmaz)
+            interval: Dosyanın yazılma aralığı (saniye)
+            port: Prometheus metin uç noktasının portu (None: sunulmaz)
+            host: Uç noktanın dinleyeceği adres (varsayılan yalnızca yerel)
+        """
+        self.metrics = metrics
+        self.snapshot_path = Path(snapshot_path) if snapshot_path is not None else None
+        self.interval = interval
+        self.port = port
+        self.host = host
+        
+        self._task: Optional[asyncio.Task] = None
+        self._runner: Optional[web.AppRunner] = None
+    
+    async def __aenter__(self):
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+    
+    async def start(self):
+        """Dosya yazımını ve (port verildiyse) HTTP uç noktasını başlatır"""
+        if self.snapshot_path is not None:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            self._task = asyncio.create_task(self._write_loop())
+        if self.port is not None:
+            app = web.Application()
+            app.router.add_get("/metrics", self._handle_metrics)
+            app.router.add_get("/metrics.json", self._handle_json)
+            self._runner = web.AppRunner(app, access_log=None)
+            await self._runner.setup()
+            await web.TCPSite(self._runner, self.host, self.port).start()
+            logger.info(f"Metrikler: http://{self.host}:{self.port}/metrics")
+    
+    async def stop(self):
+        """Arka plan işlerini durdurur ve son anlık görüntüyü yazar"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            self.write_snapshot()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    def write_snapshot(self):
+        """Anlık görüntüyü dosyaya atomik olarak yazar"""
+        temp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.metrics.snapshot(), f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"Metrik dosyası yazılamadı: {self.snapshot_path} - {e}")
+    
+    async def _write_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.write_snapshot()
+    
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.metrics.prometheus(), content_type="text/plain", charset="utf-8")
+    
+    async def _handle_json(self, request: web.Request) -> web.Response:
+        return web.json_response(self.metrics.snapshot())
+
+def create_exporter(metrics: RequestMetrics, metrics_file: Optional[str], interval: float,
+                    port: Optional[int], shard: Optional[Tuple[int, int]] = None) -> MetricsExporter:
+    """
+    Komut satırı ayarlarından dışa aktarıcıyı oluşturur
+    
+    Args:
+        metrics: Dışa aktarılacak ölçümler
+        metrics_file: data/results/ altındaki JSON dosyasının adı (None: yazılmaz)
+        interval: Dosyanın yazılma aralığı (saniye)
+        port: Prometheus uç noktasının portu (None: sunulmaz)
+        shard: (parça no, parça sayısı); her süreç kendi dosyasına ve port + parça no'ya yazar
+    
+    Returns:
+        MetricsExporter: `async with` ile kullanılır
+    """
+    snapshot_path = None
+    if metrics_file:
+        if shard is not None:
+            metrics_file = shard_file_name(metrics_file, *shard)
+        snapshot_path = Path("data/results") / metrics_file
+    if port is not None and shard is not None:
+        port += shard[0]
+    return MetricsExporter(metrics, snapshot_path, interval=interval, port=port)
@@ -0,0 +1,150 @@
+import asyncio
+import ipaddress
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+
+from .dns_resolver import DNSResolver, RESOLVED
+
+logger = logging.getLogger(__name__)
+
+# Domain'lerin gruplanabileceği anahtarlar
+GROUP_KEYS = ("ip", "subnet", "host")
+
+def group_key(domain: str, group_by: str, dns_resolver: Optional[DNSResolver] = None) -> str:
+    """
+    Domain'in ait olduğu grubu döndürür (aynı gruba eşzamanlı bağlantı sınırlanır)
+    
+    Args:
+        domain: Domain adı (port içerebilir)
+        group_by: ip (çözümlenen IP), subnet (IPv4 /24, IPv6 /48) veya host
+        dns_resolver: IP gruplaması için önbelleği dolu DNS çözümleyicisi
+    
+    Returns:
+        str: Grup anahtarı (IP bilinmiyorsa host adı)
+    """
+    host = DNSResolver.host_from_domain(domain)
+    if group_by == "host":
+        return host
+    
+    try:
+        ip = ipaddress.ip_address(host)
+    except ValueError:
+        ip = None
+        cached = dns_resolver.get_cached(host) if dns_resolver is not None else None
+        if cached is not None and cached[0] == RESOLVED and cached[1]:
+            # Birden fazla adres varsa sıralı ilk adres sabit bir anahtar verir
+            ip = ipaddress.ip_address(min(cached[1]))
+    if ip is None:
+        return host
+    
+    if group_by == "subnet":
+        prefix = 24 if ip.version == 4 else 48
+        return str(ipaddress.ip_network(f"{ip}/{prefix}", strict=False))
+    return str(ip)
+
+class PolitenessQueue:
+    """
+    Bekleyen domain'leri gruplara ayıran ve gruplar arasında sırayla dağıtan sınırlı kuyruk
+    
+    Aynı gruptan en fazla group_limit domain aynı anda işlenir; worker'lar sınıra ulaşmamış
+    grupları sırayla (round-robin) alır. Böylece aynı paylaşımlı hosting IP'sine yığılma olmaz,
+    toplam hız ise diğer gruplarla korunur.
+    """
+    
+    def __init__(self, group_limit: int = 4, capacity: int = 10000):
+        """
+        Args:
+            group_limit: Bir gruptan aynı anda işlenebilecek en fazla domain
+            capacity: Kuyrukta bekleyebilecek en fazla domain (gruplar arası karıştırma penceresi)
+        """
+        self.group_limit = max(1, group_limit)
+        self.capacity = max(1, capacity)
+        
+        self._pending: Dict[str, Deque[Any]] = {}
+        self._active: Dict[str, int] = {}
+        self._ready: Deque[str] = deque()
+        self._ready_set: Set[str] = set()
+        self._size = 0
+        self._closed = False
+        self._condition = asyncio.Condition()
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    @property
+    def group_count(self) -> int:
+        """Bekleyen veya işlenen domain'i olan grup sayısı"""
+        return len(set(self._pending) | set(self._active))
+    
+    async def put(self, key: str, item: Any):
+        """
+        Öğeyi grubuna ekler; kuyruk doluysa yer açılana kadar bekler
+        
+        Args:
+            key: Grup anahtarı
+            item: Kuyruğa eklenecek öğe
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._size < self.capacity)
+            self._pending.setdefault(key, deque()).append(item)
+            self._size += 1
+            self._mark_ready(key)
+            self._condition.notify_all()
+    
+    async def get(self) -> Optional[Tuple[str, Any]]:
+        """
+        Sıradaki uygun gruptan bir öğe alır
+        
+        Returns:
+            Optional[Tuple[str, Any]]: (grup anahtarı, öğe) veya kuyruk kapanıp boşaldıysa None
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._ready or (self._closed and self._size == 0))
+            if not self._ready:
+                return None
+            
+            key = self._ready.popleft()
+            self._ready_set.discard(key)
+            pending = self._pending[key]
+            item = pending.popleft()
+            if not pending:
+                del self._pending[key]
+            self._size -= 1
+            self._active[key] = self._active.get(key, 0) + 1
+            
+            # Grup hâlâ uygunsa sıranın sonuna geçer (round-robin)
+            self._mark_ready(key)
+            self._condition.notify_all()
+            return key, item
+    
+    async def task_done(self, key: str):
+        """
+        Gruptan alınan öğenin işlendiğini bildirir
+        
+        Args:
+            key: get() ile dönen grup anahtarı
+        """
+        async with self._condition:
+            active = self._active.get(key, 0) - 1
+            if active > 0:
+                self._active[key] = active
+            else:
+                self._active.pop(key, None)
+            self._mark_ready(key)
+            self._condition.notify_all()
+    
+    async def close(self):
+        """Yeni öğe eklenmeyeceğini bildirir; kuyruk boşalınca get() None döndürür"""
+        async with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+    
+    def _mark_ready(self, key: str):
+        """Bekleyen öğesi olan ve sınıra ulaşmamış grubu dağıtım sırasına ekler"""
+        if key in self._ready_set or key not in self._pending:
+            return
+        if self._active.get(key, 0) >= self.group_limit:
+            return
+        self._ready.append(key)
+        self._ready_set.add(key)
@@ -0,0 +1,189 @@
+import asyncio
+import errno
+import socket
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Tek bir URL denemesinin sonuç türleri
+FOUND = "found"              # Archive.zip bulundu
+ABSENT = "absent"            # Sunucu yanıt verdi ama dosya yok/geçersiz (kesin yanıt)
+REFUSED = "refused"          # Bağlantı reddedildi (port kapalı, host ayakta)
+DNS = "dns"                  # Host adı çözümlenemedi
+UNREACHABLE = "unreachable"  # Host'a ulaşılamıyor (ağ/host erişilemez)
+TIMEOUT = "timeout"          # Zaman aşımı (bağlanma, TLS veya okuma)
+RESET = "reset"              # Bağlantı yanıt ortasında koptu
+SERVER_ERROR = "server_error"  # HTTP 5xx
+RATE_LIMITED = "rate_limited"  # HTTP 429
+ERROR = "error"              # Diğer hatalar (SSL vb.)
+
+# Geçici olabilecek hatalar: bu sonuçlar ertelenip daha sonra yeniden denenir
+RETRYABLE_OUTCOMES = (TIMEOUT, RESET, SERVER_ERROR, RATE_LIMITED)
+
+# (sonuç türü, URL, açıklama)
+ProbeOutcome = Tuple[str, str, Optional[str]]
+ProbeFunc = Callable[[str, str], Awaitable[ProbeOutcome]]
+
+# Host'a hiç ulaşılamadığını gösteren soket hataları
+UNREACHABLE_ERRNOS = {
+    getattr(errno, name)
+    for name in ('EHOSTUNREACH', 'ENETUNREACH', 'EHOSTDOWN')
+    if hasattr(errno, name)
+}
+
+# Bağlantının karşı tarafça koparıldığını gösteren soket hataları
+RESET_ERRNOS = {
+    getattr(errno, name)
+    for name in ('ECONNRESET', 'ECONNABORTED', 'EPIPE')
+    if hasattr(errno, name)
+}
+
+# 5xx olup sunucu hatası sayılmayan durumlar (HEAD/HTTP sürümü desteklenmiyor: kesin yanıt)
+PERMANENT_SERVER_STATUSES = (501, 505)
+
+def classify_exception(error: BaseException) -> str:
+    """
+    İstek sırasında oluşan hatayı sonuç türüne çevirir
+    
+    Args:
+        error: Yakalanan hata
+    
+    Returns:
+        str: Sonuç türü
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        return TIMEOUT
+    if isinstance(error, aiohttp.ClientConnectorError):
+        os_error = getattr(error, 'os_error', None)
+        if isinstance(os_error, socket.gaierror):
+            return DNS
+        if isinstance(os_error, ConnectionRefusedError):
+            return REFUSED
+        if isinstance(os_error, OSError) and os_error.errno in UNREACHABLE_ERRNOS:
+            return UNREACHABLE
+    if isinstance(error, (aiohttp.ServerDisconnectedError, aiohttp.ClientPayloadError, ConnectionResetError)):
+        return RESET
+    if isinstance(error, OSError) and error.errno in RESET_ERRNOS:
+        return RESET
+    return ERROR
+
+def classify_status(status: int) -> str:
+    """
+    Dosyanın bulunmadığını gösteren HTTP durumunu sonuç türüne çevirir
+    
+    Args:
+        status: HTTP durum kodu (200 dışı)
+    
+    Returns:
+        str: RATE_LIMITED (429), SERVER_ERROR (5xx) veya ABSENT
+    """
+    if status == 429:
+        return RATE_LIMITED
+    if 500 <= status < 600 and status not in PERMANENT_SERVER_STATUSES:
+        return SERVER_ERROR
+    return ABSENT
+
+class ProbeStrategy:
+    """HTTPS/HTTP URL'lerinin hangi sırayla ve nasıl deneneceğini belirleyen temel sınıf"""
+    
+    name = "base"
+    
+    async def probe(self, domain: str, urls: List[str], probe_url: ProbeFunc) -> Tuple[bool, str, Optional[str]]:
+        """
+        Domain için URL'leri dener
+        
+        Args:
+            domain: Kontrol edilecek domain
+            urls: Denenecek URL'ler (öncelik sırasıyla)
+            probe_url: Tek bir URL'i deneyen fonksiyon
+        
+        Returns:
+            Tuple[bool, str, Optional[str]]: (mevcut mu, URL, hata mesajı)
+        """
+        raise NotImplementedError
+    
+    @staticmethod
+    def _not_found(domain: str, last_detail: Optional[str]) -> Tuple[bool, str, Optional[str]]:
+        """Bulunamadı sonucunu döndürür"""
+        message = f"Archive.zip bulunamadı: {domain}"
+        if last_detail:
+            message += f" ({last_detail})"
+        return False, "", message
+
+class SequentialStrategy(ProbeStrategy):
+    """URL'leri sırayla dener; yalnızca DNS hatasında ve ulaşılamayan host'ta diğer URL'leri atlar"""
+    
+    name = "sequential"
+    
+    # Bu sonuçlardan sonra kalan URL'ler denenmez
+    stop_outcomes = (DNS, UNREACHABLE)
+    
+    async def probe(self, domain, urls, probe_url):
+        last_detail = None
+        for url in urls:
+            outcome, found_url, detail = await probe_url(domain, url)
+            if outcome == FOUND:
+                return True, found_url, None
+            last_detail = detail
+            if outcome in self.stop_outcomes:
+                logger.debug("⏩ Kalan URL'ler atlandı: %s - %s", domain, outcome)
+                break
+        return self._not_found(domain, last_detail)
+
+class ShortCircuitStrategy(SequentialStrategy):
+    """
+    HTTPS kesin bir HTTP yanıtı verdiyse HTTP'yi denemez; DNS hatası ve zaman aşımında
+    host'u ölü kabul edip hemen bırakır
+    """
+    
+    name = "short-circuit"
+    
+    stop_outcomes = (ABSENT, DNS, UNREACHABLE, TIMEOUT)
+
+class RaceStrategy(ProbeStrategy):
+    """Tüm URL'leri aynı anda dener; ilk bulan kazanır, diğer istekler iptal edilir"""
+    
+    name = "race"
+    
+    async def probe(self, domain, urls, probe_url):
+        tasks = [asyncio.create_task(probe_url(domain, url)) for url in urls]
+        last_detail = None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                outcome, found_url, detail = await next_done
+                if outcome == FOUND:
+                    return True, found_url, None
+                last_detail = detail
+                if outcome in (DNS, UNREACHABLE):
+                    # Tüm URL'ler aynı host adını kullanır
+                    break
+            return self._not_found(domain, last_detail)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+PROBE_STRATEGIES: Dict[str, Type[ProbeStrategy]] = {
+    SequentialStrategy.name: SequentialStrategy,
+    ShortCircuitStrategy.name: ShortCircuitStrategy,
+    RaceStrategy.name: RaceStrategy,
+}
+
+def get_probe_strategy(name: str) -> ProbeStrategy:
+    """
+    İsme göre deneme stratejisi oluşturur
+    
+    Args:
+        name: sequential, short-circuit veya race
+    
+    Returns:
+        ProbeStrategy: Strateji nesnesi
+    """
+    try:
+        return PROBE_STRATEGIES[name]()
+    except KeyError:
+        raise ValueError(f"Bilinmeyen deneme stratejisi: {name}") from None
@@ -0,0 +1,59 @@
+import time
+from typing import Callable, Optional
+
+from tqdm import tqdm
+
+# İlerleme çubuğunun yenilenme aralığı (saniye)
+PROGRESS_INTERVAL = 0.5
+
+class ThrottledProgress:
+    """
+    tqdm çubuğunu her tamamlanan görevde değil, sabit aralıklarla güncelleyen sarmalayıcı
+    
+    Tamamlanan görevler sayaçta biriktirilir; çubuk ve ek bilgiler (postfix) en fazla
+    interval saniyede bir çizilir. Saniyede on binlerce sonuçta terminal yazımı ve postfix
+    biçimlendirmesi event loop'u yavaşlatmaz.
+    """
+    
+    def __init__(self, pbar: tqdm, interval: float = PROGRESS_INTERVAL,
+                 postfix: Optional[Callable[[], dict]] = None):
+        """
+        Args:
+            pbar: Güncellenecek ilerleme çubuğu
+            interval: Yenilenme aralığı (saniye)
+            postfix: Yenilemede çağrılır; çubukta gösterilecek sayıları döndürür
+        """
+        self.pbar = pbar
+        self.interval = interval
+        self.postfix = postfix
+        self._pending = 0
+        self._last_refresh = time.monotonic()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def update(self, n: int = 1):
+        """n görevin tamamlandığını bildirir; aralık dolduysa çubuğu yeniler"""
+        self._pending += n
+        if time.monotonic() - self._last_refresh >= self.interval:
+            self.refresh()
+    
+    def refresh(self):
+        """Biriken ilerlemeyi ve ek bilgileri hemen çizer"""
+        self._last_refresh = time.monotonic()
+        if self.pbar.disable:
+            self._pending = 0
+            return
+        if self.postfix is not None:
+            self.pbar.set_postfix(self.postfix(), refresh=False)
+        pending, self._pending = self._pending, 0
+        # tqdm kendi mininterval'ı (0.1 s) dolduğu için bu çağrıda çizer
+        self.pbar.update(pending)
+    
+    def close(self):
+        """Son durumu çizer ve çubuğu kapatır"""
+        self.refresh()
+        self.pbar.close()
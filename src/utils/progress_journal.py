@@ -0,0 +1,393 @@
+import os
+import mmap
+import asyncio
+import concurrent.futures
+import time
+import heapq
+import struct
+import bisect
+import hashlib
+import logging
+from array import array
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+def _fsync_and_close(fd: int):
+    """Kopyalanmış dosya tanımlayıcısını diske yazar ve kapatır (thread içinde çalışır)"""
+    try:
+        os.fsync(fd)
+    except OSError as e:
+        logger.warning(f"Journal diske yazılamadı: {e}")
+    finally:
+        os.close(fd)
+
+class ProgressJournal:
+    """Tamamlanan domain'leri kaydeden, çökme sonrası devam etmeyi sağlayan journal"""
+    
+    # Index başlığı: magic, journal ofseti, toplam, bulunan, hash sayısı (8 byte hizalı)
+    INDEX_MAGIC = b"AJIDX001"
+    INDEX_HEADER = struct.Struct("<8sQQQQ")
+    
+    def __init__(self, journal_path: Union[str, Path], resume: bool = False,
+                 flush_every: int = 1000, flush_interval: float = 5.0,
+                 compact_threshold: int = 1_000_000):
+        """
+        Args:
+            journal_path: Journal dosyasının yolu (index aynı isimle .idx uzantılı tutulur)
+            resume: True ise önceki journal okunur, False ise sıfırdan başlanır
+            flush_every: Kaç kayıtta bir diske yazılacağı
+            flush_interval: En fazla kaç saniyede bir diske yazılacağı
+            compact_threshold: Bellekteki yeni hash sayısı bu değeri aşınca index yeniden yazılır
+        """
+        self.journal_path = Path(journal_path)
+        self.index_path = self.journal_path.with_suffix(".idx")
+        self.resume = resume
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.compact_threshold = compact_threshold
+        
+        # Önceki çalışmalardan gelen sayılar
+        self.previous_total = 0
+        self.previous_found = 0
+        
+        # Bu çalışmada kaydedilenler
+        self.recorded_total = 0
+        self.recorded_found = 0
+        
+        # Index + bellekteki hash'lerin kapsadığı toplam sayılar
+        self._indexed_total = 0
+        self._indexed_found = 0
+        
+        self._index_mmap: Optional[mmap.mmap] = None
+        self._index_view: Optional[memoryview] = None
+        self._index_offset = 0
+        self._pending = set()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        self._file = None
+        self._sync_future: Optional[asyncio.Future] = None
+        # Arka planda index'e yazılan hash'ler (yazma bitene kadar sorgularda da aranır)
+        self._compacting = set()
+        self._compact_future: Optional[concurrent.futures.Future] = None
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+    
+    def __enter__(self):
+        self.open()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    @staticmethod
+    def domain_hash(domain: str) -> int:
+        """Domain için 64 bit hash değeri döndürür"""
+        return int.from_bytes(hashlib.blake2b(domain.encode("utf-8"), digest_size=8).digest(), "little")
+    
+    def open(self):
+        """Journal'ı açar; resume modunda index'i yükler ve journal kuyruğunu işler"""
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        if not self.resume:
+            for path in (self.journal_path, self.index_path):
+                if path.exists():
+                    path.unlink()
+        else:
+            self._load_index()
+            self._replay_journal()
+            self.previous_total = self._indexed_total
+            self.previous_found = self._indexed_found
+        
+        self._file = open(self.journal_path, "ab")
+        
+        if self.resume:
+            logger.info(
+                f"Journal yüklendi: {self.previous_total} domain daha önce tamamlanmış "
+                f"({self.previous_found} bulunan)"
+            )
+    
+    def _load_index(self):
+        """Sıralı hash index'ini mmap ile açar (belleğe kopyalamadan)"""
+        if not self.index_path.exists():
+            return
+        
+        try:
+            with open(self.index_path, "rb") as f:
+                header = f.read(self.INDEX_HEADER.size)
+                magic, offset, total, found, count = self.INDEX_HEADER.unpack(header)
+                if magic != self.INDEX_MAGIC:
+                    raise ValueError("geçersiz index başlığı")
+                
+                self._index_offset = offset
+                self._indexed_total = total
+                self._indexed_found = found
+                
+                if count:
+                    self._index_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    start = self.INDEX_HEADER.size
+                    self._index_view = memoryview(self._index_mmap)[start:start + count * 8].cast("Q")
+        except Exception as e:
+            # Bozuk index: journal'ın tamamı baştan işlenir
+            logger.warning(f"Index okunamadı, journal baştan işlenecek: {e}")
+            self._release_index()
+            self._index_offset = 0
+            self._indexed_total = 0
+            self._indexed_found = 0
+    
+    def _replay_journal(self):
+        """Index'in kapsamadığı journal kayıtlarını okur, yarım kalan son satırı atar"""
+        if not self.journal_path.exists():
+            return
+        
+        with open(self.journal_path, "r+b") as f:
+            size = os.fstat(f.fileno()).st_size
+            if self._index_offset > size:
+                # Journal index'ten kısa: index güvenilmez
+                self._release_index()
+                self._index_offset = 0
+                self._indexed_total = 0
+                self._indexed_found = 0
+            
+            f.seek(self._index_offset)
+            valid_end = self._index_offset
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                valid_end += len(line)
+                parts = line.rstrip(b"\n").split(b"\t")
+                if len(parts) < 2:
+                    continue
+                
+                domain_hash = self.domain_hash(parts[1].decode("utf-8", errors="replace"))
+                if self._in_index(domain_hash) or domain_hash in self._pending:
+                    continue
+                self._pending.add(domain_hash)
+                self._indexed_total += 1
+                if parts[0] == b"FOUND":
+                    self._indexed_found += 1
+            
+            if valid_end < size:
+                logger.warning(f"Journal sonundaki yarım kayıt atıldı: {size - valid_end} byte")
+                f.truncate(valid_end)
+    
+    def _in_index(self, domain_hash: int) -> bool:
+        """Hash'in diskteki sıralı index'te olup olmadığını kontrol eder"""
+        view = self._index_view
+        if view is None:
+            return False
+        position = bisect.bisect_left(view, domain_hash)
+        return position < len(view) and view[position] == domain_hash
+    
+    def is_finished(self, domain: str) -> bool:
+        """
+        Domain'in daha önce tamamlanıp tamamlanmadığını kontrol eder
+        
+        Args:
+            domain: Domain adı
+        
+        Returns:
+            bool: Tamamlanmış mı
+        """
+        domain_hash = self.domain_hash(domain)
+        return domain_hash in self._pending or domain_hash in self._compacting or self._in_index(domain_hash)
+    
+    async def skip_finished(
+        self,
+        domains: Union[AsyncIterable[str], Iterable[str]]
+    ) -> AsyncIterator[str]:
+        """
+        Domain akışından önceden tamamlanmış olanları çıkarır
+        
+        Args:
+            domains: Domain'leri üreten (async) iterable
+        
+        Yields:
+            str: Henüz kontrol edilmemiş domain
+        """
+        skipped = 0
+        if hasattr(domains, '__aiter__'):
+            async for domain in domains:
+                if self.is_finished(domain):
+                    skipped += 1
+                    continue
+                yield domain
+        else:
+            for domain in domains:
+                if self.is_finished(domain):
+                    skipped += 1
+                    continue
+                yield domain
+        
+        if skipped:
+            logger.info(f"{skipped} domain önceki çalışmada tamamlandığı için atlandı")
+    
+    def record(self, domain: str, found: bool, url: str = ""):
+        """
+        Tamamlanan bir domain'i journal'a ekler
+        
+        Args:
+            domain: Domain adı
+            found: Archive.zip bulundu mu
+            url: Bulunan URL
+        """
+        status = "FOUND" if found else "MISS"
+        self._file.write(f"{status}\t{domain}\t{url}\n".encode("utf-8"))
+        domain_hash = self.domain_hash(domain)
+        # Aynı domain'de birden fazla dosya bulunduysa domain bir kez sayılır
+        if (domain_hash not in self._pending and domain_hash not in self._compacting
+                and not self._in_index(domain_hash)):
+            self._pending.add(domain_hash)
+            self.recorded_total += 1
+            self._indexed_total += 1
+            if found:
+                self.recorded_found += 1
+                self._indexed_found += 1
+        
+        self._unflushed += 1
+        if (self._unflushed >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self._flush_in_background()
+        
+        if self._compact_future is not None and self._compact_future.done():
+            self._finish_compact()
+        if len(self._pending) >= self.compact_threshold and self._compact_future is None:
+            self._compact_in_background()
+    
+    def flush(self):
+        """Bekleyen kayıtları diske yazar"""
+        if self._file is None or self._unflushed == 0:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+    
+    def _flush_in_background(self):
+        """
+        Bekleyen kayıtları işletim sistemine yazar, fsync'i thread'de yapar
+        
+        record() event loop içinden çağrılır; yavaş diskte fsync tüm denemeleri bekletmesin diye
+        dosya tanımlayıcısının kopyası üzerinden executor'da çalışır. Önceki fsync sürüyorsa
+        kayıtlar bir sonraki denemede diske yazılır.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._sync_future is not None and not self._sync_future.done():
+            return
+        self._file.flush()
+        self._sync_future = loop.run_in_executor(None, _fsync_and_close, os.dup(self._file.fileno()))
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+    
+    def _write_index(self, journal_offset: int, total: int, found: int, existing, pending) -> int:
+        """
+        Diskteki sıralı index ile yeni hash'leri birleştirip index'i atomik olarak yeniden yazar
+        
+        Arka plan thread'inde de çalışır: yalnızca verilen değerleri kullanır, nesne durumunu değiştirmez.
+        
+        Returns:
+            int: Index'teki hash sayısı
+        """
+        merged_count = len(existing) + len(pending)
+        tmp_path = self.index_path.with_suffix(".idx.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(self.INDEX_HEADER.pack(self.INDEX_MAGIC, journal_offset, total, found, merged_count))
+            buffer = array("Q")
+            for domain_hash in heapq.merge(existing, sorted(pending)):
+                buffer.append(domain_hash)
+                if len(buffer) >= 65536:
+                    buffer.tofile(f)
+                    buffer = array("Q")
+            buffer.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        # Eski index'in mmap'i kapatılana kadar geçerli kalır (dosya yalnızca yeniden adlandırılır)
+        os.replace(tmp_path, self.index_path)
+        return merged_count
+    
+    def _compact_in_background(self):
+        """
+        Index'i executor'da yeniden yazar (record() event loop içinden çağrılır)
+        
+        Bekleyen hash'ler yazılırken _compacting'de aranmaya devam eder, yeni kayıtlar boş bir
+        _pending'e eklenir. Birleştirme ve fsync milyonlarca kayıtta saniyeler sürebildiği için
+        denemeleri bekletmez; sonuç bir sonraki record() çağrısında uygulanır.
+        """
+        # Index'in kapsadığı journal kayıtları önce diske inmeli
+        self._file.flush()
+        journal_fd = os.dup(self._file.fileno())
+        existing = self._index_view if self._index_view is not None else ()
+        journal_offset = self._file.tell()
+        total, found = self._indexed_total, self._indexed_found
+        compacting = self._compacting = self._pending
+        self._pending = set()
+        
+        def run() -> int:
+            _fsync_and_close(journal_fd)
+            return self._write_index(journal_offset, total, found, existing, compacting)
+        
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal")
+        self._compact_future = self._executor.submit(run)
+    
+    def _finish_compact(self):
+        """Arka planda yazılan index'i açar (yazma başarısız olduysa hash'ler belleğe geri alınır)"""
+        future, self._compact_future = self._compact_future, None
+        try:
+            merged_count = future.result()
+        except OSError as e:
+            logger.warning(f"Journal index'i yazılamadı: {e}")
+            self._pending |= self._compacting
+            self._compacting = set()
+            return
+        
+        # Index başlığındaki sayılar başlatma anına aittir; o andan beri eklenenler korunur
+        total, found = self._indexed_total, self._indexed_found
+        self._release_index()
+        self._load_index()
+        self._indexed_total, self._indexed_found = total, found
+        self._compacting = set()
+        logger.debug(f"Journal index'i sıkıştırıldı: {merged_count} domain")
+    
+    def compact(self):
+        """Bellekteki hash'leri diskteki sıralı index ile birleştirip index'i atomik olarak yeniden yazar"""
+        if self._compact_future is not None:
+            concurrent.futures.wait([self._compact_future])
+            self._finish_compact()
+        self.flush()
+        journal_offset = self._file.tell() if self._file else self.journal_path.stat().st_size
+        
+        existing = self._index_view if self._index_view is not None else ()
+        merged_count = self._write_index(
+            journal_offset, self._indexed_total, self._indexed_found, existing, self._pending
+        )
+        
+        self._release_index()
+        self._pending = set()
+        self._load_index()
+        logger.debug(f"Journal index'i sıkıştırıldı: {merged_count} domain")
+    
+    def _release_index(self):
+        """mmap edilmiş index'i serbest bırakır"""
+        if self._index_view is not None:
+            self._index_view.release()
+            self._index_view = None
+        if self._index_mmap is not None:
+            self._index_mmap.close()
+            self._index_mmap = None
+    
+    def close(self):
+        """Journal'ı diske yazar, index'i günceller ve kapatır"""
+        if self._file is None:
+            return
+        self.compact()
+        self._file.close()
+        self._file = None
+        self._release_index()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
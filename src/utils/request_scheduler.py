@@ -0,0 +1,208 @@
+import asyncio
+import time
+import logging
+from typing import Dict, Optional
+
+from .probe_strategies import ERROR, RESET, TIMEOUT, classify_exception
+
+logger = logging.getLogger(__name__)
+
+# Bu HTTP durumları sunucunun yük altında olduğunu gösterir (AIMD için hata sayılır)
+OVERLOAD_STATUSES = (429, 503)
+
+class RequestSlot:
+    """Scheduler'dan alınan tek bir istek hakkı; çıkışta sonucu scheduler'a bildirir"""
+    
+    def __init__(self, scheduler: "RequestScheduler", host: Optional[str]):
+        self.scheduler = scheduler
+        self.host = host
+        self.failed = False
+    
+    async def __aenter__(self):
+        await self.scheduler.acquire(self.host)
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None and issubclass(exc_type, asyncio.CancelledError):
+            # İptal edilen istek (ör. race'i kaybeden deneme, kapanış) AIMD penceresine sayılmaz
+            await self.scheduler.release(False, counted=False)
+            return
+        if exc_val is not None and classify_exception(exc_val) in (TIMEOUT, RESET, ERROR):
+            self.failed = True
+        await self.scheduler.release(self.failed)
+    
+    def check_status(self, status: int):
+        """Yanıt durumu sunucunun aşırı yüklendiğini gösteriyorsa isteği başarısız sayar"""
+        if status in OVERLOAD_STATUSES:
+            self.failed = True
+
+class RequestScheduler:
+    """
+    Eşzamanlı istek sayısını ve saniyedeki istek sayısını birbirinden bağımsız sınırlayan sınıf
+    
+    - max_in_flight: Aynı anda açık en fazla istek sayısı (0: sınırsız)
+    - rate: Saniyede başlatılabilecek en fazla istek (token bucket, 0: sınırsız)
+    - host_rate: Aynı host'a saniyede en fazla istek (0: sınırsız)
+    - adaptive: AIMD - hata/zaman aşımı oranı düşükken eşzamanlılığı artır, yükselince yarıya indir
+    """
+    
+    def __init__(self, max_in_flight: int = 0, rate: float = 0, burst: Optional[float] = None,
+                 host_rate: float = 0, adaptive: bool = False, initial_in_flight: Optional[int] = None,
+                 min_in_flight: int = 1, window: int = 50, error_threshold: float = 0.2,
+                 increase_step: int = 1, decrease_factor: float = 0.5):
+        """
+        Args:
+            max_in_flight: Aynı anda açık en fazla istek sayısı (0: sınırsız; AIMD'de üst sınır)
+            rate: Global saniyedeki istek sınırı (0: sınırsız)
+            burst: Token bucket kapasitesi (varsayılan: saniyelik oran)
+            host_rate: Host başına saniyedeki istek sınırı (0: sınırsız)
+            adaptive: AIMD modu açık mı (max_in_flight verilmelidir)
+            initial_in_flight: AIMD başlangıç eşzamanlılığı (varsayılan: üst sınırın dörtte biri)
+            min_in_flight: AIMD'de eşzamanlılığın inebileceği en düşük değer
+            window: AIMD'nin kaç istekte bir karar verdiği
+            error_threshold: Bu oranın üstündeki hata/zaman aşımında eşzamanlılık düşürülür
+            increase_step: Sağlıklı her pencerede eklenen eşzamanlılık
+            decrease_factor: Sağlıksız pencerede eşzamanlılığın çarpıldığı katsayı
+        """
+        if adaptive and max_in_flight <= 0:
+            raise ValueError("AIMD modu için max_in_flight verilmelidir")
+        
+        self.max_in_flight = max_in_flight
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.host_interval = 1.0 / host_rate if host_rate > 0 else 0.0
+        self.adaptive = adaptive
+        self.min_in_flight = max(1, min_in_flight)
+        self.window = window
+        self.error_threshold = error_threshold
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        
+        if adaptive:
+            start = initial_in_flight or max(self.min_in_flight, max_in_flight // 4)
+            self.limit = min(max(start, self.min_in_flight), max_in_flight)
+        else:
+            self.limit = max_in_flight
+        
+        self.in_flight = 0
+        self.stats = {"requests": 0, "failures": 0, "increases": 0, "decreases": 0}
+        
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._condition: Optional[asyncio.Condition] = None
+        self._rate_lock: Optional[asyncio.Lock] = None
+        self._host_next: Dict[str, float] = {}
+        self._window_total = 0
+        self._window_failures = 0
+    
+    def slot(self, host: Optional[str] = None) -> RequestSlot:
+        """
+        İstek hakkı döndürür: `async with scheduler.slot(host):` bloğu içinde istek atılır
+        
+        Args:
+            host: İsteğin gideceği host (host başı sınır için)
+        
+        Returns:
+            RequestSlot: Async context manager
+        """
+        return RequestSlot(self, host)
+    
+    async def acquire(self, host: Optional[str] = None):
+        """Host, eşzamanlılık ve oran sınırlarının hepsi izin verene kadar bekler"""
+        if self._condition is None:
+            # Kilitler çalışan event loop içinde oluşturulur (alt süreçler kendi loop'unu kullanır)
+            self._condition = asyncio.Condition()
+            self._rate_lock = asyncio.Lock()
+        
+        if host and self.host_interval:
+            await self._wait_host(host)
+        
+        if self.limit > 0:
+            async with self._condition:
+                await self._condition.wait_for(lambda: self.in_flight < self.limit)
+                self.in_flight += 1
+        else:
+            self.in_flight += 1
+        
+        if self.rate > 0:
+            try:
+                await self._take_token()
+            except BaseException:
+                await self.release(False, counted=False)
+                raise
+    
+    async def release(self, failed: bool, counted: bool = True):
+        """İstek hakkını bırakır ve sonucu AIMD penceresine ekler"""
+        if counted:
+            self.stats["requests"] += 1
+            if failed:
+                self.stats["failures"] += 1
+        
+        if self.limit > 0:
+            async with self._condition:
+                if counted and self.adaptive:
+                    self._record(failed)
+                self.in_flight -= 1
+                # Boşalan tek yer için tek bekleyen uyandırılır (sınır artışında _record hepsini uyandırır)
+                self._condition.notify(1)
+        else:
+            if counted and self.adaptive:
+                self._record(failed)
+            self.in_flight -= 1
+    
+    async def _take_token(self):
+        """Token bucket'tan bir token alır; yoksa yenilenene kadar bekler (sıralı, FIFO)"""
+        async with self._rate_lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    async def _wait_host(self, host: str):
+        """Aynı host'a yapılan istekler arasında en az host_interval kadar süre bırakır"""
+        now = time.monotonic()
+        scheduled = max(now, self._host_next.get(host, 0.0))
+        self._host_next[host] = scheduled + self.host_interval
+        
+        if len(self._host_next) > 10000:
+            # Süresi geçmiş kayıtları temizle (bellek sınırlı kalsın)
+            self._host_next = {key: value for key, value in self._host_next.items() if value > now}
+        
+        if scheduled > now:
+            await asyncio.sleep(scheduled - now)
+    
+    def _record(self, failed: bool):
+        """
+        AIMD: pencere dolduğunda hata oranına göre eşzamanlılık sınırını ayarlar
+        
+        Sınır sıfırdan büyükken release() içinde, koşul kilidi tutulurken çağrılır.
+        """
+        self._window_total += 1
+        if failed:
+            self._window_failures += 1
+        if self._window_total < self.window:
+            return
+        
+        error_rate = self._window_failures / self._window_total
+        self._window_total = 0
+        self._window_failures = 0
+        
+        previous = self.limit
+        if error_rate > self.error_threshold:
+            self.limit = max(self.min_in_flight, int(self.limit * self.decrease_factor))
+            if self.limit != previous:
+                self.stats["decreases"] += 1
+        else:
+            self.limit = min(self.max_in_flight, self.limit + self.increase_step)
+            if self.limit != previous:
+                self.stats["increases"] += 1
+                # Sınır arttı: açılan yerlerin hepsi için bekleyenler uyandırılır
+                if self._condition is not None and self._condition.locked():
+                    self._condition.notify_all()
+        
+        if self.limit != previous:
+            logger.debug("AIMD eşzamanlılık: %s -> %s (hata oranı: %.0f%%)", previous, self.limit, error_rate * 100)
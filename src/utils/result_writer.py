@@ -0,0 +1,256 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+import time
+from pathlib import Path
+from typing import AsyncIterator, Callable, List, Optional, Tuple, Union
+
+import aiofiles
+
+logger = logging.getLogger(__name__)
+
+class ResultWriter:
+    """Bulunan sonuçları kuyruktan alıp toplu halde dosyaya yazan sınıf"""
+    
+    FORMATS = ("txt", "jsonl", "csv")
+    
+    def __init__(self, output_path: Union[str, Path], output_format: Optional[str] = None,
+                 batch_size: int = 500, flush_interval: float = 2.0, queue_size: int = 10000):
+        """
+        Args:
+            output_path: Çıktı dosyasının yolu
+            output_format: txt, jsonl veya csv (verilmezse dosya uzantısından belirlenir)
+            batch_size: Bu kadar kayıt birikince dosyaya yazılır
+            flush_interval: En fazla bu kadar saniyede bir dosyaya yazılır
+            queue_size: Yazma kuyruğunun kapasitesi
+        """
+        self.output_path = Path(output_path)
+        self.output_format = output_format or self.detect_format(self.output_path)
+        if self.output_format not in self.FORMATS:
+            raise ValueError(f"Desteklenmeyen çıktı formatı: {self.output_format}")
+        
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.written_count = 0
+        
+        # Bir grup dosyaya yazıldıktan sonra çağrılır (ör. journal kaydı için)
+        self.on_flush: Optional[Callable[[List[Tuple[str, str]]], None]] = None
+        
+        self._file = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_requests: List[asyncio.Future] = []
+    
+    @staticmethod
+    def detect_format(output_path: Path) -> str:
+        """Dosya uzantısından çıktı formatını belirler"""
+        suffix = output_path.suffix.lower().lstrip(".")
+        if suffix in ("jsonl", "ndjson"):
+            return "jsonl"
+        if suffix == "csv":
+            return "csv"
+        return "txt"
+    
+    async def __aenter__(self):
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
+    async def start(self):
+        """Çıktı dosyasını açar ve yazıcı görevini başlatır"""
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.output_path.exists() or self.output_path.stat().st_size == 0
+        
+        self._file = await aiofiles.open(self.output_path, 'a', encoding='utf-8', newline='')
+        if is_new:
+            header = self._format_header()
+            if header:
+                await self._file.write(header)
+                await self._file.flush()
+        
+        self._task = asyncio.create_task(self._run())
+    
+    async def write(self, domain: str, url: str):
+        """
+        Bir sonucu yazma kuyruğuna ekler
+        
+        Args:
+            domain: Domain adı
+            url: Archive.zip URL'i
+        """
+        await self.queue.put((domain, url))
+    
+    async def flush(self):
+        """Kuyruktaki tüm sonuçların dosyaya yazılmasını bekler"""
+        if self._task is None or self._task.done():
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._flush_requests.append(future)
+        # Yazıcıyı uyandırmak için boş bir işaret gönder
+        await self.queue.put(None)
+        await future
+    
+    async def close(self):
+        """Kalan sonuçları yazar ve dosyayı kapatır"""
+        if self._task is not None:
+            await self.flush()
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._file is not None:
+            await self._file.close()
+            self._file = None
+            logger.info(f"Sonuçlar kaydedildi: {self.output_path} ({self.written_count} kayıt)")
+    
+    async def _run(self):
+        """Kuyruktan sonuçları toplayıp boyut veya süre eşiğinde dosyaya yazar"""
+        batch: List[Tuple[str, str]] = []
+        deadline = None
+        
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            timed_out = False
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                item = None
+                timed_out = True
+            
+            # flush() işaretleri (None) istek sırasıyla kuyruğa girer; işlenen işaret kadar istek
+            # (öncesindeki tüm sonuçlar yazılınca) tamamlanır
+            flush_markers = 0
+            if item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            elif not timed_out:
+                flush_markers = 1
+            
+            if len(batch) >= self.batch_size or flush_markers or timed_out:
+                # Kuyrukta hazır bekleyenleri de aynı yazmaya dahil et
+                while not self.queue.empty() and len(batch) < self.batch_size * 4:
+                    extra = self.queue.get_nowait()
+                    if extra is not None:
+                        batch.append(extra)
+                    else:
+                        flush_markers += 1
+                
+                if batch:
+                    await self._write_batch(batch)
+                    batch = []
+                deadline = None
+                
+                for _ in range(flush_markers):
+                    if not self._flush_requests:
+                        break
+                    future = self._flush_requests.pop(0)
+                    if not future.done():
+                        future.set_result(None)
+    
+    async def _write_batch(self, batch: List[Tuple[str, str]]):
+        """Bir grup sonucu tek bir yazma işlemiyle dosyaya ekler"""
+        try:
+            await self._file.write(self._format_rows(batch))
+            await self._file.flush()
+            self.written_count += len(batch)
+            logger.debug("%s sonuç yazıldı: %s", len(batch), self.output_path)
+        except Exception as e:
+            logger.error(f"Sonuç yazma hatası: {e}")
+            return
+        
+        if self.on_flush is not None:
+            try:
+                self.on_flush(batch)
+            except Exception as e:
+                logger.error(f"Sonuç yazma geri çağrısı hatası: {e}")
+    
+    def _format_header(self) -> str:
+        """Yeni dosya için başlık satırlarını döndürür"""
+        if self.output_format == "txt":
+            return "# Archive.zip Bulunan Domain'ler\n# Format: domain - url\n\n"
+        if self.output_format == "csv":
+            return "domain,url\n"
+        return ""
+    
+    def _format_rows(self, batch: List[Tuple[str, str]]) -> str:
+        """Sonuçları seçili formatta metne çevirir"""
+        if self.output_format == "jsonl":
+            return "".join(
+                json.dumps({"domain": domain, "url": url}, ensure_ascii=False) + "\n"
+                for domain, url in batch
+            )
+        if self.output_format == "csv":
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator="\n").writerows(batch)
+            return buffer.getvalue()
+        return "".join(f"{domain} - {url}\n" for domain, url in batch)
+    
+    @classmethod
+    async def merge_files(cls, sources: List[Union[str, Path]], output_path: Union[str, Path],
+                          output_format: Optional[str] = None) -> int:
+        """
+        Parça sonuç dosyalarını asıl çıktı dosyasına ekler ve parça dosyalarını siler
+        
+        Args:
+            sources: Birleştirilecek sonuç dosyaları
+            output_path: Asıl çıktı dosyası
+            output_format: Çıktı formatı (verilmezse uzantıdan belirlenir)
+            
+        Returns:
+            int: Eklenen kayıt sayısı
+        """
+        merged = 0
+        async with cls(output_path, output_format) as writer:
+            for source in sources:
+                source = Path(source)
+                if not source.exists():
+                    continue
+                async for domain, url in cls.read_results(source, writer.output_format):
+                    await writer.write(domain, url)
+                    merged += 1
+                # Kayıtlar yazılmadan parça dosyası silinmez
+                await writer.flush()
+                source.unlink()
+        return merged
+    
+    @classmethod
+    async def read_results(cls, path: Union[str, Path],
+                           output_format: Optional[str] = None) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Daha önce yazılmış bir sonuç dosyasını (txt, jsonl veya csv) akış halinde okur
+        
+        Args:
+            path: Sonuç dosyasının yolu
+            output_format: Dosya formatı (verilmezse uzantıdan belirlenir)
+            
+        Yields:
+            Tuple[str, str]: (domain, url)
+        """
+        path = Path(path)
+        output_format = output_format or cls.detect_format(path)
+        
+        async with aiofiles.open(path, 'r', encoding='utf-8', newline='') as f:
+            async for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                
+                try:
+                    if output_format == "jsonl":
+                        record = json.loads(line)
+                        domain, url = record["domain"], record["url"]
+                    elif output_format == "csv":
+                        domain, url = next(csv.reader([line]))[:2]
+                        if domain == "domain" and url == "url":
+                            continue
+                    else:
+                        domain, url = line.split(" - ", 1)
+                except (ValueError, KeyError, StopIteration) as e:
+                    logger.warning(f"Okunamayan sonuç satırı atlandı: {line[:100]} ({e})")
+                    continue
+                
+                yield domain.strip(), url.strip()
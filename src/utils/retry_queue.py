@@ -0,0 +1,132 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class RetryQueue:
+    """
+    Geçici hatayla biten işlerin ertelendiği, artan bekleme süresiyle yeniden denendiği kuyruk
+    
+    Ertelenen işler ana kuyruktan düşük önceliklidir: worker'lar ana iş bitince (veya kuyruk
+    dolunca) yeniden denemelere geçer. Her denemeden önce bekleme süresi ikiye katlanır
+    (rastgele sapmayla); deneme hakkı biten iş son sonucuyla kaydedilir.
+    
+    Kullanım: ana aşamadaki her worker begin() ile kaydolur, ana iş bitince task_done() çağırır
+    ve get() None döndürene kadar yeniden denemeleri işler. get() ile alınan her iş task_done()
+    ile kapatılmalıdır; işlenirken push() ile yeniden eklenebilir.
+    """
+    
+    def __init__(self, max_retries: int = 2, base_delay: float = 2.0, max_delay: float = 60.0,
+                 max_size: int = 100000):
+        """
+        Args:
+            max_retries: Bir işin en fazla kaç kez yeniden deneneceği (0: yeniden deneme yok)
+            base_delay: İlk yeniden denemeden önceki bekleme (saniye)
+            max_delay: Bekleme süresinin üst sınırı (saniye)
+            max_size: Bu kadar iş birikince worker'lar ana işlerin arasında da yeniden dener
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_size = max_size
+        self.stats = {"deferred": 0, "retried": 0, "recovered": 0, "exhausted": 0}
+        
+        # (hazır olma zamanı, sıra, iş, deneme sayısı)
+        self._heap: List[Tuple[float, int, Any, int]] = []
+        self._counter = itertools.count()
+        # Yeni iş ekleyebilecek (ana aşamadaki veya yeniden deneme işleyen) worker sayısı
+        self._active = 0
+        self._changed: Optional[asyncio.Event] = None
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    @property
+    def full(self) -> bool:
+        """Biriken iş sınırı aşıldı mı"""
+        return len(self._heap) >= self.max_size
+    
+    def _notify(self):
+        if self._changed is not None:
+            self._changed.set()
+    
+    def push(self, item: Any, attempt: int) -> bool:
+        """
+        İşi ertelenmiş olarak ekler
+        
+        Args:
+            item: Yeniden denenecek iş
+            attempt: Bu yeniden denemenin sırası (1: ilk yeniden deneme)
+        
+        Returns:
+            bool: Eklendiyse True, deneme hakkı bittiyse False
+        """
+        if attempt > self.max_retries:
+            if self.max_retries:
+                self.stats["exhausted"] += 1
+            return False
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._counter), item, attempt))
+        self.stats["deferred"] += 1
+        self._notify()
+        return True
+    
+    def pop_ready(self) -> Optional[Tuple[Any, int]]:
+        """
+        Bekleme süresi dolmuş ilk işi döndürür (alınan iş task_done() ile kapatılmalıdır)
+        
+        Returns:
+            Optional[Tuple[Any, int]]: (iş, deneme sırası) veya hazır iş yoksa None
+        """
+        if not self._heap or self._heap[0][0] > time.monotonic():
+            return None
+        _, _, item, attempt = heapq.heappop(self._heap)
+        self._active += 1
+        self.stats["retried"] += 1
+        return item, attempt
+    
+    def begin(self, count: int = 1):
+        """Kuyruğa iş ekleyebilecek worker'ları kaydeder (ana aşamaya girerken)"""
+        self._active += count
+    
+    def task_done(self):
+        """Alınan iş (veya worker'ın ana aşaması) bitti"""
+        self._active -= 1
+        self._notify()
+    
+    async def get(self) -> Optional[Tuple[Any, int]]:
+        """
+        Sıradaki yeniden denemeyi bekleme süresi dolunca döndürür
+        
+        Returns:
+            Optional[Tuple[Any, int]]: (iş, deneme sırası) veya kuyruk boşsa ve başka bir
+            worker yeni iş ekleyemeyecekse None
+        """
+        if self._changed is None:
+            # Olay çalışan event loop içinde oluşturulur (alt süreçler kendi loop'unu kullanır)
+            self._changed = asyncio.Event()
+        while True:
+            entry = self.pop_ready()
+            if entry is not None:
+                return entry
+            if not self._heap and self._active <= 0:
+                return None
+            self._changed.clear()
+            delay = self._heap[0][0] - time.monotonic() if self._heap else None
+            try:
+                await asyncio.wait_for(self._changed.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+    
+    def log_stats(self, name: str):
+        """Yeniden deneme sayılarını loglar"""
+        if self.stats["deferred"]:
+            logger.info(
+                f"Yeniden denemeler ({name}): {self.stats['deferred']} ertelendi, "
+                f"{self.stats['recovered']} sonradan başarılı, {self.stats['exhausted']} deneme hakkı bitti"
+            )
@@ -0,0 +1,303 @@
+import asyncio
+import logging
+import multiprocessing
+import queue
+import time
+import zlib
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, List, Optional, Tuple, TypeVar, Union
+
+from tqdm import tqdm
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+def shard_of(domain: str, shard_count: int) -> int:
+    """
+    Domain'in hangi parçaya düştüğünü döndürür (çalışmalar arasında sabittir)
+    
+    Args:
+        domain: Domain adı
+        shard_count: Toplam parça sayısı
+    
+    Returns:
+        int: Parça numarası (0..shard_count-1)
+    """
+    return zlib.crc32(domain.lower().encode("utf-8")) % shard_count
+
+def shard_file_name(file_name: str, shard_index: int, shard_count: int) -> str:
+    """
+    Parçaya özel dosya adını döndürür (uzantı korunur, ör. sonuc.shard0of4.txt)
+    
+    Args:
+        file_name: Asıl dosya adı
+        shard_index: Parça numarası
+        shard_count: Toplam parça sayısı
+    
+    Returns:
+        str: Parça dosyasının adı
+    """
+    path = Path(file_name)
+    return str(path.with_name(f"{path.stem}.shard{shard_index}of{shard_count}{path.suffix}"))
+
+class ShardFeed:
+    """
+    Girdiyi ana süreçte bir kez okuyup parçalara dağıtan kuyruklar
+    
+    Her alt sürecin tüm listeyi okuyup normalleştirmesi ve tekrar elemesi yerine liste ana
+    süreçte bir kez işlenir; öğeler shard_of ile (devam modunda da aynı parçaya) yönlendirilir ve
+    parçaların kuyruklarına bloklar halinde konur. Kuyruklar sınırlı olduğu için okuma en yavaş
+    parçanın hızına uyar.
+    """
+    
+    def __init__(self, shard_count: int, batch_size: int = 1000, max_batches: int = 64):
+        """
+        Args:
+            shard_count: Parça sayısı
+            batch_size: Kuyruğa tek seferde konan öğe sayısı
+            max_batches: Parça başına kuyrukta bekleyebilecek blok sayısı
+        """
+        context = multiprocessing.get_context("spawn")
+        self.shard_count = shard_count
+        self.batch_size = batch_size
+        self.queues = [context.Queue(max_batches) for _ in range(shard_count)]
+        self._closed = False
+        # Süreci sonlanmış parçalar: öğeleri artık kuyruğa konmaz
+        self._dropped = set()
+    
+    def _put(self, shard_index: int, batch: Optional[list]):
+        """Bloğu kuyruğa koyar; parçanın süreci sonlandıysa veya besleme kapatıldıysa bırakır"""
+        while not self._closed and shard_index not in self._dropped:
+            try:
+                self.queues[shard_index].put(batch, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+    
+    async def feed(self, items: Union[AsyncIterable[T], Iterable[T]],
+                   key: Callable[[T], str] = lambda item: item):
+        """
+        Akışı parçalara dağıtır; bitince her kuyruğa bitiş işareti (None) koyar
+        
+        Args:
+            items: Domain (veya key ile domain'i çıkarılabilen öğe) akışı
+            key: Öğeden domain'i çıkaran fonksiyon
+        """
+        buffers: List[list] = [[] for _ in range(self.shard_count)]
+        
+        async def route(item):
+            shard_index = shard_of(key(item), self.shard_count)
+            buffer = buffers[shard_index]
+            buffer.append(item)
+            if len(buffer) >= self.batch_size:
+                buffers[shard_index] = []
+                await asyncio.to_thread(self._put, shard_index, buffer)
+        
+        try:
+            if hasattr(items, '__aiter__'):
+                async for item in items:
+                    await route(item)
+            else:
+                for item in items:
+                    await route(item)
+        except Exception as e:
+            logger.error(f"Girdi okuma hatası: {e}")
+        finally:
+            for shard_index, buffer in enumerate(buffers):
+                if buffer:
+                    await asyncio.to_thread(self._put, shard_index, buffer)
+                await asyncio.to_thread(self._put, shard_index, None)
+    
+    def drop(self, shard_index: int):
+        """Süreci sonlanan parçanın öğelerini atar (diğer parçaların beslemesi durmasın)"""
+        self._dropped.add(shard_index)
+    
+    def close(self):
+        """Beslemeyi durdurur (bekleyen kuyruk yazmaları bırakılır)"""
+        self._closed = True
+        for inbox in self.queues:
+            # Okuyan süreç kalmadı: çıkışta tamponda kalan bloklar beklenmez
+            inbox.cancel_join_thread()
+            inbox.close()
+
+async def iter_feed(inbox) -> AsyncIterator:
+    """
+    Alt süreçte ShardFeed kuyruğundan gelen öğeleri akış halinde döndürür
+    
+    Args:
+        inbox: Bu parçanın kuyruğu
+    
+    Yields:
+        Ana süreçte okunmuş öğeler (bitiş işaretine kadar)
+    """
+    while True:
+        batch = await asyncio.to_thread(inbox.get)
+        if batch is None:
+            return
+        for item in batch:
+            yield item
+
+def run_event_loop(coroutine, use_uvloop: bool = True):
+    """
+    Coroutine'i yeni bir event loop'ta çalıştırır; kuruluysa uvloop kullanır
+    
+    Args:
+        coroutine: Çalıştırılacak coroutine
+        use_uvloop: uvloop kuruluysa kullanılsın mı
+    """
+    if use_uvloop:
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+    return asyncio.run(coroutine)
+
+class ShardProgress:
+    """Alt süreçlerin ilerleme sayaçlarını paylaşılan bellekte tutan sınıf"""
+    
+    def __init__(self, counters, shard_index: int):
+        self.counters = counters
+        self.shard_index = shard_index
+    
+    def update(self, done: int, hits: int):
+        """Bu parçanın tamamlanan ve bulunan sayılarını günceller"""
+        self.counters[self.shard_index * 2] = done
+        self.counters[self.shard_index * 2 + 1] = hits
+
+def _shard_entry(target, shard_index: int, shard_count: int, config: dict, counters, results, inbox):
+    """Alt sürecin giriş noktası: hedef fonksiyonu çalıştırıp sonucunu kuyruğa koyar"""
+    try:
+        stats = target(shard_index, shard_count, config, ShardProgress(counters, shard_index), inbox)
+        results.put((shard_index, stats, None))
+    except BaseException as e:
+        results.put((shard_index, None, f"{type(e).__name__}: {e}"))
+
+def run_shards(
+    target: Callable[[int, int, dict, ShardProgress], dict],
+    shard_count: int,
+    config: dict,
+    desc: str = "İşleniyor",
+    unit: str = "domain",
+    hits_label: str = "Bulunan",
+    feed: Optional[ShardFeed] = None
+) -> List[dict]:
+    """
+    Hedef fonksiyonu her parça için ayrı bir süreçte çalıştırır ve toplam ilerlemeyi gösterir
+    
+    Args:
+        target: (parça no, parça sayısı, ayarlar, ilerleme, kuyruk) alıp istatistik dict'i
+            döndüren modül seviyesinde tanımlı fonksiyon (feed yoksa kuyruk None'dır)
+        shard_count: Süreç sayısı
+        config: Alt süreçlere aktarılacak ayarlar (pickle edilebilir olmalı)
+        desc: İlerleme çubuğu açıklaması
+        unit: İlerleme çubuğu birimi
+        hits_label: İlerleme çubuğunda bulunan sayısının etiketi
+        feed: Verilirse her parça girdisini bu beslemenin kuyruğundan alır
+    
+    Returns:
+        List[dict]: Her parçanın istatistikleri
+    """
+    context = multiprocessing.get_context("spawn")
+    counters = context.Array("q", shard_count * 2, lock=False)
+    results = context.Queue()
+    
+    processes = [
+        context.Process(
+            target=_shard_entry,
+            args=(target, index, shard_count, config, counters, results,
+                  feed.queues[index] if feed is not None else None),
+            name=f"shard-{index}"
+        )
+        for index in range(shard_count)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"{shard_count} süreç başlatıldı")
+    
+    collected: List[Tuple[int, dict, str]] = []
+    with tqdm(desc=desc, unit=unit) as pbar:
+        while len(collected) < shard_count:
+            try:
+                collected.append(results.get(timeout=0.5))
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    # Sonuç bırakmadan çıkan süreçler (ör. öldürülen) için bir süre daha bekle
+                    time.sleep(0.5)
+                    while True:
+                        try:
+                            collected.append(results.get_nowait())
+                        except queue.Empty:
+                            break
+                    break
+            
+            if feed is not None:
+                for index, process in enumerate(processes):
+                    if not process.is_alive():
+                        feed.drop(index)
+            
+            done = sum(counters[index * 2] for index in range(shard_count))
+            hits = sum(counters[index * 2 + 1] for index in range(shard_count))
+            pbar.update(done - pbar.n)
+            pbar.set_postfix({hits_label: hits})
+    
+    for process in processes:
+        process.join()
+    
+    stats_list = []
+    finished = set()
+    for shard_index, stats, error in sorted(collected, key=lambda item: item[0]):
+        finished.add(shard_index)
+        if error:
+            logger.error(f"Parça {shard_index} hata ile bitti: {error}")
+            continue
+        stats_list.append(stats)
+    for index, process in enumerate(processes):
+        if index not in finished:
+            logger.error(f"Parça {index} sonuç bildirmeden sonlandı (çıkış kodu: {process.exitcode})")
+    return stats_list
+
+async def run_fed_shards(
+    target: Callable[[int, int, dict, ShardProgress, object], dict],
+    shard_count: int,
+    config: dict,
+    items: Union[AsyncIterable[T], Iterable[T]],
+    key: Callable[[T], str] = lambda item: item,
+    **kwargs
+) -> List[dict]:
+    """
+    Girdiyi bu süreçte bir kez okuyup parçalara dağıtırken run_shards'ı çalıştırır
+    
+    Args:
+        target: run_shards hedefi; kuyruğu iter_feed ile okumalıdır
+        shard_count: Süreç sayısı
+        config: Alt süreçlere aktarılacak ayarlar
+        items: Dağıtılacak domain (veya key ile domain'i çıkarılabilen öğe) akışı
+        key: Öğeden domain'i çıkaran fonksiyon
+        **kwargs: run_shards'ın diğer parametreleri
+    
+    Returns:
+        List[dict]: Her parçanın istatistikleri
+    """
+    feed = ShardFeed(shard_count)
+    feeder = asyncio.create_task(feed.feed(items, key))
+    try:
+        return await asyncio.to_thread(run_shards, target, shard_count, config, feed=feed, **kwargs)
+    finally:
+        # Süreç erken bittiyse dolu kuyruğu bekleyen besleme bırakılır
+        feed.close()
+        await asyncio.gather(feeder, return_exceptions=True)
+
+def merge_stats(stats_list: List[dict], keys: Iterable[str]) -> dict:
+    """
+    Parçaların sayısal istatistiklerini toplar
+    
+    Args:
+        stats_list: Parça istatistikleri
+        keys: Toplanacak anahtarlar
+    
+    Returns:
+        dict: Toplanmış istatistikler
+    """
+    return {key: sum(stats.get(key, 0) for stats in stats_list) for key in keys}
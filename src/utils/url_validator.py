@@ -1,29 +1,43 @@
 import aiohttp
 import asyncio
-from typing import Optional, Tuple
+from typing import Optional, Sequence, Tuple
+from urllib.parse import urlsplit
 import logging
 
+from .http_session import SessionFactory, TimeoutPolicy
+from .request_scheduler import RequestScheduler
+from .archive_checker import DEAD_OUTCOMES, DEFAULT_PATHS, PROBE_SCHEMES
+from .probe_strategies import ABSENT, FOUND, RETRYABLE_OUTCOMES, classify_exception, classify_status
+
 logger = logging.getLogger(__name__)
 
 class URLValidator:
     """URL doğrulama ve erişilebilirlik testi için sınıf"""
     
-    def __init__(self, timeout: int = 10):
+    def __init__(self, timeout: int = 10, session_factory: Optional[SessionFactory] = None,
+                 scheduler: Optional[RequestScheduler] = None, paths: Optional[Sequence[str]] = None,
+                 connect_timeout: Optional[float] = None, tls_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None):
         self.timeout = timeout
+        # Sırayla denenecek dosya yolları (ilk erişilebilen kullanılır)
+        self.paths = [path.lstrip("/") for path in paths] if paths else list(DEFAULT_PATHS)
+        self.scheduler = scheduler or RequestScheduler()
+        # Yanıt vermeyen host'lar bağlanma aşamasında bırakılır
+        self.timeouts = TimeoutPolicy(timeout, connect_timeout, tls_timeout, read_timeout)
+        # Dışarıdan verilen havuz paylaşılır ve burada kapatılmaz
+        self._owns_factory = session_factory is None
+        self.session_factory = session_factory or SessionFactory(timeout=timeout)
         self.session = None
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout),
-            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        )
+        self.session = self.session_factory.get_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        if self._owns_factory:
+            await self.session_factory.close()
     
-    async def test_url(self, url: str) -> Tuple[bool, Optional[str]]:
+    async def test_url(self, url: str) -> Tuple[bool, Optional[str], str]:
         """
         URL'nin erişilebilir olup olmadığını test eder
         
@@ -31,42 +45,62 @@ class URLValidator:
             url: Test edilecek URL
             
         Returns:
-            Tuple[bool, Optional[str]]: (erişilebilir mi, hata mesajı)
+            Tuple[bool, Optional[str], str]: (erişilebilir mi, hata mesajı, sonuç türü)
         """
         try:
-            async with self.session.head(url, allow_redirects=True) as response:
-                if response.status == 200:
-                    return True, None
-                else:
-                    return False, f"HTTP {response.status}"
+            async with self.scheduler.slot(urlsplit(url).netloc) as slot:
+                async with self.session.head(url, allow_redirects=True, timeout=self.timeouts.for_url(url)) as response:
+                    slot.check_status(response.status)
+                    if response.status == 200:
+                        return True, None, FOUND
+                    else:
+                        return False, f"HTTP {response.status}", classify_status(response.status)
+        except asyncio.TimeoutError as e:
+            return False, "Zaman aşımı", classify_exception(e)
         except aiohttp.ClientError as e:
-            return False, str(e)
+            return False, str(e), classify_exception(e)
         except Exception as e:
-            return False, f"Beklenmeyen hata: {str(e)}"
+            return False, f"Beklenmeyen hata: {str(e)}", classify_exception(e)
     
-    async def check_archive_urls(self, domain: str) -> Tuple[bool, str, Optional[str]]:
+    async def check_archive_urls(self, domain: str) -> Tuple[bool, str, Optional[str], Optional[str]]:
         """
-        Domain için HTTPS ve HTTP Archive.zip URL'lerini test eder
+        Domain için yol listesindeki dosyaların HTTPS ve HTTP URL'lerini sırayla test eder
+        
+        Yanıt vermeyen protokol (ör. kapalı HTTPS portu) sonraki yollarda denenmez; host'a
+        hiç ulaşılamıyorsa kalan yollar atlanır.
         
         Args:
             domain: Test edilecek domain
             
         Returns:
-            Tuple[bool, str, Optional[str]]: (başarılı mı, çalışan URL, hata mesajı)
+            Tuple[bool, str, Optional[str], Optional[str]]: (başarılı mı, çalışan URL, hata mesajı,
+            yeniden denenebilir hata türü - yoksa None)
         """
-        urls_to_test = [
-            f"https://{domain}/Archive.zip",
-            f"http://{domain}/Archive.zip"
-        ]
-        
-        for url in urls_to_test:
-            logger.info(f"Test ediliyor: {url}")
-            is_accessible, error = await self.test_url(url)
+        schemes = list(PROBE_SCHEMES)
+        outcomes = []
+        for path in self.paths:
+            alive = []
+            for scheme in schemes:
+                url = f"{scheme}://{domain}/{path}"
+                logger.info("Test ediliyor: %s", url)
+                is_accessible, error, outcome = await self.test_url(url)
+                
+                if is_accessible:
+                    logger.info("Başarılı: %s", url)
+                    return True, url, None, None
+                else:
+                    outcomes.append(outcome)
+                    logger.warning("Başarısız: %s - %s", url, error)
+                    if outcome not in DEAD_OUTCOMES:
+                        alive.append(scheme)
             
-            if is_accessible:
-                logger.info(f"Başarılı: {url}")
-                return True, url, None
-            else:
-                logger.warning(f"Başarısız: {url} - {error}")
+            schemes = alive
+            if not schemes:
+                logger.debug("⏩ Kalan yollar atlandı: %s", domain)
+                break
         
-        return False, "", f"Hiçbir URL erişilebilir değil: {domain}" 
\ No newline at end of file
+        # Sunucu kesin bir yanıt (ör. 404) verdiyse geçici hatalar sonucu değiştirmez
+        retryable = [outcome for outcome in outcomes if outcome in RETRYABLE_OUTCOMES]
+        if ABSENT in outcomes or not retryable:
+            return False, "", f"Hiçbir URL erişilebilir değil: {domain}", None
+        return False, "", f"Hiçbir URL erişilebilir değil: {domain}", retryable[-1]
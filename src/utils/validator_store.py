@@ -0,0 +1,170 @@
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Kayıt kapsamları: kontrolcünün gördüğü sürüm ile diskteki (indirilmiş) sürüm ayrı tutulur;
+# kontrolcü yeni sürümü gördüğünde indirilmiş dosya güncel sayılmamalıdır
+PROBE = "probe"
+DOWNLOAD = "download"
+
+class ValidatorStore:
+    """
+    URL başına ETag, Last-Modified ve Content-Length bilgisini SQLite'ta saklayan sınıf
+    
+    Sonraki taramalarda bu değerlerle If-None-Match / If-Modified-Since başlıklı koşullu istek
+    gönderilir; dosya değişmediyse sunucu gövdesiz 304 döner.
+    """
+    
+    def __init__(self, path: Union[str, Path], scope: str):
+        """
+        Args:
+            path: SQLite dosyası
+            scope: Kayıt kapsamı (PROBE veya DOWNLOAD)
+        """
+        self.path = Path(path)
+        self.scope = scope
+        self.stats = {"not_modified": 0, "changed": 0, "stored": 0}
+        
+        self._db: Optional[sqlite3.Connection] = None
+        # url -> kayıt satırı; diske toplu halde yazılır
+        self._pending_writes: Dict[str, Tuple[str, str, Optional[str], Optional[str], Optional[int], float]] = {}
+    
+    def open(self):
+        """Veritabanını açar (yoksa oluşturur)"""
+        if self._db is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Birden fazla süreç (--processes) aynı dosyayı paylaşabilir
+        self._db = sqlite3.connect(str(self.path), timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS validators ("
+            "scope TEXT NOT NULL, url TEXT NOT NULL, etag TEXT, last_modified TEXT, "
+            "content_length INTEGER, checked REAL NOT NULL, PRIMARY KEY (scope, url)"
+            ") WITHOUT ROWID"
+        )
+        self._db.commit()
+    
+    def close(self):
+        """Bekleyen kayıtları yazar ve kapatır"""
+        if self._db is None:
+            return
+        self._flush()
+        self._db.close()
+        self._db = None
+        if self.stats["not_modified"] or self.stats["changed"]:
+            logger.info(
+                f"Koşullu istekler ({self.scope}): {self.stats['not_modified']} değişmemiş, "
+                f"{self.stats['changed']} değişmiş"
+            )
+    
+    def get(self, url: str) -> Optional[Tuple[Optional[str], Optional[str], Optional[int]]]:
+        """
+        URL için saklanan doğrulayıcıları döndürür
+        
+        Args:
+            url: Dosya URL'i
+        
+        Returns:
+            Optional[Tuple]: (ETag, Last-Modified, Content-Length) veya kayıt yoksa None
+        """
+        if self._db is None:
+            return None
+        # Henüz diske yazılmamış kayıt önce aranır
+        pending = self._pending_writes.get(url)
+        if pending is not None:
+            return pending[2:5]
+        row = self._db.execute(
+            "SELECT etag, last_modified, content_length FROM validators WHERE scope = ? AND url = ?",
+            (self.scope, url)
+        ).fetchone()
+        return tuple(row) if row else None
+    
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Saklanan doğrulayıcılardan koşullu istek başlıklarını oluşturur
+        
+        Args:
+            url: Dosya URL'i
+        
+        Returns:
+            Dict[str, str]: If-None-Match / If-Modified-Since (kayıt yoksa boş)
+        """
+        validators = self.get(url)
+        if validators is None:
+            return {}
+        etag, last_modified, _ = validators
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+    
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str],
+              content_length: Optional[int]):
+        """
+        URL'in doğrulayıcılarını kaydeder (diske toplu halde)
+        
+        Args:
+            url: Dosya URL'i
+            etag: ETag başlığı
+            last_modified: Last-Modified başlığı
+            content_length: Dosya boyutu
+        """
+        if self._db is None or not (etag or last_modified):
+            return
+        self._pending_writes[url] = (self.scope, url, etag, last_modified, content_length, time.time())
+        self.stats["stored"] += 1
+        if len(self._pending_writes) >= 1000:
+            self._flush()
+    
+    def store_response(self, url: str, headers) -> bool:
+        """
+        200/206 yanıtının başlıklarındaki doğrulayıcıları kaydeder
+        
+        Args:
+            url: Dosya URL'i
+            headers: Yanıt başlıkları
+        
+        Returns:
+            bool: Kayıtlı sürümden farklıysa (veya kayıt yoksa) True
+        """
+        # Kısmi yanıtta Content-Length aralığın boyutudur; dosya boyutu Content-Range'dedir
+        content_length = headers.get("Content-Range", "").rpartition("/")[2] or headers.get("Content-Length")
+        validators = (
+            headers.get("ETag"),
+            headers.get("Last-Modified"),
+            int(content_length) if content_length and content_length.isdigit() else None
+        )
+        previous = self.get(url)
+        if previous == validators:
+            return False
+        if previous is not None:
+            self.stats["changed"] += 1
+        self.store(url, *validators)
+        return True
+    
+    def mark_not_modified(self, url: str):
+        """Koşullu isteğe 304 döndüğünü kaydeder"""
+        self.stats["not_modified"] += 1
+    
+    def _flush(self):
+        """Bekleyen kayıtları SQLite'a yazar"""
+        if not self._pending_writes or self._db is None:
+            return
+        try:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO validators (scope, url, etag, last_modified, content_length, checked) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                list(self._pending_writes.values())
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Doğrulayıcı kayıtları yazılamadı: {e}")
+        self._pending_writes = {}
@@ -0,0 +1,220 @@
+import struct
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import aiohttp
+
+from .zip_signature import ZIP_END_RECORD, ZIP_END_SEARCH_SIZE
+
+# ZIP yapılarının imzaları ve sabit boyutlu kısımları
+CENTRAL_HEADER = b"PK\x01\x02"
+ZIP64_END_RECORD = b"PK\x06\x06"
+ZIP64_END_LOCATOR = b"PK\x06\x07"
+END_RECORD_FORMAT = "<4sHHHHIIH"
+END_RECORD_SIZE = struct.calcsize(END_RECORD_FORMAT)
+ZIP64_LOCATOR_FORMAT = "<4sIQI"
+ZIP64_LOCATOR_SIZE = struct.calcsize(ZIP64_LOCATOR_FORMAT)
+ZIP64_RECORD_FORMAT = "<4sQHHIIQQQQ"
+ZIP64_RECORD_SIZE = struct.calcsize(ZIP64_RECORD_FORMAT)
+CENTRAL_HEADER_FORMAT = "<4sHHHHHHIIIHHHHHII"
+CENTRAL_HEADER_SIZE = struct.calcsize(CENTRAL_HEADER_FORMAT)
+
+# Sunucunun gönderebileceği en büyük merkezi dizin (bozuk/kötü niyetli boyutlara karşı)
+MAX_CENTRAL_DIRECTORY_SIZE = 64 * 1024 * 1024
+
+class ZipListingError(Exception):
+    """Uzak ZIP dosyasının içeriği okunamadı"""
+
+def dos_datetime(date: int, time: int) -> Optional[str]:
+    """
+    ZIP'teki DOS tarih/saatini ISO 8601 metnine çevirir
+    
+    Args:
+        date: DOS tarihi (yıl-1980, ay, gün)
+        time: DOS saati (saat, dakika, saniye/2)
+    
+    Returns:
+        Optional[str]: ISO tarih (geçersizse None)
+    """
+    try:
+        return datetime(
+            1980 + (date >> 9), (date >> 5) & 0x0F, date & 0x1F,
+            time >> 11, (time >> 5) & 0x3F, (time & 0x1F) * 2
+        ).isoformat()
+    except ValueError:
+        return None
+
+def find_end_record(tail: bytes) -> int:
+    """
+    Dosya sonundaki merkezi dizin sonu kaydının (EOCD) konumunu bulur
+    
+    Args:
+        tail: Dosyanın son byte'ları
+    
+    Returns:
+        int: Kaydın tail içindeki konumu
+    
+    Raises:
+        ZipListingError: Kayıt bulunamazsa
+    """
+    position = tail.rfind(ZIP_END_RECORD)
+    while position >= 0:
+        if position + END_RECORD_SIZE <= len(tail):
+            comment_length = struct.unpack_from("<H", tail, position + 20)[0]
+            # Yorum alanı dosyanın sonuna kadar uzanmalı (imza yorumun içinde de geçebilir)
+            if position + END_RECORD_SIZE + comment_length <= len(tail):
+                return position
+        position = tail.rfind(ZIP_END_RECORD, 0, position)
+    raise ZipListingError("ZIP merkezi dizin sonu kaydı bulunamadı")
+
+def parse_end_record(tail: bytes, tail_offset: int) -> Tuple[int, int, int]:
+    """
+    EOCD (ve gerekirse ZIP64) kayıtlarından merkezi dizinin yerini çıkarır
+    
+    Merkezi dizin, kaydın hemen öncesinde biter; başlangıcı bu konumdan hesaplanır. Böylece
+    başına veri eklenmiş (ör. kendiliğinden açılan) arşivlerde de doğru konum bulunur.
+    
+    Args:
+        tail: Dosyanın son byte'ları
+        tail_offset: tail'in dosyadaki başlangıç konumu
+    
+    Returns:
+        Tuple[int, int, int]: (merkezi dizin başlangıcı, boyutu, kayıt sayısı)
+    """
+    position = find_end_record(tail)
+    _, _, _, _, entries, cd_size, cd_offset, _ = struct.unpack_from(END_RECORD_FORMAT, tail, position)
+    cd_end = tail_offset + position
+    
+    if entries == 0xFFFF or cd_size == 0xFFFFFFFF or cd_offset == 0xFFFFFFFF:
+        locator = position - ZIP64_LOCATOR_SIZE
+        if locator < 0 or tail[locator:locator + 4] != ZIP64_END_LOCATOR:
+            raise ZipListingError("ZIP64 kaydı bulunamadı")
+        record = locator - ZIP64_RECORD_SIZE
+        if record < 0 or tail[record:record + 4] != ZIP64_END_RECORD:
+            raise ZipListingError("ZIP64 merkezi dizin sonu kaydı okunamadı")
+        fields = struct.unpack_from(ZIP64_RECORD_FORMAT, tail, record)
+        entries, cd_size = fields[7], fields[8]
+        cd_end = tail_offset + record
+    
+    return cd_end - cd_size, cd_size, entries
+
+def parse_central_directory(data: bytes) -> List[dict]:
+    """
+    Merkezi dizindeki dosya kayıtlarını çözümler
+    
+    Args:
+        data: Merkezi dizinin byte'ları
+    
+    Returns:
+        List[dict]: Her dosya için ad, boyut, sıkıştırılmış boyut, tarih ve CRC
+    """
+    entries = []
+    position = 0
+    while position + CENTRAL_HEADER_SIZE <= len(data):
+        fields = struct.unpack_from(CENTRAL_HEADER_FORMAT, data, position)
+        if fields[0] != CENTRAL_HEADER:
+            break
+        flags, method, mtime, mdate, crc = fields[3], fields[4], fields[5], fields[6], fields[7]
+        compressed_size, size = fields[8], fields[9]
+        name_length, extra_length, comment_length = fields[10], fields[11], fields[12]
+        
+        start = position + CENTRAL_HEADER_SIZE
+        raw_name = data[start:start + name_length]
+        extra = data[start + name_length:start + name_length + extra_length]
+        # Bit 11: ad UTF-8; değilse eski ZIP'lerin kod sayfası (cp437)
+        name = raw_name.decode("utf-8" if flags & 0x800 else "cp437", errors="replace")
+        
+        if size == 0xFFFFFFFF or compressed_size == 0xFFFFFFFF:
+            size, compressed_size = _zip64_sizes(extra, size, compressed_size)
+        
+        entries.append({
+            "name": name,
+            "size": size,
+            "compressed_size": compressed_size,
+            "modified": dos_datetime(mdate, mtime),
+            "crc": f"{crc:08x}",
+            "method": method,
+            "encrypted": bool(flags & 0x1),
+            "is_dir": name.endswith("/")
+        })
+        position = start + name_length + extra_length + comment_length
+    return entries
+
+def _zip64_sizes(extra: bytes, size: int, compressed_size: int) -> Tuple[int, int]:
+    """ZIP64 ek alanından (0x0001) gerçek boyutları okur"""
+    position = 0
+    while position + 4 <= len(extra):
+        header_id, length = struct.unpack_from("<HH", extra, position)
+        if header_id == 0x0001:
+            values = extra[position + 4:position + 4 + length]
+            offset = 0
+            # Alanlar yalnızca 32 bit değeri taşan sırayla bulunur: boyut, sıkıştırılmış boyut
+            if size == 0xFFFFFFFF and offset + 8 <= len(values):
+                size = struct.unpack_from("<Q", values, offset)[0]
+                offset += 8
+            if compressed_size == 0xFFFFFFFF and offset + 8 <= len(values):
+                compressed_size = struct.unpack_from("<Q", values, offset)[0]
+            break
+        position += 4 + length
+    return size, compressed_size
+
+async def fetch_range(session: aiohttp.ClientSession, url: str, byte_range: str,
+                      timeout: Optional[aiohttp.ClientTimeout] = None) -> Tuple[bytes, int]:
+    """
+    Dosyanın bir aralığını indirir
+    
+    Args:
+        session: HTTP oturumu
+        url: Dosya URL'i
+        byte_range: Range değeri (ör. "bytes=-65557" veya "bytes=100-199")
+        timeout: İstek zaman aşımı
+    
+    Returns:
+        Tuple[bytes, int]: (aralığın byte'ları, dosyanın toplam boyutu)
+    
+    Raises:
+        ZipListingError: Sunucu aralık isteğini desteklemiyorsa
+    """
+    headers = {"Range": byte_range, "Accept-Encoding": "identity"}
+    async with session.get(url, headers=headers, timeout=timeout) as response:
+        if response.status != 206:
+            # 200: sunucu Range'i yok sayıyor; tüm dosyayı indirmemek için bağlantı kapatılır
+            response.close()
+            raise ZipListingError(f"Aralık isteği desteklenmiyor (HTTP {response.status})")
+        content_range = response.headers.get("Content-Range", "")
+        total = content_range.rpartition("/")[2]
+        if not total.isdigit():
+            response.close()
+            raise ZipListingError("Dosya boyutu bilinmiyor (Content-Range)")
+        return await response.read(), int(total)
+
+async def list_remote_zip(session: aiohttp.ClientSession, url: str,
+                          timeout: Optional[aiohttp.ClientTimeout] = None) -> Tuple[List[dict], int]:
+    """
+    Uzak ZIP dosyasının içindekileri dosyayı indirmeden listeler
+    
+    Önce dosyanın son ~64 KB'ı istenir (merkezi dizin sonu kaydı bu aralıktadır). Merkezi dizin
+    de bu aralıktaysa tek istek yeter; değilse ikinci bir Range isteğiyle yalnızca dizin alınır.
+    
+    Args:
+        session: HTTP oturumu
+        url: ZIP dosyasının URL'i
+        timeout: İstek başına zaman aşımı
+    
+    Returns:
+        Tuple[List[dict], int]: (dosya kayıtları, arşivin toplam boyutu)
+    
+    Raises:
+        ZipListingError: Arşiv okunamazsa
+    """
+    tail, total = await fetch_range(session, url, f"bytes=-{ZIP_END_SEARCH_SIZE}", timeout)
+    tail_offset = total - len(tail)
+    cd_start, cd_size, _ = parse_end_record(tail, tail_offset)
+    
+    if cd_start < 0 or cd_size > MAX_CENTRAL_DIRECTORY_SIZE:
+        raise ZipListingError(f"Geçersiz merkezi dizin: {cd_start}/{cd_size}")
+    if cd_start >= tail_offset:
+        directory = tail[cd_start - tail_offset:cd_start - tail_offset + cd_size]
+    else:
+        directory, _ = await fetch_range(session, url, f"bytes={cd_start}-{cd_start + cd_size - 1}", timeout)
+    return parse_central_directory(directory), total
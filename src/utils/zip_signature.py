@@ -0,0 +1,117 @@
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# ZIP dosyalarının başındaki imzalar: yerel dosya başlığı ve parçalı arşiv işareti
+ZIP_SIGNATURES = (b"PK\x03\x04", b"PK\x07\x08")
+SIGNATURE_SIZE = 4
+
+# Yol listesindeki diğer arşiv türlerinin başlangıç imzaları (uzantıya göre, en fazla 4 byte)
+ARCHIVE_SIGNATURES = {
+    ".zip": ZIP_SIGNATURES,
+    ".gz": (b"\x1f\x8b\x08",),
+    ".tgz": (b"\x1f\x8b\x08",),
+    ".bz2": (b"BZh",),
+    ".xz": (b"\xfd7zX",),
+    ".7z": (b"7z\xbc\xaf",),
+    ".rar": (b"Rar!",),
+}
+
+# İmza kontrolü için ilk 4 byte'ı isteyen başlıklar (sıkıştırma kapalı, aksi halde aralık bozulur)
+SIGNATURE_RANGE_HEADERS = {
+    "Range": f"bytes=0-{SIGNATURE_SIZE - 1}",
+    "Accept-Encoding": "identity"
+}
+
+def is_zip_signature(data: bytes) -> bool:
+    """
+    Verinin ZIP imzasıyla başlayıp başlamadığını kontrol eder
+    
+    Args:
+        data: Dosyanın ilk byte'ları
+    
+    Returns:
+        bool: ZIP imzası varsa True
+    """
+    return data[:SIGNATURE_SIZE] in ZIP_SIGNATURES
+
+def expected_signatures(url: str) -> Optional[Tuple[bytes, ...]]:
+    """
+    URL'deki dosya uzantısına göre beklenen imzaları döndürür
+    
+    Args:
+        url: Dosya URL'i veya adı
+    
+    Returns:
+        Optional[Tuple[bytes, ...]]: İmzalar (uzantı bilinmiyorsa None)
+    """
+    name = urlsplit(url).path.lower()
+    for suffix, signatures in ARCHIVE_SIGNATURES.items():
+        if name.endswith(suffix):
+            return signatures
+    return None
+
+def matches_signature(url: str, data: bytes) -> bool:
+    """
+    Dosyanın ilk byte'larının URL'deki uzantıyla uyuşup uyuşmadığını kontrol eder
+    
+    Uzantı bilinmiyorsa (ör. .tar, .sql) yalnızca HTML sayfası olmadığı kontrol edilir.
+    
+    Args:
+        url: Dosya URL'i veya adı
+        data: Dosyanın ilk byte'ları
+    
+    Returns:
+        bool: İmza uyuşuyorsa True
+    """
+    signatures = expected_signatures(url)
+    if signatures is not None:
+        return any(data.startswith(signature) for signature in signatures)
+    return bool(data) and not data.lstrip()[:1] == b"<"
+
+async def read_prefix(content: aiohttp.StreamReader, size: int = SIGNATURE_SIZE) -> bytes:
+    """
+    Yanıt gövdesinden en fazla size byte okur (gövde daha kısaysa eldekini döndürür)
+    
+    Args:
+        content: Yanıt gövdesi akışı
+        size: Okunacak byte sayısı
+    
+    Returns:
+        bytes: Okunan byte'lar
+    """
+    data = b""
+    while len(data) < size:
+        chunk = await content.read(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+# ZIP merkezi dizin sonu kaydı: dosyanın son 22 + 65535 (yorum) byte'ı içinde bulunur
+ZIP_END_RECORD = b"PK\x05\x06"
+ZIP_END_SEARCH_SIZE = 22 + 65535
+
+def verify_archive_file(path, url: str) -> bool:
+    """
+    Diskteki dosyanın eksiksiz bir arşiv gibi göründüğünü kontrol eder
+    
+    Baştaki imza URL'deki uzantıyla uyuşmalıdır; ZIP dosyalarında ayrıca sondaki merkezi
+    dizin kaydı aranır (yarıda kesilmiş indirmelerde bu kayıt yoktur).
+    
+    Args:
+        path: Dosya yolu
+        url: Dosyanın indirildiği URL (uzantı için)
+    
+    Returns:
+        bool: Dosya doğrulandıysa True
+    """
+    with open(path, "rb") as f:
+        if not matches_signature(url, f.read(SIGNATURE_SIZE)):
+            return False
+        if expected_signatures(url) is ZIP_SIGNATURES:
+            size = f.seek(0, 2)
+            f.seek(max(0, size - ZIP_END_SEARCH_SIZE))
+            return ZIP_END_RECORD in f.read()
+    return True
@@ -0,0 +1,37 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.utils.result_writer import ResultWriter
+
+class ResultWriterFlushTest(unittest.IsolatedAsyncioTestCase):
+    """flush() isteğinin dolu bir grup yazılırken kaybolmaması"""
+    
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "results.txt"
+    
+    async def asyncTearDown(self):
+        self.tmp.cleanup()
+    
+    async def test_flush_after_full_batch(self):
+        async with ResultWriter(self.path, batch_size=5, flush_interval=60) as writer:
+            for index in range(5):
+                await writer.write(f"d{index}.com", f"https://d{index}.com/Archive.zip")
+            await asyncio.wait_for(writer.flush(), timeout=5)
+            self.assertEqual(writer.written_count, 5)
+    
+    async def test_concurrent_flushes_during_batch(self):
+        async with ResultWriter(self.path, batch_size=5, flush_interval=60) as writer:
+            for index in range(12):
+                await writer.write(f"d{index}.com", f"https://d{index}.com/Archive.zip")
+            await asyncio.wait_for(asyncio.gather(writer.flush(), writer.flush()), timeout=5)
+            self.assertEqual(writer.written_count, 12)
+        
+        lines = [line for line in self.path.read_text(encoding="utf-8").splitlines()
+                 if line and not line.startswith("#")]
+        self.assertEqual(len(lines), 12)
+
+if __name__ == "__main__":
+    unittest.main()